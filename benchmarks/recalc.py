@@ -0,0 +1,128 @@
+"""
+Measure how much the no-recalculation profile settings save when a
+formula-heavy workbook is exported to PDF.
+
+    python benchmarks/recalc.py [--soffice PATH] [--runs N] [--rows N]
+    python benchmarks/recalc.py --input book.xlsx
+
+Without --input a workbook of quadratic SUMPRODUCT formulas is generated
+and saved once by soffice, so it carries cached results like a real one.
+Needs LibreOffice and the package on the import path.
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from simple_to_pdf.converters.lib_profile import LibreProfileManager
+
+
+def soffice_convert(
+    *, soffice: str, profile_url: str, src: Path, out_dir: Path, fmt: str
+) -> float:
+    command = [
+        soffice,
+        "--headless",
+        "--norestore",
+        f"-env:UserInstallation={profile_url}",
+        "--convert-to",
+        fmt,
+        "--outdir",
+        str(out_dir),
+        str(src),
+    ]
+    started = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def make_workbook(*, soffice: str, rows: int, work_dir: Path) -> Path:
+    """Write a formula workbook and let soffice store the computed values."""
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, rows + 1):
+        ws.cell(row=row, column=1, value=(row * 7919) % 1000)
+        # Rank of the value by counting every larger one: O(rows) per cell
+        ws.cell(row=row, column=2, value=f"=SUMPRODUCT(--(A$1:A${rows}>A{row}))+1")
+    raw_path = work_dir / "raw" / "recalc.xlsx"
+    raw_path.parent.mkdir()
+    wb.save(raw_path)
+
+    with tempfile.TemporaryDirectory(prefix="lo_fresh_") as tmp_dir:
+        soffice_convert(
+            soffice=soffice,
+            profile_url=(Path(tmp_dir) / "profile").as_uri(),
+            src=raw_path,
+            out_dir=work_dir,
+            fmt="xlsx",
+        )
+    return work_dir / raw_path.name
+
+
+def measure(
+    *, soffice: str, manager: LibreProfileManager, src: Path, out_dir: Path
+) -> float:
+    with manager.clone() as profile_url:
+        return soffice_convert(
+            soffice=soffice,
+            profile_url=profile_url,
+            src=src,
+            out_dir=out_dir,
+            fmt="pdf",
+        )
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<10} median {statistics.median(timings):6.2f}s"
+        f"  min {min(timings):6.2f}s  max {max(timings):6.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--soffice", default=shutil.which("soffice"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=4000)
+    parser.add_argument("--input", type=Path, help="workbook to export instead")
+    args = parser.parse_args()
+    if not args.soffice:
+        parser.error("soffice not found, pass --soffice")
+
+    with tempfile.TemporaryDirectory(prefix="bench_recalc_") as tmp_dir:
+        work_dir = Path(tmp_dir)
+        src = args.input or make_workbook(
+            soffice=args.soffice, rows=args.rows, work_dir=work_dir
+        )
+        out_dir = work_dir / "out"
+        out_dir.mkdir()
+        managers = {
+            name: LibreProfileManager(
+                soffice_path=args.soffice, cache_dir=work_dir, recalculate=recalculate
+            )
+            for name, recalculate in (("recalc", True), ("cached", False))
+        }
+        for manager in managers.values():
+            manager.ensure_template()
+
+        # Alternate the two so drifting disk caches hit both alike
+        timings: dict[str, list[float]] = {name: [] for name in managers}
+        for _ in range(args.runs):
+            for name, manager in managers.items():
+                timings[name].append(
+                    measure(
+                        soffice=args.soffice, manager=manager, src=src, out_dir=out_dir
+                    )
+                )
+        for name, values in timings.items():
+            report(name, values)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure how long one soffice conversion takes with a fresh user profile
+versus a clone of the tuned profile template.
+
+    python benchmarks/soffice_startup.py [--soffice PATH] [--runs N]
+
+Every run converts the same one-line text file, so the time is almost all
+soffice startup. Needs LibreOffice and the package on the import path.
+"""
+
+import argparse
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from simple_to_pdf.converters.lib_profile import LibreProfileManager
+
+
+def convert(*, soffice: str, profile_url: str, src: Path, out_dir: Path) -> float:
+    command = [
+        soffice,
+        "--headless",
+        "--norestore",
+        f"-env:UserInstallation={profile_url}",
+        "--convert-to",
+        "pdf",
+        "--outdir",
+        str(out_dir),
+        str(src),
+    ]
+    started = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def run_fresh(*, soffice: str, src: Path, out_dir: Path) -> float:
+    with tempfile.TemporaryDirectory(prefix="lo_fresh_") as tmp_dir:
+        profile_url = (Path(tmp_dir) / "profile").as_uri()
+        return convert(
+            soffice=soffice, profile_url=profile_url, src=src, out_dir=out_dir
+        )
+
+
+def run_template(
+    *, soffice: str, manager: LibreProfileManager, src: Path, out_dir: Path
+) -> float:
+    with manager.clone() as profile_url:
+        return convert(
+            soffice=soffice, profile_url=profile_url, src=src, out_dir=out_dir
+        )
+
+
+def report(name: str, timings: list[float]) -> None:
+    print(
+        f"{name:<10} median {statistics.median(timings):6.2f}s"
+        f"  min {min(timings):6.2f}s  max {max(timings):6.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--soffice", default=shutil.which("soffice"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if not args.soffice:
+        parser.error("soffice not found, pass --soffice")
+
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as tmp_dir:
+        work_dir = Path(tmp_dir)
+        src = work_dir / "hello.txt"
+        src.write_text("Hello\n", encoding="utf-8")
+        manager = LibreProfileManager(soffice_path=args.soffice, cache_dir=work_dir)
+
+        started = time.perf_counter()
+        manager.ensure_template()
+        print(f"template built in {time.perf_counter() - started:.2f}s (one-off)")
+
+        # Alternate the two so drifting disk caches hit both alike
+        fresh, template = [], []
+        for _ in range(args.runs):
+            fresh.append(run_fresh(soffice=args.soffice, src=src, out_dir=work_dir))
+            template.append(
+                run_template(
+                    soffice=args.soffice, manager=manager, src=src, out_dir=work_dir
+                )
+            )
+        report("fresh", fresh)
+        report("template", template)
+
+
+if __name__ == "__main__":
+    main()
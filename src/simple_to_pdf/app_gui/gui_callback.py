@@ -1,6 +1,7 @@
 import tkinter as tk
 import logging
 from typing import Literal
+from simple_to_pdf.base_services.job_queue import current_job
 from simple_to_pdf.core.config import ThemeKeys
 from simple_to_pdf.localization.localization_mixin import LocalizationMixin
 from simple_to_pdf.utils.theme_provider import ThemeProviderMixin
@@ -16,6 +17,9 @@ class GUICallback(ThemeProviderMixin, LocalizationMixin):
         self, event_type: Literal["status", "progress"], **params
     ) -> None:
         """Thread-safe router for GUI events using .after()."""
+        # Events are routed to the row of the job that emitted them
+        job = current_job()
+        job_id = job.id if job is not None else None
 
         if event_type == "progress":
             progress_params = {
@@ -26,7 +30,10 @@ class GUICallback(ThemeProviderMixin, LocalizationMixin):
                 "filename": params.get("filename", ""),
             }
             self.main_frame.after(
-                20, lambda p=progress_params: self.progress_bar_update(**p)
+                20,
+                lambda p=progress_params, j=job_id: self.progress_bar_update(
+                    job_id=j, **p
+                ),
             )
 
         elif event_type == "status":
@@ -36,25 +43,57 @@ class GUICallback(ThemeProviderMixin, LocalizationMixin):
 
             self.main_frame.after(
                 20,
-                lambda k=status_key, s=status_type, sp=status_params: self.set_status(
-                    key=k, status=s, **sp
+                lambda k=status_key, s=status_type, sp=status_params, j=job_id: (
+                    self.set_status(key=k, status=s, job_id=j, **sp)
                 ),
             )
 
     def progress_bar_update(
         self,
         *,
+        job_id: int | None = None,
         stage: Literal["processing", "converting", "merging"] = "processing",
         mode: Literal["indeterminate", "determinate"] = "indeterminate",
         current: int = 0,
         total: int = 0,
         filename: str = "",
     ) -> None:
-        """Updates the progress bar and label text in the UI."""
-        LOC_SECTION: str = "progress"
-        pb = self.main_frame.progress_bar
-        pl = self.main_frame.progress_label
+        """
+        Updates the job's own progress row, and the shared progress bar
+        when the job is the newest one (or the event belongs to no job).
+        """
+        jobs = self.main_frame.jobs_frame
+        targets = []
+        row = jobs.get(job_id)
+        if row is not None:
+            targets.append((row.progress_bar, row.progress_label))
+        if job_id is None or job_id == jobs.focused_job_id:
+            targets.append(
+                (self.main_frame.progress_bar, self.main_frame.progress_label)
+            )
+        for pb, pl in targets:
+            self._render_progress(
+                pb=pb,
+                pl=pl,
+                stage=stage,
+                mode=mode,
+                current=current,
+                total=total,
+                filename=filename,
+            )
 
+    def _render_progress(
+        self,
+        *,
+        pb,
+        pl,
+        stage: str,
+        mode: str,
+        current: int,
+        total: int,
+        filename: str,
+    ) -> None:
+        LOC_SECTION: str = "progress"
         idle_color = pb.cget("fg_color")
         active_color = self.get_color(ThemeKeys.PROGRESS_COLOR)
         stage_text = self.get_text(f"stage.{stage}", section=LOC_SECTION)
@@ -92,13 +131,20 @@ class GUICallback(ThemeProviderMixin, LocalizationMixin):
 
         pl.configure(text=progress_text)
 
-    def set_status(self, key: str, status: str = "info", **kwargs) -> None:
+    def set_status(
+        self, key: str, status: str = "info", *, job_id: int | None = None, **kwargs
+    ) -> None:
         """Appends a status message with an icon to the text console."""
         icons = {"success": "✔", "error": "✘", "warning": "⚠", "info": "ⓘ"}
         icon = icons.get(status, "ⓘ")
 
         text = self.get_text(key, section="status", **kwargs)
         message = f"{icon} {text}\n"
+        jobs = self.main_frame.jobs_frame
+        row = jobs.get(job_id)
+        if row is not None and len(jobs.rows) > 1:
+            # Tell apart messages of jobs sharing the console
+            message = f"[{row.title}] {message}"
 
         st = self.main_frame.status_text
         st.configure(state="normal")
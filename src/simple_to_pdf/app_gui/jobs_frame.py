@@ -0,0 +1,74 @@
+import logging
+from typing import Callable
+
+from simple_to_pdf.widgets import BaseFrame, BaseLabel, BaseProgress, PrimaryButton
+
+logger = logging.getLogger(__name__)
+
+
+class JobRow(BaseFrame):
+    """Title, progress and cancel button of one queued or running job."""
+
+    def __init__(self, parent, *, title: str, on_cancel: Callable[[], None]):
+        super().__init__(parent, frame_type="list_item")
+        self.title = title
+        self._on_cancel = on_cancel
+
+        self.title_label = BaseLabel(self, text=title, label_type="content")
+        self.title_label.pack(side="left", padx=(10, 6), pady=4)
+
+        self.cancel_button = PrimaryButton(
+            self, text="✕", command=self._cancel, width=32, height=28
+        )
+        self.cancel_button.pack(side="right", padx=(6, 10), pady=4)
+
+        self.progress_label = BaseLabel(self, text="", label_type="content")
+        self.progress_label.pack(side="right", padx=6, pady=4)
+
+        self.progress_bar = BaseProgress(
+            self, progress_type="merge_progress", mode="determinate"
+        )
+        self.progress_bar.configure(progress_color=self.progress_bar.cget("fg_color"))
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", fill="x", expand=True, padx=6, pady=4)
+
+    def _cancel(self) -> None:
+        self.cancel_button.configure(state="disabled")
+        self._on_cancel()
+
+
+class JobsFrame(BaseFrame):
+    """
+    One row per active job, so concurrent jobs each show their own
+    progress and can be cancelled one by one. Hidden while no job runs.
+    """
+
+    def __init__(self, parent, *, pack_options: dict):
+        super().__init__(parent)
+        self._pack_options = pack_options
+        self.rows: dict[int, JobRow] = {}
+
+    def add(self, *, job_id: int, title: str, on_cancel: Callable[[], None]) -> JobRow:
+        row = JobRow(self, title=title, on_cancel=on_cancel)
+        row.pack(side="top", fill="x", pady=2)
+        self.rows[job_id] = row
+        if len(self.rows) == 1:
+            self.pack(**self._pack_options)
+        return row
+
+    def remove(self, job_id: int) -> None:
+        row = self.rows.pop(job_id, None)
+        if row is None:
+            return
+        row.progress_bar.stop()
+        row.destroy()
+        if not self.rows:
+            self.pack_forget()
+
+    def get(self, job_id: int | None) -> JobRow | None:
+        return self.rows.get(job_id) if job_id is not None else None
+
+    @property
+    def focused_job_id(self) -> int | None:
+        """The newest job; the shared progress bar follows it."""
+        return max(self.rows, default=None)
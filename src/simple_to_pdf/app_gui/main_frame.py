@@ -5,6 +5,7 @@ from typing import Any, Callable, Dict, Tuple
 import customtkinter as ctk
 
 from simple_to_pdf.app_dialog import ConfirmDialog
+from simple_to_pdf.app_gui.jobs_frame import JobsFrame
 from simple_to_pdf.utils.file_tools import get_files
 from simple_to_pdf.utils.notification_manager import NotificationManager
 from simple_to_pdf.utils.ui_tools import (
@@ -40,6 +41,7 @@ class MainFrame(BaseFrame):
         self.filebox: CTkListbox
         self.progress_bar: BaseProgress
         self.progress_label: BaseLabel
+        self.jobs_frame: JobsFrame
 
         self.ui: Dict[str, Any] = {}
 
@@ -88,6 +90,18 @@ class MainFrame(BaseFrame):
         raw_components["progress_bar"] = p_bar
         raw_components["progress_label"] = p_label
 
+        # Shown below the shared progress bar while jobs are active
+        self.jobs_frame = JobsFrame(
+            self,
+            pack_options={
+                "side": "top",
+                "fill": "x",
+                "after": progress_area,
+                "padx": (LEFT_SIDE_PAD, RIGHT_SIDE_PAD),
+                "pady": (0, BOTTOM_SIDE_PAD),
+            },
+        )
+
         return raw_components
 
     def _register_components(self, components: Dict[str, Any]) -> None:
@@ -7,7 +7,7 @@ import webbrowser
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog
-from typing import Any, Callable, Dict, List, Literal
+from typing import Any, Callable, Dict, List
 
 import customtkinter as ctk
 
@@ -22,10 +22,12 @@ from simple_to_pdf.app_gui.help_frame import HelpFrame
 from simple_to_pdf.app_gui.list_controls_frame import ListControlsFrame
 from simple_to_pdf.app_gui.main_frame import MainFrame
 from simple_to_pdf.app_gui.settings_frame import SettingsFrame
+from simple_to_pdf.base_services.job_queue import Job, JobQueue, current_job
 from simple_to_pdf.cli.logger import get_log_dir
 from simple_to_pdf.core import config
 from simple_to_pdf.core.models import App_Mode
 from simple_to_pdf.core.version import VersionController
+from simple_to_pdf.converters.models import ImageLayout
 from simple_to_pdf.localization.localization_mixin import LocalizationMixin
 from simple_to_pdf.pdf import PageExtractor, PDFCompressor, PdfMerger
 from simple_to_pdf.pdf.conversion_service import ConversionService
@@ -57,7 +59,7 @@ class PDFMergerGUI(BaseWindow):
 
         super().__init__(title=f"{config.APP_NAME}-PDF Merger", size="1000x700")
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
-        self.thread_running: bool = False
+        self.job_queue = JobQueue(max_workers=config.MAX_PARALLEL_JOBS)
         self.conversion_service = conversion_service
         self.merger = merger
         self.page_extractor = page_extractor
@@ -116,17 +118,51 @@ class PDFMergerGUI(BaseWindow):
         self.settings_panel.callback = self._update_merge_button
 
     def toggle_ui(self, *, active: bool) -> None:
-        """Enable or disable the window controls."""
+        """
+        Switch the stop-all button for idle (active=True) or busy windows.
 
-        state = ctk.NORMAL if active else ctk.DISABLED
-        all_widgets = {**self.btns_panel.ui, **self.settings_panel.ui}
-        stop_btn = all_widgets.pop("btn_stop", None)
-        change_state(widgets_dict=all_widgets, state=state)
+        Other controls stay enabled so more jobs can be started: every job
+        reads its settings when it is submitted, shows its own progress row
+        and is cancelled from that row.
+        """
+        stop_btn = self.btns_panel.ui.get("btn_stop")
         if stop_btn:
-            if active:
-                stop_btn.configure(state=ctk.DISABLED)
-            else:
-                stop_btn.configure(state=ctk.NORMAL)
+            change_state(
+                widgets_dict={"btn_stop": stop_btn},
+                state=ctk.DISABLED if active else ctk.NORMAL,
+            )
+
+    # Interval of the check that removes finished jobs from the job rows
+    JOB_POLL_MS = 200
+
+    def on_job_started(self, job: Job, *, title: str) -> None:
+        """Show a progress row with its own cancel button for a new job."""
+        self.main_panel.jobs_frame.add(
+            job_id=job.id,
+            title=title,
+            on_cancel=lambda: self.job_queue.cancel(job.id),
+        )
+        self.toggle_ui(active=False)
+        self.after(self.JOB_POLL_MS, lambda: self._watch_job(job))
+
+    def _watch_job(self, job: Job) -> None:
+        """Remove the job's row once it finished, also if it never started."""
+        if not job.finished:
+            self.after(self.JOB_POLL_MS, lambda: self._watch_job(job))
+            return
+        self.main_panel.jobs_frame.remove(job.id)
+        self.toggle_ui(active=not self.job_queue.has_active_jobs())
+
+    def reset_progress(self) -> None:
+        """Reset the shared progress bar unless another job still uses it."""
+        job = current_job()
+
+        def reset():
+            others = [j for j in self.job_queue.active_jobs() if j is not job]
+            if not others:
+                self.main_panel.progress_bar_reset()
+
+        self.schedule_ui_task(reset)
 
     def build_gui(self) -> None:
         """Lay out the main panels."""
@@ -177,7 +213,7 @@ class PDFMergerGUI(BaseWindow):
             "dependencies": self.show_dependencies,
             "add": self.add_files,
             "remove": self.remove_files,
-            "stop": lambda: self._manage_services(action="stop"),
+            "stop": lambda: self.job_queue.cancel_all(),
             "move": lambda direction: self.main_panel.move_on_listbox(
                 direction=direction
             ),
@@ -391,7 +427,15 @@ class PDFMergerGUI(BaseWindow):
         if not out:
             return
 
-        self._run_merge_worker(files=files, output_path=out)
+        # Settings are read now, so changing them later cannot alter this job
+        self._run_merge_worker(
+            files=files,
+            output_path=out,
+            target_format=self._get_page_format(),
+            need_compress=self.settings_panel.compress_selector.get(),
+            reuse_unchanged=self.settings_panel.reuse_selector.get(),
+            job_title=Path(out).name,
+        )
 
     def schedule_ui_task(self, func, *args, delay: int = 10, **kwargs):
         if threading.current_thread() != threading.main_thread():
@@ -425,7 +469,7 @@ class PDFMergerGUI(BaseWindow):
                 f"Saving stage ({stage}) failed (OS Error): {e}", exc_info=True
             )
             if reset_ui_on_error:
-                self.schedule_ui_task(self.main_panel.progress_bar_reset)
+                self.reset_progress()
             self.callback.safe_callback(
                 "status",
                 key=f"{stage}.error.permission",
@@ -438,7 +482,7 @@ class PDFMergerGUI(BaseWindow):
                 f"Saving stage ({stage}) failed (Unknown Error): {e}", exc_info=True
             )
             if reset_ui_on_error:
-                self.schedule_ui_task(self.main_panel.progress_bar_reset)
+                self.reset_progress()
             self.callback.safe_callback(
                 "status", key=f"{stage}.error.unknown", status="error"
             )
@@ -452,11 +496,16 @@ class PDFMergerGUI(BaseWindow):
 
     @threaded_task
     def _run_merge_worker(
-        self, files: List[tuple[int, Path]], output_path: str
+        self,
+        files: List[tuple[int, Path]],
+        output_path: str,
+        target_format: PageFormat | None,
+        need_compress: bool,
+        reuse_unchanged: bool,
     ) -> None:
         """Merge the selected files, optionally compress the result, and save it."""
 
-        self.schedule_ui_task(self.main_panel.progress_bar_reset)
+        self.reset_progress()
         self.callback.safe_callback(
             "progress",
             **{
@@ -465,12 +514,15 @@ class PDFMergerGUI(BaseWindow):
             },
         )
         try:
-            conversion_res = self.conversion_service.get_pdfs_data(files=files)
-            target_format = self._get_page_format()
-            data = self.merger.merge_to_pdf(
-                conversion_rep=conversion_res, target_page_format=target_format
+            image_layout = (
+                ImageLayout(page_format=target_format) if target_format else None
             )
-            need_compress: bool = self.settings_panel.compress_selector.get()
+            with self.conversion_service.get_pdfs_data(
+                files=files, image_layout=image_layout, incremental=reuse_unchanged
+            ) as conversion_res:
+                data = self.merger.merge_to_pdf(
+                    conversion_rep=conversion_res, target_page_format=target_format
+                )
             if need_compress:
                 data = self.compressor.compress(pdf_bytes=data)
             if data:
@@ -483,11 +535,11 @@ class PDFMergerGUI(BaseWindow):
                     "status": "info",
                 },
             )
-            self.schedule_ui_task(self.main_panel.progress_bar_reset, delay=10)
+            self.reset_progress()
             return
         except Exception as e:
             logger.error(f"Merge stage failed: {e}", exc_info=True)
-            self.schedule_ui_task(self.main_panel.progress_bar_reset)
+            self.reset_progress()
             return
 
     def prompt_pages_to_remove(self) -> None:
@@ -549,22 +601,30 @@ class PDFMergerGUI(BaseWindow):
             return
 
         self._run_page_extractor_worker(
-            input_path=input_path, pages=pages, output_path=output_path
+            input_path=input_path,
+            pages=pages,
+            output_path=output_path,
+            need_compress=self.settings_panel.compress_selector.get(),
+            job_title=Path(output_path).name,
         )
 
     @threaded_task
     def _run_page_extractor_worker(
-        self, *, input_path: str, pages: List[int], output_path: str
+        self,
+        *,
+        input_path: str,
+        pages: List[int],
+        output_path: str,
+        need_compress: bool,
     ) -> None:
         """Run the page-extraction worker and report progress or errors."""
         try:
-            self.schedule_ui_task(self.main_panel.progress_bar_reset)
+            self.reset_progress()
             data = self.page_extractor.extract_pages(
                 input_path=input_path,
                 pages_to_extract=pages,
                 output_path=output_path,
             )
-            need_compress: bool = self.settings_panel.compress_selector.get()
             if need_compress:
                 data = self.compressor.compress(pdf_bytes=data)
             if data:
@@ -577,7 +637,7 @@ class PDFMergerGUI(BaseWindow):
                     "status": "info",
                 },
             )
-            self.schedule_ui_task(self.main_panel.progress_bar_reset, delay=10)
+            self.reset_progress()
             return
         except Exception as e:
             error_msg = f"Error during page extraction: {e}"
@@ -590,42 +650,29 @@ class PDFMergerGUI(BaseWindow):
                     delay=10,
                 )
             else:
-                self.callback.set_status(key="extract.error", status="error", error=e)
+                self.callback.safe_callback(
+                    "status", key="extract.error", status="error", error=e
+                )
                 logger.error(error_msg, exc_info=True)
-                self.schedule_ui_task(self.main_panel.progress_bar_reset, delay=10)
+                self.reset_progress()
             return
 
     def _on_closing(self) -> None:
         """Handle window close requests and wait for background work if needed."""
-        self._manage_services(action="stop")
+        self.job_queue.cancel_all()
         self.protocol("WM_DELETE_WINDOW", lambda: None)
         self._wait_for_thread_finish()
 
     def _wait_for_thread_finish(self) -> None:
         """Poll until any background work finishes before closing the window."""
-        if self.thread_running:
-            logger.info(
-                "Waiting for background thread to finish... (re-checking in 1s)"
-            )
+        if self.job_queue.has_active_jobs():
+            logger.info("Waiting for background jobs to finish... (re-checking in 1s)")
             self.after(1000, self._wait_for_thread_finish)
         else:
-            logger.info("Background thread finished. Closing the application.")
+            logger.info("Background jobs finished. Closing the application.")
+            self.job_queue.shutdown()
             self._save_and_destroy()
 
-    def _manage_services(self, *, action: Literal["stop", "reset"]):
-        for service in [
-            self.merger,
-            self.compressor,
-            self.conversion_service.converter,
-            self.page_extractor,
-        ]:
-            if service and hasattr(service, "stop_event"):
-                match action:
-                    case "stop":
-                        service.stop_event.set()
-                    case "reset":
-                        service.stop_event.clear()
-
     def _save_and_destroy(self) -> None:
         """Persist current settings and destroy the main window."""
         settings: Dict[str, str] = self.settings_panel.collect_data()
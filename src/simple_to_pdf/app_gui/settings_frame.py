@@ -21,6 +21,7 @@ class SettingsFrame(ToogleFrame):
         super().__init__(parent, width=width, is_open=is_open, **kwargs)
         self.language_selector: BaseOptionMenu
         self.compress_selector: BaseSwitcher
+        self.reuse_selector: BaseSwitcher
         self.settings_manager: SettingsManager = settings_manager
         self._callback = lambda *args, **kwargs: None
 
@@ -88,7 +89,16 @@ class SettingsFrame(ToogleFrame):
             value=False,
             command=lambda: self.callback(),
         )
-        widgets.update(**lang_widgets, **compress_widgets, **format_widgets)
+        reuse_widgets: Any = self._create_setting_row(
+            parent=self,
+            row_id="reuse",
+            label_text=self.get_text("settings_panel.reuse_label", section="ui"),
+            widget_class=BaseSwitcher,
+            value=False,
+        )
+        widgets.update(
+            **lang_widgets, **compress_widgets, **format_widgets, **reuse_widgets
+        )
         return widgets
 
     def _create_setting_row(
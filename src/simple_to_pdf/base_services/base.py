@@ -2,6 +2,8 @@ from abc import ABC
 import logging
 import threading
 
+from simple_to_pdf.base_services.cancellation import is_cancelled
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +20,6 @@ class BaseService(ABC):
         self._stop_event = value
 
     def check_stop(self):
-        if self.stop_event.is_set():
+        if self.stop_event.is_set() or is_cancelled():
             logger.warning("Stop signal received")
             raise InterruptedError("Operation aborted")
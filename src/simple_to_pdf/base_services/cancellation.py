@@ -0,0 +1,143 @@
+import contextlib
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationToken:
+    """
+    Cancellation signal for one unit of work.
+
+    A token is cancelled explicitly, when its deadline passes, or when its
+    parent is cancelled. Callbacks registered on it run right away on
+    cancellation, which lets blocking work (subprocesses, pools) stop
+    without waiting for the next check_stop.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        parent: "CancellationToken | None" = None,
+    ):
+        self.reason: str | None = None
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self._timer: threading.Timer | None = None
+
+        if timeout is not None:
+            self._timer = threading.Timer(
+                timeout, self.cancel, kwargs={"reason": "deadline exceeded"}
+            )
+            self._timer.daemon = True
+            self._timer.start()
+        if parent is not None:
+            parent.add_callback(lambda: self.cancel(reason=parent.reason))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def remaining(self) -> float | None:
+        """Seconds left until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, reason: str | None = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer is not None:
+            self._timer.cancel()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {e}", exc_info=True)
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback on cancellation (now, if already cancelled); return a remover."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def child(self, *, timeout: float | None = None) -> "CancellationToken":
+        """A token cancelled together with this one, optionally with its own deadline."""
+        return CancellationToken(timeout=timeout, parent=self)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise InterruptedError(f"Operation aborted: {self.reason}")
+
+
+# Tokens of the work running in the current context, outermost first
+_active_tokens: contextvars.ContextVar[tuple[CancellationToken, ...]] = (
+    contextvars.ContextVar("active_tokens", default=())
+)
+
+
+@contextlib.contextmanager
+def bind_token(token: CancellationToken | None) -> Iterator[None]:
+    """Make token observable by check_stop for the duration of the block."""
+    if token is None:
+        yield
+        return
+    reset = _active_tokens.set(_active_tokens.get() + (token,))
+    try:
+        yield
+    finally:
+        _active_tokens.reset(reset)
+
+
+def is_cancelled() -> bool:
+    return any(token.cancelled for token in _active_tokens.get())
+
+
+def on_cancel(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register callback on every active token; return a function removing it."""
+    removers = [token.add_callback(callback) for token in _active_tokens.get()]
+
+    def remove() -> None:
+        for remover in removers:
+            remover()
+
+    return remove
+
+
+def cancellable(func):
+    """
+    Bind the method's `token` keyword argument while it runs.
+
+    Everything the method calls in the same context, including check_stop
+    and threads started with a copied context, then observes the token.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with bind_token(kwargs.get("token")):
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,201 @@
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Callable
+
+from simple_to_pdf.base_services.cancellation import CancellationToken, bind_token
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(eq=False)
+class Job:
+    id: int
+    name: str
+    priority: int
+    func: Callable[[], Any]
+    state: JobState = JobState.QUEUED
+    result: Any = None
+    error: BaseException | None = None
+    token: CancellationToken = field(default_factory=CancellationToken)
+    done_event: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    @property
+    def finished(self) -> bool:
+        return self.done_event.is_set()
+
+    def cancel(self) -> None:
+        self.token.cancel(reason=f"job {self.id} cancelled")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done_event.wait(timeout)
+
+
+# Job whose function runs in the current context (worker thread and the
+# threads it starts with a copied context)
+_current_job: contextvars.ContextVar[Job | None] = contextvars.ContextVar(
+    "current_job", default=None
+)
+
+
+def current_job() -> Job | None:
+    return _current_job.get()
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a bounded set of worker threads.
+
+    Jobs with a higher priority start first, equal priorities run in
+    submission order. Every job has its own cancellation token, bound while
+    the job runs, so services observe it through BaseService.check_stop.
+    """
+
+    # Finished jobs kept for lookups by id
+    HISTORY_SIZE = 100
+
+    def __init__(self, *, max_workers: int = 2):
+        self.max_workers = max(1, max_workers)
+        self._heap: list[tuple[int, int, Job]] = []
+        self._jobs: dict[int, Job] = {}
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._idle_workers = 0
+        self._shutdown = False
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args,
+        name: str = "",
+        priority: int = 0,
+        **kwargs,
+    ) -> Job:
+        """Queue func(*args, **kwargs) and return its Job handle."""
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Job queue is shut down")
+            job_id = next(self._ids)
+            job = Job(
+                id=job_id,
+                name=name or getattr(func, "__name__", "job"),
+                priority=priority,
+                func=lambda: func(*args, **kwargs),
+            )
+            self._forget_finished()
+            self._jobs[job_id] = job
+            heapq.heappush(self._heap, (-priority, job_id, job))
+            # Idle workers only take the jobs queued before they wake up
+            if (
+                len(self._heap) > self._idle_workers
+                and len(self._workers) < self.max_workers
+            ):
+                self._start_worker()
+            self._condition.notify()
+        logger.info(f"Job {job.id} ({job.name}) queued with priority {priority}")
+        return job
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"JobWorker-{len(self._workers) + 1}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _next_job(self) -> Job | None:
+        with self._condition:
+            self._idle_workers += 1
+            try:
+                while not self._heap and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown and not self._heap:
+                    return None
+                _, _, job = heapq.heappop(self._heap)
+                job.state = JobState.RUNNING
+                return job
+            finally:
+                self._idle_workers -= 1
+
+    def _worker_loop(self) -> None:
+        while (job := self._next_job()) is not None:
+            self._run_job(job)
+
+    def _run_job(self, job: Job) -> None:
+        if job.cancelled:
+            self._finish(job, JobState.CANCELLED)
+            return
+
+        logger.info(f"Job {job.id} ({job.name}) started")
+        reset = _current_job.set(job)
+        try:
+            with bind_token(job.token):
+                job.result = job.func()
+            state = JobState.CANCELLED if job.cancelled else JobState.DONE
+        except InterruptedError:
+            state = JobState.CANCELLED
+        except Exception as e:
+            job.error = e
+            state = JobState.FAILED
+            logger.error(f"Job {job.id} ({job.name}) failed: {e}", exc_info=True)
+        finally:
+            _current_job.reset(reset)
+        self._finish(job, state)
+
+    def _finish(self, job: Job, state: JobState) -> None:
+        job.state = state
+        job.done_event.set()
+        logger.info(f"Job {job.id} ({job.name}) {state}")
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.HISTORY_SIZE)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: int) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job; False if it is unknown or finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def cancel_all(self) -> None:
+        for job in self.active_jobs():
+            job.cancel()
+
+    def active_jobs(self) -> list[Job]:
+        return [job for job in list(self._jobs.values()) if not job.finished]
+
+    def has_active_jobs(self) -> bool:
+        return bool(self.active_jobs())
+
+    def shutdown(self, *, cancel: bool = True) -> None:
+        """Stop accepting jobs; workers exit once the queue is drained."""
+        with self._condition:
+            self._shutdown = True
+            if cancel:
+                for _, _, job in self._heap:
+                    job.cancel()
+            self._condition.notify_all()
@@ -1,9 +1,8 @@
+import argparse
 import logging
 import sys
 import traceback
-import customtkinter as ctk
-from tendo import singleton
-from simple_to_pdf.app_gui.main_window import PDFMergerGUI
+from pathlib import Path
 from simple_to_pdf.cli.logger import setup_logger
 from simple_to_pdf.core import config
 from simple_to_pdf.core.version import VersionController
@@ -21,9 +20,138 @@ def handle_tk_exception(exc_type, exc_value, exc_tb):
     logger.error("Tkinter exception", exc_info=(exc_type, exc_value, exc_tb))
     traceback.print_exception(exc_type, exc_value, exc_tb)
 
-def main():
-    """Initialize application components and launch the graphical user interface."""
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="simple_to_pdf", description="Without a command the GUI is started."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    serve = commands.add_parser("serve", help="Run the local HTTP conversion server")
+    serve.add_argument("--host", default=config.SERVER_HOST)
+    serve.add_argument("--port", type=int, default=config.SERVER_PORT)
+    serve.add_argument("--workers", type=int, default=config.SERVER_WORKERS)
+    serve.add_argument(
+        "--max-queue", type=int, default=config.SERVER_MAX_QUEUE,
+        help="Waiting jobs before requests are refused with 503",
+    )
+    serve.add_argument(
+        "--allow-paths", action="store_true",
+        help="Accept JSON requests naming files on the server",
+    )
+
+    watch = commands.add_parser(
+        "watch", help="Convert or merge files dropped into folders"
+    )
+    watch.add_argument("input_dirs", nargs="+", type=Path, metavar="INPUT_DIR")
+    watch.add_argument("--output", type=Path, required=True, help="Output folder")
+    watch.add_argument(
+        "--failed", type=Path, help="Folder for failed files (default: OUTPUT/failed)"
+    )
+    watch.add_argument(
+        "--processed", type=Path,
+        help="Folder for processed originals (default: OUTPUT/processed)",
+    )
+    watch.add_argument(
+        "--merge", action="store_true", help="Merge each batch into one PDF"
+    )
+    watch.add_argument(
+        "--format", choices=list(config.PAGE_FORMATS), default="Original",
+        help="Page format of merged PDFs",
+    )
+    watch.add_argument("--batch-size", type=int, default=config.WATCH_BATCH_SIZE)
+    watch.add_argument(
+        "--settle", type=float, default=config.WATCH_SETTLE_SECONDS,
+        help="Seconds without changes before a file is picked up",
+    )
+    watch.add_argument(
+        "--poll", action="store_true", help="Poll instead of using inotify"
+    )
+
+    batch = commands.add_parser(
+        "batch", help="Build every output PDF described by a manifest"
+    )
+    batch.add_argument(
+        "manifest", type=Path, help="JSON, CSV or YAML (needs PyYAML) manifest"
+    )
+    batch.add_argument(
+        "--workers", type=int, default=config.MAX_PARALLEL_JOBS,
+        help="Outputs built at the same time",
+    )
+    batch.add_argument(
+        "--reuse", action="store_true",
+        help="Keep conversions of unchanged inputs for later runs (user cache)",
+    )
+    batch.add_argument(
+        "--cache-limit-mb", type=int, default=config.SEGMENT_CACHE_MAX_MB,
+        help="Disk space the kept conversions may use",
+    )
+    return parser
+
+
+def _setup_console_logging() -> None:
+    """Headless commands log to the console as well as to the log file."""
+    setup_logger()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
+    logging.getLogger().addHandler(handler)
+
+
+def main(argv: list[str] | None = None):
+    """Run a headless command, or launch the graphical user interface."""
+    args = _build_parser().parse_args(argv)
     sys.excepthook = handle_exception
+    if args.command == "serve":
+        from simple_to_pdf.cli.server import run_server
+
+        _setup_console_logging()
+        run_server(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_queue=args.max_queue,
+            allow_paths=args.allow_paths,
+        )
+        return
+    if args.command == "watch":
+        from simple_to_pdf.cli.watcher import run_watch
+
+        _setup_console_logging()
+        run_watch(
+            input_dirs=args.input_dirs,
+            output_dir=args.output,
+            failed_dir=args.failed,
+            processed_dir=args.processed,
+            merge=args.merge,
+            page_format=config.PAGE_FORMATS[args.format],
+            batch_size=args.batch_size,
+            settle_seconds=args.settle,
+            use_inotify=not args.poll,
+        )
+        return
+    if args.command == "batch":
+        from simple_to_pdf.cli.batch import ManifestError, run_batch
+
+        _setup_console_logging()
+        try:
+            ok = run_batch(
+                manifest=args.manifest,
+                workers=args.workers,
+                reuse=args.reuse,
+                cache_limit_mb=args.cache_limit_mb,
+            )
+        except ManifestError as e:
+            logger.error(str(e))
+            sys.exit(2)
+        sys.exit(0 if ok else 1)
+    _launch_gui()
+
+
+def _launch_gui():
+    """Initialize application components and launch the graphical user interface."""
+    # GUI-only dependencies, not needed by the headless commands
+    import customtkinter as ctk
+    from tendo import singleton
+
     ctk.CTk.report_callback_exception = handle_tk_exception
     try:
         me = singleton.SingleInstance(flavor_id="simple_to_pdf_unique_lock")  # noqa: F841
@@ -62,6 +190,8 @@ def _run_gui(
     compressor: PDFCompressor,
 ) -> None:
     """Initialize and run the main application GUI loop."""
+    from simple_to_pdf.app_gui.main_window import PDFMergerGUI
+
     try:
         app = PDFMergerGUI(
             conversion_service=conversion_service,
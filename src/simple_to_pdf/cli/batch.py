@@ -0,0 +1,325 @@
+import csv
+import io
+import json
+import logging
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from simple_to_pdf.base_services.job_queue import JobQueue, JobState
+from simple_to_pdf.converters.models import ImageLayout
+from simple_to_pdf.core import config
+from simple_to_pdf.pdf import ConversionService, PageExtractor, PDFCompressor, PdfMerger
+from simple_to_pdf.pdf.models import BytePdfDocument, MappedPdf, ProcessingReport
+from simple_to_pdf.utils.logic import get_selected_pages
+from simple_to_pdf.utils.staging import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Separates several inputs inside one CSV cell
+CSV_INPUT_SEPARATOR = ";"
+
+
+class ManifestError(ValueError):
+    """The manifest cannot be read or describes an invalid output."""
+
+
+@dataclass
+class ManifestEntry:
+    output: Path
+    inputs: list[Path]
+    page_format: str = "Original"
+    compress: bool = False
+    quality: int = 20
+    # Pages of the merged document to keep, all when None
+    pages: list[int] | None = None
+
+
+@dataclass
+class BatchResult:
+    entry: ManifestEntry
+    ok: bool
+    error: str | None = None
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "y"}
+    return bool(value)
+
+
+def _read_records(path: Path) -> list[dict]:
+    """Raw output records from a JSON, YAML or CSV manifest."""
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding="utf-8-sig")
+
+    if suffix == ".csv":
+        # Rows sharing an output are joined in file order
+        records: dict[str, dict] = {}
+        for row in csv.DictReader(io.StringIO(text)):
+            output = (row.get("output") or "").strip()
+            record = records.setdefault(output, {**row, "inputs": []})
+            record["inputs"].extend(
+                p.strip()
+                for p in (row.get("inputs") or "").split(CSV_INPUT_SEPARATOR)
+                if p.strip()
+            )
+        return list(records.values())
+
+    if suffix in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError:
+            raise ManifestError("YAML manifests need PyYAML (pip install pyyaml)")
+        data = yaml.safe_load(text)
+    elif suffix == ".json":
+        data = json.loads(text)
+    else:
+        raise ManifestError(f"Unsupported manifest type: {path.suffix}")
+
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict) or not isinstance(data.get("outputs"), list):
+        raise ManifestError('Manifest must be a list or have an "outputs" list')
+    defaults = data.get("defaults", {})
+    return [{**defaults, **record} for record in data["outputs"]]
+
+
+def load_manifest(path: Path) -> list[ManifestEntry]:
+    """Parse and validate a manifest; relative paths are taken from its folder."""
+    try:
+        records = _read_records(path)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}") from e
+
+    base_dir = path.parent
+    entries = []
+    outputs: set[Path] = set()
+    for number, record in enumerate(records, start=1):
+        try:
+            if not isinstance(record, dict):
+                raise ManifestError("entry must be an object")
+            if not record.get("output"):
+                raise ManifestError("missing output")
+            output = (base_dir / str(record["output"]).strip()).resolve()
+            if output in outputs:
+                raise ManifestError(f"duplicate output {output}")
+
+            inputs = [(base_dir / str(p)).resolve() for p in record.get("inputs", [])]
+            if not inputs:
+                raise ManifestError("no inputs")
+            missing = [str(p) for p in inputs if not p.is_file()]
+            if missing:
+                raise ManifestError(f"inputs not found: {', '.join(missing)}")
+
+            page_format = str(record.get("format") or "Original")
+            if page_format not in config.PAGE_FORMATS:
+                raise ManifestError(f"unknown format {page_format}")
+
+            quality = int(record.get("quality") or 20)
+            if not 1 <= quality <= 100:
+                raise ManifestError("quality must be 1-100")
+
+            raw_pages = str(record.get("pages") or "").strip()
+            pages = (
+                get_selected_pages(
+                    raw=raw_pages, page_limit=config.PAGE_SELECTION_LIMIT
+                )
+                if raw_pages
+                else None
+            )
+        except (ValueError, TypeError) as e:
+            raise ManifestError(f"Manifest entry {number}: {e}") from e
+
+        outputs.add(output)
+        entries.append(
+            ManifestEntry(
+                output=output,
+                inputs=inputs,
+                page_format=page_format,
+                compress=_as_bool(record.get("compress", False)),
+                quality=quality,
+                pages=pages,
+            )
+        )
+    return entries
+
+
+class BatchRunner:
+    """
+    Builds every output of a manifest in one process.
+
+    All documents that need conversion are converted up front in one pass,
+    so the warm converter batches files across outputs and an input used by
+    many outputs is converted once. Outputs are then merged in parallel on
+    a JobQueue and written atomically.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = config.MAX_PARALLEL_JOBS,
+        conversion_service: ConversionService | None = None,
+        merger: PdfMerger | None = None,
+        compressor: PDFCompressor | None = None,
+        page_extractor: PageExtractor | None = None,
+    ):
+        self.workers = workers
+        self.conversion_service = conversion_service or ConversionService()
+        self.merger = merger or PdfMerger()
+        self.compressor = compressor or PDFCompressor()
+        self.page_extractor = page_extractor or PageExtractor()
+
+    def _needs_conversion(self, path: Path) -> bool:
+        converter = self.conversion_service.converter
+        return not converter.is_pdf_file(file_path=path) and (
+            converter.needs_conversion(file_path=path)
+        )
+
+    def _layout_key(self, *, path: Path, page_format: str) -> str:
+        """Images are laid out onto the output format; other files do not vary."""
+        if self.conversion_service.converter.is_image_file(file_path=path):
+            return page_format
+        return "Original"
+
+    def _convert_inputs(
+        self, *, entries: list[ManifestEntry], reports: list[ProcessingReport]
+    ) -> dict[tuple[Path, str], BytePdfDocument]:
+        """Convert each distinct (input, layout) once, grouped by layout."""
+        groups: dict[str, dict[Path, None]] = {}
+        for entry in entries:
+            for path in entry.inputs:
+                if self._needs_conversion(path):
+                    key = self._layout_key(path=path, page_format=entry.page_format)
+                    groups.setdefault(key, {})[path] = None
+
+        converted: dict[tuple[Path, str], BytePdfDocument] = {}
+        for key, unique_paths in groups.items():
+            paths = list(unique_paths)
+            page_format = config.PAGE_FORMATS[key]
+            image_layout = ImageLayout(page_format=page_format) if page_format else None
+            logger.info(f"Converting {len(paths)} distinct inputs ({key} layout)")
+            report = self.conversion_service.get_pdfs_data(
+                list(enumerate(paths)), image_layout=image_layout
+            )
+            reports.append(report)
+            for doc in report.documents:
+                converted[(paths[doc.index], key)] = doc
+        return converted
+
+    def _build_output(
+        self,
+        *,
+        entry: ManifestEntry,
+        converted: dict[tuple[Path, str], BytePdfDocument],
+    ) -> None:
+        documents = []
+        for position, path in enumerate(entry.inputs):
+            if not self._needs_conversion(path):
+                documents.append(
+                    BytePdfDocument(
+                        index=position, data=MappedPdf(path=path), original_path=path
+                    )
+                )
+                continue
+            key = (path, self._layout_key(path=path, page_format=entry.page_format))
+            if key not in converted:
+                raise RuntimeError(f"{path.name} could not be converted")
+            doc = converted[key]
+            documents.append(
+                BytePdfDocument(
+                    index=position,
+                    data=doc.data,
+                    original_path=path,
+                    page_format=doc.page_format,
+                )
+            )
+
+        data = self.merger.merge_to_pdf(
+            conversion_rep=ProcessingReport(documents=documents),
+            target_page_format=config.PAGE_FORMATS[entry.page_format],
+        )
+        if entry.pages:
+            data = self._select_pages(data=data, pages=entry.pages)
+        if entry.compress:
+            data = self.compressor.compress(pdf_bytes=data, quality=entry.quality)
+
+        entry.output.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(io.BytesIO(data), entry.output)
+
+    def _select_pages(self, *, data: bytes, pages: list[int]) -> bytes:
+        with tempfile.TemporaryDirectory(prefix="simple_to_pdf_batch_") as tmp:
+            merged = Path(tmp) / "merged.pdf"
+            merged.write_bytes(data)
+            self.page_extractor.validate_pages(
+                input_path=merged, pages_to_extract=pages
+            )
+            return self.page_extractor.extract_pages(
+                input_path=str(merged), pages_to_extract=pages, output_path=merged
+            )
+
+    def run(self, entries: list[ManifestEntry]) -> list[BatchResult]:
+        reports: list[ProcessingReport] = []
+        results: list[BatchResult] = []
+        job_queue = JobQueue(max_workers=self.workers)
+        try:
+            converted = self._convert_inputs(entries=entries, reports=reports)
+            jobs = [
+                (
+                    entry,
+                    job_queue.submit(
+                        self._build_output,
+                        entry=entry,
+                        converted=converted,
+                        name=entry.output.name,
+                    ),
+                )
+                for entry in entries
+            ]
+            for entry, job in jobs:
+                job.wait()
+                if job.state == JobState.DONE:
+                    results.append(BatchResult(entry=entry, ok=True))
+                    logger.info(f"Wrote {entry.output}")
+                else:
+                    error = str(job.error) if job.error else str(job.state)
+                    results.append(BatchResult(entry=entry, ok=False, error=error))
+                    logger.error(f"Failed {entry.output}: {error}")
+        except BaseException:
+            job_queue.cancel_all()
+            raise
+        finally:
+            job_queue.shutdown()
+            # Conversions are kept for a rerun only while some output is missing
+            all_ok = len(results) == len(entries) and all(r.ok for r in results)
+            for report in reports:
+                report.cleanup(keep_journal=not all_ok)
+        return results
+
+
+def run_batch(
+    *,
+    manifest: Path,
+    workers: int = config.MAX_PARALLEL_JOBS,
+    reuse: bool = False,
+    cache_limit_mb: int = config.SEGMENT_CACHE_MAX_MB,
+) -> bool:
+    """
+    Build all outputs of the manifest; True when every output was written.
+
+    With reuse, conversions of unchanged inputs are kept between runs in a
+    cache of at most cache_limit_mb.
+    """
+    entries = load_manifest(manifest)
+    logger.info(f"Manifest {manifest.name}: {len(entries)} outputs")
+    conversion_service = ConversionService(
+        incremental=reuse, segment_cache_max_mb=cache_limit_mb
+    )
+    results = BatchRunner(workers=workers, conversion_service=conversion_service).run(
+        entries
+    )
+    failed = [result for result in results if not result.ok]
+    logger.info(
+        f"Batch done: {len(results) - len(failed)} written, {len(failed)} failed"
+    )
+    return not failed
@@ -0,0 +1,470 @@
+import io
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from email import policy
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import BinaryIO, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from simple_to_pdf.base_services.job_queue import Job, JobQueue, JobState
+from simple_to_pdf.converters.models import ImageLayout
+from simple_to_pdf.core import config
+from simple_to_pdf.pdf import ConversionService, PageExtractor, PDFCompressor, PdfMerger
+from simple_to_pdf.pdf.models import ProcessingReport
+from simple_to_pdf.utils.logic import get_selected_pages
+from simple_to_pdf.utils.mapped_file import open_mapped
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+MAX_JSON_BODY = 1024 * 1024
+
+
+class RequestError(Exception):
+    """A request the server refuses; status is the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class ServerRequest:
+    files: list[Path] = field(default_factory=list)
+    options: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    total_seconds: float = 0.0
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """
+    Local HTTP API over the PDF services.
+
+    The converter backends are created once and stay warm between requests.
+    Work runs on a bounded JobQueue; requests beyond max_queue waiting jobs
+    are refused with 503 instead of piling up.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        workers: int = config.SERVER_WORKERS,
+        max_queue: int = config.SERVER_MAX_QUEUE,
+        request_timeout: float = config.SERVER_REQUEST_TIMEOUT,
+        max_upload_bytes: int = config.SERVER_MAX_UPLOAD_MB * 1024 * 1024,
+        allow_paths: bool = False,
+    ):
+        super().__init__(address, ConversionRequestHandler)
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self.max_upload_bytes = max_upload_bytes
+        # Paths name files on the server, so they are opt-in
+        self.allow_paths = allow_paths
+        self.started = time.monotonic()
+
+        # Uploads live in throwaway directories, so there is nothing to resume
+        # or reuse; anonymous uploads are never kept in the segment cache
+        self.conversion_service = ConversionService(resumable=False, incremental=False)
+        self.merger = PdfMerger()
+        self.compressor = PDFCompressor()
+        self.page_extractor = PageExtractor()
+        self.job_queue = JobQueue(max_workers=workers)
+
+        self._stats: dict[str, OperationStats] = {}
+        self._stats_lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self.rejected = 0
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        """Build the LibreOffice profile now instead of on the first request."""
+        converter = self.conversion_service.converter
+        backends = getattr(converter, "backends", {"converter": converter})
+        for backend in backends.values():
+            profile_manager = getattr(backend, "profile_manager", None)
+            if profile_manager is not None:
+                profile_manager.ensure_template()
+        logger.info(f"Converter backends ready: {', '.join(self.backend_names())}")
+
+    def backend_names(self) -> list[str]:
+        converter = self.conversion_service.converter
+        backends = getattr(converter, "backends", None)
+        return list(backends) if backends else [type(converter).__name__]
+
+    def submit(self, operation: str, func: Callable[[], object]) -> Job:
+        with self._submit_lock:
+            if self.queue_depth() >= self.max_queue:
+                self.rejected += 1
+                raise RequestError(
+                    HTTPStatus.SERVICE_UNAVAILABLE, "Server queue is full"
+                )
+            return self.job_queue.submit(func, name=operation)
+
+    def queue_depth(self) -> int:
+        return sum(
+            1 for job in self.job_queue.active_jobs() if job.state == JobState.QUEUED
+        )
+
+    def record(self, operation: str, *, state: JobState, seconds: float) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(operation, OperationStats())
+            stats.count += 1
+            stats.total_seconds += seconds
+            if state == JobState.FAILED:
+                stats.failed += 1
+            elif state == JobState.CANCELLED:
+                stats.cancelled += 1
+
+    def metrics(self) -> dict:
+        active = self.job_queue.active_jobs()
+        with self._stats_lock:
+            operations = {
+                name: {
+                    "count": stats.count,
+                    "failed": stats.failed,
+                    "cancelled": stats.cancelled,
+                    "total_seconds": round(stats.total_seconds, 3),
+                }
+                for name, stats in self._stats.items()
+            }
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+            "workers": self.job_queue.max_workers,
+            "running": sum(1 for job in active if job.state == JobState.RUNNING),
+            "queue_depth": sum(1 for job in active if job.state == JobState.QUEUED),
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "backends": self.backend_names(),
+            "operations": operations,
+        }
+
+    def server_close(self) -> None:
+        self.job_queue.cancel_all()
+        self.job_queue.shutdown()
+        super().server_close()
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /convert, /merge, /compress or /extract with multipart uploads
+    (field "file", repeatable) or a JSON body {"paths": [...]}. Options come
+    from the query string, form fields or JSON keys; the PDF is streamed
+    back. GET /health and /metrics report the server state.
+    """
+
+    server: ConversionServer
+    protocol_version = "HTTP/1.1"
+    # False while a POST body is still unread on the connection
+    body_consumed = True
+
+    OPERATIONS = {
+        "convert": "_convert",
+        "merge": "_merge",
+        "compress": "_compress",
+        "extract": "_extract",
+    }
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def do_GET(self) -> None:
+        route = urlsplit(self.path).path.strip("/")
+        if route == "health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif route == "metrics":
+            self._send_json(HTTPStatus.OK, self.server.metrics())
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unknown endpoint"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        operation = url.path.strip("/")
+        self.body_consumed = False
+        try:
+            if operation not in self.OPERATIONS:
+                raise RequestError(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+            with tempfile.TemporaryDirectory(prefix="simple_to_pdf_upload_") as tmp:
+                request = self._read_request(upload_dir=Path(tmp))
+                request.options = dict(parse_qsl(url.query)) | request.options
+                work = getattr(self, self.OPERATIONS[operation])(request)
+                result = self._run_job(operation, work)
+                if isinstance(result, ProcessingReport):
+                    with result:
+                        if not result.documents:
+                            raise RequestError(
+                                HTTPStatus.UNPROCESSABLE_ENTITY,
+                                f"Could not convert {request.files[0].name}",
+                            )
+                        with result.documents[0].open() as stream:
+                            self._send_pdf(stream)
+                else:
+                    self._send_pdf(io.BytesIO(result))
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except ConnectionError:
+            logger.info(f"Client disconnected during {operation}")
+        except Exception as e:
+            logger.error(f"{operation} request failed: {e}", exc_info=True)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _run_job(self, operation: str, func: Callable[[], object]) -> object:
+        started = time.monotonic()
+        job = self.server.submit(operation, func)
+        if not job.wait(self.server.request_timeout):
+            job.cancel()
+            job.wait()
+        self.server.record(
+            operation, state=job.state, seconds=time.monotonic() - started
+        )
+
+        if job.state == JobState.CANCELLED:
+            raise RequestError(HTTPStatus.GATEWAY_TIMEOUT, "Request timed out")
+        if job.state == JobState.FAILED:
+            raise RequestError(HTTPStatus.INTERNAL_SERVER_ERROR, str(job.error))
+        return job.result
+
+    # --- Operations: validate the request, return the work for the queue ---
+
+    def _convert(self, request: ServerRequest) -> Callable[[], ProcessingReport]:
+        path = self._single_file(request)
+        return lambda: self.server.conversion_service.get_pdfs_data([(0, path)])
+
+    def _merge(self, request: ServerRequest) -> Callable[[], bytes]:
+        if not request.files:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "No files given")
+        page_format_name = request.options.get("format", "Original")
+        if page_format_name not in config.PAGE_FORMATS:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, f"Unknown page format: {page_format_name}"
+            )
+
+        page_format = config.PAGE_FORMATS[page_format_name]
+        # Same image pages as a GUI merge with this format
+        image_layout = ImageLayout(page_format=page_format) if page_format else None
+
+        def merge() -> bytes:
+            with self.server.conversion_service.get_pdfs_data(
+                list(enumerate(request.files)), image_layout=image_layout
+            ) as report:
+                return self.server.merger.merge_to_pdf(
+                    conversion_rep=report, target_page_format=page_format
+                )
+
+        return merge
+
+    def _compress(self, request: ServerRequest) -> Callable[[], bytes]:
+        path = self._single_file(request)
+        try:
+            quality = int(request.options.get("quality", 20))
+        except ValueError:
+            quality = 0
+        if not 1 <= quality <= 100:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "quality must be 1-100")
+        if not path.stat().st_size:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "File is empty")
+
+        def compress() -> bytes:
+            # PyMuPDF reads the mapped file in place instead of a heap copy
+            with open_mapped(path) as mapped, memoryview(mapped) as view:
+                return self.server.compressor.compress(pdf_bytes=view, quality=quality)
+
+        return compress
+
+    def _extract(self, request: ServerRequest) -> Callable[[], bytes]:
+        path = self._single_file(request)
+        try:
+            pages = get_selected_pages(
+                raw=request.options.get("pages", ""),
+                page_limit=config.PAGE_SELECTION_LIMIT,
+            )
+            if not pages:
+                raise ValueError("No pages given")
+            self.server.page_extractor.validate_pages(
+                input_path=path, pages_to_extract=pages
+            )
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+        return lambda: self.server.page_extractor.extract_pages(
+            input_path=str(path),
+            pages_to_extract=pages,
+            output_path=path.with_name("extracted.pdf"),
+        )
+
+    @staticmethod
+    def _single_file(request: ServerRequest) -> Path:
+        if len(request.files) != 1:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Exactly one file expected")
+        return request.files[0]
+
+    # --- Request parsing ---
+
+    def _read_request(self, *, upload_dir: Path) -> ServerRequest:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.max_upload_bytes:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Upload too large")
+        content_type = self.headers.get("Content-Type", "")
+
+        if content_type.startswith("multipart/form-data"):
+            body_path = self._spool_body(length=length, upload_dir=upload_dir)
+            self.body_consumed = True
+            try:
+                return self._parse_multipart(
+                    body_path=body_path,
+                    content_type=content_type,
+                    upload_dir=upload_dir,
+                )
+            finally:
+                body_path.unlink()
+        if content_type.startswith("application/json"):
+            # Only paths and options, so it is read at once
+            if length > MAX_JSON_BODY:
+                raise RequestError(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "JSON body too large"
+                )
+            body = self.rfile.read(length)
+            self.body_consumed = True
+            return self._parse_json(body=body)
+        raise RequestError(
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            "Send multipart/form-data uploads or a JSON body with paths",
+        )
+
+    def _spool_body(self, *, length: int, upload_dir: Path) -> Path:
+        """Copy the body to disk chunk by chunk instead of holding it in memory."""
+        body_path = upload_dir / "request.body"
+        with body_path.open("wb") as f:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(remaining, STREAM_CHUNK_SIZE))
+                if not chunk:
+                    raise ConnectionError("Client closed the connection mid-upload")
+                f.write(chunk)
+                remaining -= len(chunk)
+        return body_path
+
+    @staticmethod
+    def _parse_multipart(
+        *, body_path: Path, content_type: str, upload_dir: Path
+    ) -> ServerRequest:
+        header = f"Content-Type: {content_type}\r\n\r\n".encode("latin-1")
+        boundary = BytesParser(policy=policy.HTTP).parsebytes(header).get_boundary()
+        if not boundary or not body_path.stat().st_size:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed multipart body")
+        delimiter = b"\r\n--" + boundary.encode("latin-1")
+
+        request = ServerRequest()
+        # Parts are found in the mapped body and written out without heap copies
+        with open_mapped(body_path) as body, memoryview(body) as view:
+            # The first delimiter may start the body, without the leading CRLF
+            pos = body.find(delimiter[2:])
+            while pos != -1:
+                pos += len(delimiter) - 2
+                if body[pos : pos + 2] == b"--":
+                    return request  # Closing delimiter
+                headers_end = body.find(b"\r\n\r\n", pos)
+                end = body.find(delimiter, headers_end + 4)
+                if headers_end == -1 or end == -1:
+                    break
+                part = BytesParser(policy=policy.HTTP).parsebytes(
+                    body[pos + 2 : headers_end + 4]
+                )
+                filename = part.get_filename()
+                if filename:
+                    # Index prefix keeps upload order and avoids name clashes
+                    target = upload_dir / f"{len(request.files)}_{Path(filename).name}"
+                    with target.open("wb") as f, view[headers_end + 4 : end] as data:
+                        f.write(data)
+                    request.files.append(target)
+                else:
+                    name = part.get_param("name", header="content-disposition")
+                    if name:
+                        request.options[name] = body[headers_end + 4 : end].decode(
+                            "utf-8"
+                        )
+                pos = end + 2
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed multipart body")
+
+    def _parse_json(self, *, body: bytes) -> ServerRequest:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "JSON body must be an object")
+        paths = data.pop("paths", [])
+        if paths and not self.server.allow_paths:
+            raise RequestError(
+                HTTPStatus.FORBIDDEN, "Paths are disabled, start with --allow-paths"
+            )
+
+        files = [Path(p) for p in paths]
+        missing = [str(p) for p in files if not p.is_file()]
+        if missing:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, f"Files not found: {', '.join(missing)}"
+            )
+        return ServerRequest(
+            files=files, options={key: str(value) for key, value in data.items()}
+        )
+
+    # --- Responses ---
+
+    def _send_pdf(self, stream: BinaryIO) -> None:
+        # mmap.seek() returns None before Python 3.13, so ask tell() instead
+        stream.seek(0, io.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        shutil.copyfileobj(stream, self.wfile, STREAM_CHUNK_SIZE)
+
+    def _send_json(self, status: HTTPStatus, data: dict) -> None:
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        if not self.body_consumed:
+            # The unread upload would be parsed as the next request
+            self.send_header("Connection", "close")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def run_server(
+    *,
+    host: str = config.SERVER_HOST,
+    port: int = config.SERVER_PORT,
+    workers: int = config.SERVER_WORKERS,
+    max_queue: int = config.SERVER_MAX_QUEUE,
+    allow_paths: bool = False,
+) -> None:
+    """Serve until interrupted."""
+    server = ConversionServer(
+        (host, port), workers=workers, max_queue=max_queue, allow_paths=allow_paths
+    )
+    logger.info(f"Serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.server_close()
@@ -0,0 +1,182 @@
+import io
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from simple_to_pdf.base_services.cancellation import CancellationToken, bind_token
+from simple_to_pdf.core import config
+from simple_to_pdf.pdf import ConversionService, PdfMerger
+from simple_to_pdf.pdf.models import PageFormat
+from simple_to_pdf.utils.fs_watch import DirectoryMonitor
+from simple_to_pdf.utils.staging import move_atomic, unique_path, write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Names of files that are still being written or belong to other programs
+IGNORED_PREFIXES = (".", "~$")
+IGNORED_SUFFIXES = (".part", ".tmp", ".crdownload", ".partial")
+
+
+class WatchFolderDaemon:
+    """
+    Converts or merges files dropped into the input directories.
+
+    Settled files are processed in batches: in convert mode every file gets
+    its own PDF, in merge mode each batch becomes one PDF. Outputs are
+    written atomically to output_dir, the originals are moved to
+    processed_dir, and files that fail are moved to failed_dir.
+    """
+
+    def __init__(
+        self,
+        *,
+        input_dirs: list[Path],
+        output_dir: Path,
+        failed_dir: Path | None = None,
+        processed_dir: Path | None = None,
+        merge: bool = False,
+        page_format: PageFormat | None = None,
+        batch_size: int = config.WATCH_BATCH_SIZE,
+        settle_seconds: float = config.WATCH_SETTLE_SECONDS,
+        poll_interval: float = config.WATCH_POLL_INTERVAL,
+        use_inotify: bool = True,
+        conversion_service: ConversionService | None = None,
+        merger: PdfMerger | None = None,
+    ):
+        self.input_dirs = [d.resolve() for d in input_dirs]
+        self.output_dir = output_dir
+        self.failed_dir = failed_dir or output_dir / "failed"
+        self.processed_dir = processed_dir or output_dir / "processed"
+        for directory in (self.output_dir, self.failed_dir, self.processed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+            if directory.resolve() in self.input_dirs:
+                raise ValueError(f"{directory} is also an input directory")
+
+        self.merge = merge
+        self.page_format = page_format
+        self.batch_size = max(1, batch_size)
+        self.conversion_service = conversion_service or ConversionService()
+        self.merger = merger or PdfMerger()
+        self.monitor = DirectoryMonitor(
+            directories=self.input_dirs,
+            settle_seconds=settle_seconds,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+            accept=self._accepts,
+        )
+
+    def _accepts(self, path: Path) -> bool:
+        if path.name.startswith(IGNORED_PREFIXES):
+            return False
+        if path.name.lower().endswith(IGNORED_SUFFIXES):
+            return False
+        converter = self.conversion_service.converter
+        return converter.is_pdf_file(file_path=path) or converter.needs_conversion(
+            file_path=path
+        )
+
+    def run(self, *, token: CancellationToken | None = None) -> None:
+        """Process arrivals until the token is cancelled."""
+        token = token or CancellationToken()
+        logger.info(
+            f"Watching {', '.join(map(str, self.input_dirs))} "
+            f"({'merge' if self.merge else 'convert'} mode)"
+        )
+        try:
+            with bind_token(token):
+                while not token.cancelled:
+                    settled = self.monitor.wait_for_settled(timeout=1.0)
+                    for start in range(0, len(settled), self.batch_size):
+                        self.process_batch(settled[start : start + self.batch_size])
+        except InterruptedError:
+            logger.info("Watch mode stopped")
+        finally:
+            self.monitor.close()
+
+    def process_batch(self, files: list[Path]) -> None:
+        files = [path for path in files if path.exists()]
+        if not files:
+            return
+        logger.info(f"Processing {len(files)} new files")
+        indexed = list(enumerate(files))
+        try:
+            if self.merge:
+                self._merge_batch(indexed)
+            else:
+                self._convert_batch(indexed)
+        except InterruptedError:
+            raise
+        except Exception as e:
+            logger.error(f"Batch failed, moving files aside: {e}", exc_info=True)
+            self._move_all(files, self.failed_dir)
+
+    def _convert_batch(self, files: list[tuple[int, Path]]) -> None:
+        with self.conversion_service.get_pdfs_data(files) as report:
+            converted = {doc.index: doc for doc in report.documents}
+            for idx, path in files:
+                doc = converted.get(idx)
+                if doc is None:
+                    self._move_all([path], self.failed_dir)
+                    continue
+                target = unique_path(self.output_dir, f"{path.stem}.pdf")
+                with doc.open() as stream:
+                    write_atomic(stream, target)
+                move_atomic(path, self.processed_dir)
+                logger.info(f"Converted {path.name} -> {target.name}")
+
+    def _merge_batch(self, files: list[tuple[int, Path]]) -> None:
+        with self.conversion_service.get_pdfs_data(files) as report:
+            converted = {doc.index for doc in report.documents}
+            if converted:
+                data = self.merger.merge_to_pdf(
+                    conversion_rep=report, target_page_format=self.page_format
+                )
+                name = f"merged_{datetime.now():%Y%m%d_%H%M%S}.pdf"
+                target = unique_path(self.output_dir, name)
+                write_atomic(io.BytesIO(data), target)
+                logger.info(f"Merged {len(converted)} files -> {target.name}")
+
+        for idx, path in files:
+            self._move_all(
+                [path], self.processed_dir if idx in converted else self.failed_dir
+            )
+
+    @staticmethod
+    def _move_all(paths: list[Path], directory: Path) -> None:
+        for path in paths:
+            try:
+                move_atomic(path, directory)
+            except OSError as e:
+                logger.error(f"Could not move {path.name} to {directory}: {e}")
+
+
+def run_watch(
+    *,
+    input_dirs: list[Path],
+    output_dir: Path,
+    failed_dir: Path | None = None,
+    processed_dir: Path | None = None,
+    merge: bool = False,
+    page_format: PageFormat | None = None,
+    batch_size: int = config.WATCH_BATCH_SIZE,
+    settle_seconds: float = config.WATCH_SETTLE_SECONDS,
+    use_inotify: bool = True,
+) -> None:
+    """Watch until interrupted."""
+    daemon = WatchFolderDaemon(
+        input_dirs=input_dirs,
+        output_dir=output_dir,
+        failed_dir=failed_dir,
+        processed_dir=processed_dir,
+        merge=merge,
+        page_format=page_format,
+        batch_size=batch_size,
+        settle_seconds=settle_seconds,
+        use_inotify=use_inotify,
+    )
+    token = CancellationToken()
+    try:
+        daemon.run(token=token)
+    except KeyboardInterrupt:
+        token.cancel(reason="interrupted")
+        logger.info("Watch mode stopped")
@@ -2,7 +2,7 @@ import logging
 from pathlib import Path
 from abc import abstractmethod
 from simple_to_pdf.base_services.base import BaseService
-from simple_to_pdf.converters.models import ConversionResult
+from simple_to_pdf.converters.models import ConversionResult, ImageLayout
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,19 @@ class BaseConverter(BaseService):
         self.chunk_size = chunk_size
 
     @abstractmethod
-    def convert_to_pdf(self, *, files: list[tuple[int, Path]]) -> ConversionResult:
+    def convert_to_pdf(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
+        """
+        Convert files to PDF.
+
+        With output_dir, converters that produce files on disk may leave them
+        there and return StagedPdf handles instead of bytes.
+        """
         pass
 
     @staticmethod
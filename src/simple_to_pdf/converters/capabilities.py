@@ -0,0 +1,147 @@
+import dataclasses
+import json
+import logging
+import os
+import platform
+import subprocess
+from pathlib import Path
+
+from simple_to_pdf.converters.models import BackendInfo, ConverterCapabilities
+
+logger = logging.getLogger(__name__)
+
+# File category -> COM ProgID of the Office application that converts it
+COM_PROG_IDS = {
+    "table": "Excel.Application",
+    "document": "Word.Application",
+    "presentation": "PowerPoint.Application",
+}
+VERSION_TIMEOUT = 30
+
+SOFFICE_STANDARD_PATHS = (
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+)
+
+
+def get_mtime(path: str | Path) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def soffice_watch_paths(os_name: str) -> dict[str, float | None]:
+    """
+    Mtimes of the places a missing soffice would appear in.
+
+    Installing it adds an entry to a PATH directory, or creates one of the
+    standard paths, so either change invalidates a cached "not found".
+    """
+    paths = [p for p in os.environ.get("PATH", "").split(os.pathsep) if p]
+    if os_name == "Windows":
+        paths += SOFFICE_STANDARD_PATHS
+    return {path: get_mtime(path) for path in paths}
+
+
+def probe_soffice_version(soffice_path: str) -> str | None:
+    """Return the first line of 'soffice --version', if it prints one."""
+    try:
+        result = subprocess.run(
+            [soffice_path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=VERSION_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Cannot read LibreOffice version: {e}")
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else None
+
+
+def _command_executable(command: str) -> str:
+    """Strip arguments such as '/automation' from a LocalServer32 command."""
+    command = command.strip()
+    if command.startswith('"'):
+        return command[1:].split('"', 1)[0]
+    return command.split(" /", 1)[0].strip()
+
+
+def find_com_servers() -> dict[str, BackendInfo]:
+    """Look up registered Office COM servers in the registry, without launching them."""
+    if platform.system() != "Windows":
+        return {}
+
+    import winreg
+
+    servers: dict[str, BackendInfo] = {}
+    for prog_id in COM_PROG_IDS.values():
+        try:
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, rf"{prog_id}\CLSID") as key:
+                clsid = winreg.QueryValue(key, None)
+            server_key = rf"CLSID\{clsid}\LocalServer32"
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, server_key) as key:
+                command = winreg.QueryValue(key, None)
+        except OSError:
+            continue
+        executable = _command_executable(command)
+        servers[prog_id] = BackendInfo(path=executable, mtime=get_mtime(executable))
+    return servers
+
+
+class CapabilityStore:
+    """
+    Persists discovered converter capabilities in the cache directory.
+
+    A stored entry stays valid while the platform, PATH, the mtime of every
+    recorded executable and the places watched for a missing soffice are
+    unchanged, and the same Office COM servers are registered.
+    """
+
+    CACHE_VERSION = 2
+
+    def __init__(self, *, cache_path: Path):
+        self.cache_path = cache_path
+
+    def load(self) -> ConverterCapabilities | None:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.pop("cache_version", None) != self.CACHE_VERSION:
+                return None
+            soffice = data.pop("soffice", None)
+            com_apps = data.pop("com_apps", {})
+            return ConverterCapabilities(
+                soffice=BackendInfo(**soffice) if soffice else None,
+                com_apps={k: BackendInfo(**v) for k, v in com_apps.items()},
+                **data,
+            )
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"No usable capability cache: {e}")
+            return None
+
+    def save(self, capabilities: ConverterCapabilities) -> None:
+        data = dataclasses.asdict(capabilities)
+        data["cache_version"] = self.CACHE_VERSION
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save capability cache: {e}")
+
+    @staticmethod
+    def is_current(capabilities: ConverterCapabilities) -> bool:
+        if capabilities.platform != platform.system():
+            return False
+        if capabilities.search_path != os.environ.get("PATH", ""):
+            return False
+        backends = list(capabilities.com_apps.values())
+        if capabilities.soffice is not None:
+            backends.append(capabilities.soffice)
+        if not all(get_mtime(b.path) == b.mtime for b in backends):
+            return False
+        watched = capabilities.watched_paths.items()
+        if not all(get_mtime(path) == mtime for path, mtime in watched):
+            return False
+        # Registry reads only, so newly installed Office apps are noticed too
+        return set(find_com_servers()) == set(capabilities.com_apps)
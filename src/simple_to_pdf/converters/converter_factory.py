@@ -1,16 +1,39 @@
 import logging
+import os
 import platform
 import shutil
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, Dict
 from simple_to_pdf.converters.base_converter import BaseConverter
+from simple_to_pdf.converters.capabilities import (
+    COM_PROG_IDS,
+    SOFFICE_STANDARD_PATHS,
+    CapabilityStore,
+    find_com_servers,
+    get_mtime,
+    probe_soffice_version,
+    soffice_watch_paths,
+)
+from simple_to_pdf.converters.lib_profile import LibreProfileManager
+from simple_to_pdf.converters.models import BackendInfo, ConverterCapabilities
+from simple_to_pdf.converters.routing_converter import RoutingConverter
+from simple_to_pdf.converters.scheduler import ConversionScheduler
+from simple_to_pdf.utils.app_dirs import get_cache_dir
 
 logger = logging.getLogger(__name__)
 
 
 class ConverterFactory:
+    HISTORY_FILE_NAME = "conversion_history.json"
+    CAPABILITIES_FILE_NAME = "capabilities.json"
+
     def __init__(self):
+        # Upper bound of files per office run; chunks are sized by estimated cost
         self.chunk_size = 30
+        # Spreadsheets are exported with their cached formula results
+        self.recalculate_formulas = False
+        # Split office files between MS Office and LibreOffice when both exist
+        self.spread_load = False
 
     def _find_soffice_windows(self) -> str:
         """Strict search for LibreOffice on Windows."""
@@ -20,11 +43,7 @@ class ConverterFactory:
             logger.info(f"LibreOffice found in PATH: {in_path}")
             return in_path
 
-        standard_paths = [
-            r"C:\Program Files\LibreOffice\program\soffice.exe",
-            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-        ]
-        for p in standard_paths:
+        for p in SOFFICE_STANDARD_PATHS:
             if Path(p).exists():
                 logger.info(f"LibreOffice found at standard path: {p}")
                 return p
@@ -44,6 +63,96 @@ class ConverterFactory:
             return self._find_soffice_windows()
         return shutil.which("soffice")
 
+    def _discover_formats(
+        self, *, soffice: BackendInfo | None, com_apps: dict[str, BackendInfo]
+    ) -> dict[str, dict[str, list[str]]]:
+        """Collect the formats each available backend can convert."""
+        from simple_to_pdf.converters.img_converter import ImageConverter
+
+        backends = {"image": ImageConverter.get_supported_formats()}
+        if soffice is not None:
+            from simple_to_pdf.converters.lib_office_converter import (
+                LibreOfficeConverter,
+            )
+
+            backends["libre_office"] = LibreOfficeConverter.get_supported_formats()
+        if com_apps:
+            try:
+                from simple_to_pdf.converters.ms_office_converter import (
+                    MSOfficeConverter,
+                )
+            except ImportError as e:
+                logger.warning(f"Office COM servers found but unusable: {e}")
+                return self._sort_formats(backends)
+
+            backends["ms_office"] = {
+                category: exts
+                for category, exts in MSOfficeConverter.get_supported_formats().items()
+                if COM_PROG_IDS.get(category, "") in com_apps
+                or category not in COM_PROG_IDS
+            }
+        return self._sort_formats(backends)
+
+    @staticmethod
+    def _sort_formats(
+        backends: dict[str, dict[str, set[str]]],
+    ) -> dict[str, dict[str, list[str]]]:
+        return {
+            name: {category: sorted(exts) for category, exts in formats.items()}
+            for name, formats in backends.items()
+        }
+
+    def _discover_capabilities(self) -> ConverterCapabilities:
+        """Probe the platform for office suites; the slow path behind the cache."""
+        os_name = platform.system()
+        soffice: BackendInfo | None = None
+        if os_name in ("Windows", "Linux"):
+            try:
+                soffice_path = self._get_libre_path()
+            except FileNotFoundError as e:
+                logger.info(f"LibreOffice not available: {e}")
+                soffice_path = None
+            if soffice_path:
+                soffice = BackendInfo(
+                    path=soffice_path,
+                    mtime=get_mtime(soffice_path),
+                    version=probe_soffice_version(soffice_path),
+                )
+
+        watched_paths: dict[str, float | None] = {}
+        if soffice is None and os_name in ("Windows", "Linux"):
+            watched_paths = soffice_watch_paths(os_name)
+
+        com_apps = find_com_servers()
+        return ConverterCapabilities(
+            platform=os_name,
+            search_path=os.environ.get("PATH", ""),
+            soffice=soffice,
+            com_apps=com_apps,
+            formats=self._discover_formats(soffice=soffice, com_apps=com_apps),
+            watched_paths=watched_paths,
+        )
+
+    def get_capabilities(self, *, refresh: bool = False) -> ConverterCapabilities:
+        """Return cached capabilities, probing again only when they are stale."""
+        store = CapabilityStore(
+            cache_path=get_cache_dir() / self.CAPABILITIES_FILE_NAME
+        )
+        capabilities = None if refresh else store.load()
+        if capabilities is not None and store.is_current(capabilities):
+            logger.debug("Using cached converter capabilities")
+            return capabilities
+
+        capabilities = self._discover_capabilities()
+        store.save(capabilities)
+        soffice = capabilities.soffice
+        logger.info(
+            f"Discovered converters: LibreOffice "
+            f"{soffice.version or soffice.path if soffice else 'not found'}, "
+            f"COM {sorted(capabilities.com_apps) or 'not found'}"
+        )
+        return capabilities
+
     def _try_ms_office(self, *, chunk_size: int):
         "Encapsulates import and creation of MSOfficeConverter"
 
@@ -51,10 +160,10 @@ class ConverterFactory:
 
         return MSOfficeConverter(chunk_size=chunk_size)
 
-    def _try_libre_office(self, *, chunk_size: int):
+    def _try_libre_office(self, *, chunk_size: int, soffice_path: str | None = None):
         """Encapsulates import and creation of LibreOfficeConverter"""
 
-        self.soffice_path = self._get_libre_path()
+        self.soffice_path = soffice_path or self._get_libre_path()
 
         if not self.soffice_path:
             raise FileNotFoundError("LibreOffice ('soffice') not found.")
@@ -63,8 +172,20 @@ class ConverterFactory:
             LibreOfficeConverter,
         )
 
+        cache_dir = get_cache_dir()
+        scheduler = ConversionScheduler(
+            max_files=chunk_size, history_path=cache_dir / self.HISTORY_FILE_NAME
+        )
+        profile_manager = LibreProfileManager(
+            soffice_path=self.soffice_path,
+            cache_dir=cache_dir,
+            recalculate=self.recalculate_formulas,
+        )
         return LibreOfficeConverter(
-            soffice_path=self.soffice_path, chunk_size=chunk_size
+            soffice_path=self.soffice_path,
+            chunk_size=chunk_size,
+            scheduler=scheduler,
+            profile_manager=profile_manager,
         )
 
     def _try_image_only(self, *, chunk_size: int):
@@ -75,24 +196,45 @@ class ConverterFactory:
         return ImageConverter(chunk_size=chunk_size)
 
     def get_converter(self) -> BaseConverter:
-        os_name = platform.system()
-        logger.info(f"Operating System detected: {os_name}")
-        strategies: List[Callable[[], BaseConverter]] = []
-        if os_name == "Windows":
-            strategies = [
-                lambda: self._try_ms_office(chunk_size=self.chunk_size),
-                lambda: self._try_libre_office(chunk_size=self.chunk_size),
-            ]
-        elif os_name == "Linux":
-            strategies = [lambda: self._try_libre_office(chunk_size=self.chunk_size)]
-        strategies.append(lambda: self._try_image_only(chunk_size=self.chunk_size))
-        for strategy in strategies:
+        """
+        Create every available backend, in order of preference.
+
+        A single backend is returned as is; several are combined into a
+        RoutingConverter that picks the backend per file.
+        """
+        capabilities = self.get_capabilities()
+        logger.info(f"Operating System detected: {capabilities.platform}")
+        strategies: Dict[str, Callable[[], BaseConverter]] = {}
+        if "ms_office" in capabilities.formats:
+            strategies["ms_office"] = lambda: self._try_ms_office(
+                chunk_size=self.chunk_size
+            )
+        if capabilities.soffice is not None:
+            soffice_path = capabilities.soffice.path
+            strategies["libre_office"] = lambda: self._try_libre_office(
+                chunk_size=self.chunk_size, soffice_path=soffice_path
+            )
+        strategies["image"] = lambda: self._try_image_only(chunk_size=self.chunk_size)
+
+        backends: Dict[str, BaseConverter] = {}
+        for name, strategy in strategies.items():
             try:
-                converter: BaseConverter = strategy()
-                logger.info(f"Using converter: {converter.__class__.__name__}")
-                return converter
+                backends[name] = strategy()
             except Exception as e:
                 logger.warning(f"Converter initialization failed: {e}", exc_info=True)
+
+        if len(backends) == 1:
+            converter = next(iter(backends.values()))
+            logger.info(f"Using converter: {converter.__class__.__name__}")
+            return converter
+        if backends:
+            logger.info(f"Using converters: {', '.join(backends)}")
+            return RoutingConverter(
+                backends=backends,
+                chunk_size=self.chunk_size,
+                spread_load=self.spread_load,
+                formats=capabilities.formats,
+            )
         raise RuntimeError(
             "Could not initialize any converter. "
             "Please check if LibreOffice or MS Office is installed."
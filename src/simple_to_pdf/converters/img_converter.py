@@ -2,15 +2,18 @@ import io
 import logging
 from pathlib import Path
 
-from PIL import Image, ImageOps
+import pymupdf
+from PIL import ExifTags, Image, ImageOps
+from pypdf import PdfReader, PdfWriter
 
 from simple_to_pdf.converters.base_converter import BaseConverter
-from simple_to_pdf.converters.models import ConversionResult
+from simple_to_pdf.converters.layout_mixin import ImageLayoutMixin
+from simple_to_pdf.converters.models import ConversionResult, ImageLayout
 
 logger = logging.getLogger(__name__)
 
 
-class ImageConverter(BaseConverter):
+class ImageConverter(BaseConverter, ImageLayoutMixin):
     SUPPORTED_FORMATS = {
         "image": {
             ".jpg",
@@ -30,73 +33,219 @@ class ImageConverter(BaseConverter):
         }
     }
 
+    MAX_SIZE = 2500
+    # Modes Pillow can embed into a PDF without converting to RGB
+    PDF_NATIVE_MODES = {"1", "L", "RGB", "CMYK"}
+    # JPEG modes PDF viewers can display straight from the original stream
+    JPEG_PASSTHROUGH_MODES = {"L", "RGB", "CMYK"}
+
     def __init__(self, *, chunk_size: int = 30):
         super().__init__(chunk_size=chunk_size)
         self.SUPPORTED_FORMATS = self.get_supported_formats()
 
-    def convert_to_pdf(self, *, files: list[tuple[int, Path]]) -> ConversionResult:
-        return self._convert_images_to_pdf(files=files)
+    def convert_to_pdf(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
+        # Image pages are rendered in memory, so output_dir is not used
+        return self._convert_images_to_pdf(files=files, image_layout=image_layout)
 
     def _convert_images_to_pdf(
-        self, *, files: list[tuple[int, Path]]
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
     ) -> ConversionResult:
         all_results: ConversionResult = ConversionResult()
         for chunk in self.make_chunks(files, self.chunk_size):
             try:
-                chunk_res: ConversionResult = self._convert_images_chunk(chunk=chunk)
+                chunk_res: ConversionResult = self._convert_images_chunk(
+                    chunk=chunk, image_layout=image_layout
+                )
                 all_results.success.extend(chunk_res.success)
                 all_results.failed.extend(chunk_res.failed)
+            except InterruptedError:
+                raise
             except Exception:
                 logger.error("Chunk conversion error:", exc_info=True)
                 continue
         return all_results
 
+    def _prepare_frame(self, img: Image.Image) -> Image.Image:
+        """Return a rotated, size-limited copy of the current frame ready for PDF."""
+        frame = ImageOps.exif_transpose(img)
+        if max(frame.size) > self.MAX_SIZE:
+            frame.thumbnail((self.MAX_SIZE, self.MAX_SIZE), Image.Resampling.LANCZOS)
+        if frame.mode not in self.PDF_NATIVE_MODES:
+            rgb_frame = frame.convert("RGB")
+            frame.close()
+            frame = rgb_frame
+        return frame
+
+    def _can_pass_through_jpeg(self, img: Image.Image) -> bool:
+        """Check whether a JPEG can be embedded as is, without re-encoding."""
+        if img.mode not in self.JPEG_PASSTHROUGH_MODES:
+            return False
+        if max(img.size) > self.MAX_SIZE:
+            return False
+        orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+        return orientation == 1
+
+    def _jpeg_passthrough_to_pdf(self, *, path: Path, size: tuple[int, int]) -> bytes:
+        """Wrap the original JPEG stream into a one-page PDF as a DCTDecode image."""
+        width, height = size
+        with pymupdf.open() as doc:
+            page = doc.new_page(width=width, height=height)
+            page.insert_image(page.rect, stream=path.read_bytes())
+            return doc.tobytes(garbage=1, deflate=True)
+
+    def _set_jpeg_draft(self, img: Image.Image) -> None:
+        """
+        Let the JPEG decoder scale an oversized image down while decoding.
+
+        The DCT scale (1/2, 1/4 or 1/8) is chosen so the result is still at
+        least MAX_SIZE on its longer side; thumbnail() does the rest.
+        """
+        longest = max(img.size)
+        if longest <= self.MAX_SIZE:
+            return
+        ratio = self.MAX_SIZE / longest
+        target = (max(1, round(img.width * ratio)), max(1, round(img.height * ratio)))
+        img.draft(img.mode, target)
+        logger.debug(f"JPEG draft decoding {img.size} for target {target}")
+
+    def _stream_frames_to_pdf(self, img: Image.Image) -> bytes:
+        """
+        Encode a multi-frame image page by page.
+
+        Every frame is decoded, written as a one-page PDF and appended to the
+        writer before the next one is loaded, so at most one decoded frame is
+        held in memory regardless of the frame count.
+        """
+        writer = PdfWriter()
+        try:
+            for frame_idx in range(img.n_frames):
+                self.check_stop()
+                img.seek(frame_idx)
+                with self._prepare_frame(img) as frame:
+                    page_buffer = io.BytesIO()
+                    frame.save(page_buffer, format="PDF")
+                page_buffer.seek(0)
+                writer.append(PdfReader(page_buffer))
+
+            with io.BytesIO() as buffer:
+                writer.write(buffer)
+                return buffer.getvalue()
+        finally:
+            writer.close()
+
     def _convert_single_image(self, path: Path) -> bytes | None:
         """Convert a single image file (including multi-page images) to PDF data."""
-        MAX_SIZE = 2500
         if not path.exists():
             return None
 
         with Image.open(path) as img:
-            img = ImageOps.exif_transpose(img)
-            if max(img.size) > MAX_SIZE:
-                img.thumbnail((MAX_SIZE, MAX_SIZE), Image.Resampling.LANCZOS)
-            img.load()
-            frames = []
-            n_frames = getattr(img, "n_frames", 1)
+            if getattr(img, "n_frames", 1) > 1:
+                return self._stream_frames_to_pdf(img)
 
-            for i in range(n_frames):
-                img.seek(i)
-                frame_rgb = img.convert("RGB")
-                frames.append(frame_rgb)
+            if img.format == "JPEG":
+                if self._can_pass_through_jpeg(img):
+                    return self._jpeg_passthrough_to_pdf(path=path, size=img.size)
+                self._set_jpeg_draft(img)
 
-            if not frames:
-                return None
-
-            with io.BytesIO() as buffer:
-                try:
-                    frames[0].save(
-                        buffer,
-                        format="PDF",
-                        save_all=True,
-                        append_images=frames[1:] if len(frames) > 1 else [],
-                    )
+            with self._prepare_frame(img) as frame:
+                with io.BytesIO() as buffer:
+                    frame.save(buffer, format="PDF")
                     return buffer.getvalue()
-                finally:
-                    for f in frames:
-                        f.close()
+
+    @staticmethod
+    def _group_adjacent(chunk: list[tuple[int, Path]]) -> list[list[tuple[int, Path]]]:
+        """Split files into runs of consecutive indices (adjacent in merge order)."""
+        groups: list[list[tuple[int, Path]]] = []
+        for idx, path in sorted(chunk):
+            if groups and groups[-1][-1][0] == idx - 1:
+                groups[-1].append((idx, path))
+            else:
+                groups.append([(idx, path)])
+        return groups
+
+    @staticmethod
+    def _empty_pdf() -> bytes:
+        writer = PdfWriter()
+        with io.BytesIO() as buffer:
+            writer.write(buffer)
+            return buffer.getvalue()
+
+    def _convert_layout_group(
+        self, *, group: list[tuple[int, Path]], image_layout: ImageLayout
+    ) -> ConversionResult:
+        """
+        Lay out adjacent images together so N-up cells span several files.
+
+        The shared pages belong to the first file of the group; the other
+        files get an empty PDF, so merging in index order keeps every image
+        exactly once and in order.
+        """
+        res = ConversionResult()
+        present = []
+        for idx, path in group:
+            if path.exists():
+                present.append((idx, path))
+            else:
+                logger.warning(f"⚠️ [{idx}] File not found or empty: {path}")
+                res.failed.append((idx, path))
+        if not present:
+            return res
+
+        pdf_data, failed_paths = self._layout_images_to_pdf(
+            paths=[path for _, path in present], layout=image_layout
+        )
+        placed = [(idx, path) for idx, path in present if path not in failed_paths]
+        res.failed.extend((idx, path) for idx, path in present if path in failed_paths)
+        if pdf_data and placed:
+            res.success.append((placed[0][0], pdf_data))
+            empty = self._empty_pdf()
+            res.success.extend((idx, empty) for idx, _ in placed[1:])
+        else:
+            res.failed.extend(placed)
+        return res
 
     def _convert_images_chunk(
-        self, *, chunk: list[tuple[int, Path]]
+        self,
+        *,
+        chunk: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
     ) -> ConversionResult:
         """Process a chunk using the single-image conversion method."""
         res = ConversionResult()
+        chunk = [(idx, Path(path)) for idx, path in chunk]
+
+        if image_layout is not None and image_layout.cells_per_page > 1:
+            for group in self._group_adjacent(chunk):
+                self.check_stop()
+                try:
+                    group_res = self._convert_layout_group(
+                        group=group, image_layout=image_layout
+                    )
+                except InterruptedError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error laying out {len(group)} images: {e}")
+                    group_res = ConversionResult(failed=group)
+                res.success.extend(group_res.success)
+                res.failed.extend(group_res.failed)
+            return res
 
         for idx, path in chunk:
-            path = Path(path)
             self.check_stop()
             try:
-                pdf_data = self._convert_single_image(path)
+                if image_layout is not None:
+                    pdf_data = self._layout_image_to_pdf(path=path, layout=image_layout)
+                else:
+                    pdf_data = self._convert_single_image(path)
 
                 if pdf_data:
                     res.success.append((idx, pdf_data))
@@ -104,6 +253,8 @@ class ImageConverter(BaseConverter):
                     logger.warning(f"⚠️ [{idx}] File not found or empty: {path}")
                     res.failed.append((idx, path))
 
+            except InterruptedError:
+                raise
             except Exception as e:
                 logger.error(f"[{idx}] Error converting {path.name}: {e}")
                 res.failed.append((idx, path))
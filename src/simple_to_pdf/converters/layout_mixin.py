@@ -0,0 +1,210 @@
+import io
+import logging
+from pathlib import Path
+
+import pymupdf
+from PIL import ExifTags, Image, ImageOps
+
+from simple_to_pdf.converters.models import FitMode, ImageLayout
+
+logger = logging.getLogger(__name__)
+
+POINTS_PER_INCH = 72.0
+
+
+class ImageLayoutMixin:
+    """
+    Places images directly onto final-size pages.
+
+    Images are downsampled to the cell size at the layout DPI (never
+    upsampled) before they are embedded, so the produced pages already
+    match the target page format and need no rescaling when merged.
+    """
+
+    LAYOUT_JPEG_QUALITY = 75
+    # Modes encoded losslessly as PNG; everything else is stored as JPEG
+    LOSSLESS_MODES = {"1", "P", "LA", "RGBA", "PA", "La"}
+
+    def _get_layout_page_size(
+        self, *, layout: ImageLayout, image_size: tuple[int, int]
+    ) -> tuple[float, float]:
+        """Return the page size, turned to match the image when auto-orienting."""
+        base_w, base_h = layout.page_format.size
+        if not layout.auto_orient or layout.cells_per_page != 1:
+            return base_w, base_h
+
+        short_side, long_side = min(base_w, base_h), max(base_w, base_h)
+        img_w, img_h = image_size
+        if img_w > img_h:
+            return long_side, short_side
+        return short_side, long_side
+
+    def _get_cell_rects(
+        self, *, page_rect: pymupdf.Rect, layout: ImageLayout
+    ) -> list[pymupdf.Rect]:
+        """Split the printable page area into a row-major grid of cells."""
+        inner = pymupdf.Rect(
+            page_rect.x0 + layout.margin,
+            page_rect.y0 + layout.margin,
+            page_rect.x1 - layout.margin,
+            page_rect.y1 - layout.margin,
+        )
+        if inner.is_empty:
+            raise ValueError(f"Margin {layout.margin} leaves no printable area")
+
+        columns, rows = max(1, layout.columns), max(1, layout.rows)
+        cell_w = (inner.width - layout.spacing * (columns - 1)) / columns
+        cell_h = (inner.height - layout.spacing * (rows - 1)) / rows
+        if cell_w <= 0 or cell_h <= 0:
+            raise ValueError("Spacing leaves no room for the layout grid")
+
+        cells = []
+        for row in range(rows):
+            for col in range(columns):
+                x0 = inner.x0 + col * (cell_w + layout.spacing)
+                y0 = inner.y0 + row * (cell_h + layout.spacing)
+                cells.append(pymupdf.Rect(x0, y0, x0 + cell_w, y0 + cell_h))
+        return cells
+
+    @staticmethod
+    def _get_cell_pixels(*, rect: pymupdf.Rect, dpi: int) -> tuple[int, int]:
+        scale = dpi / POINTS_PER_INCH
+        return max(1, round(rect.width * scale)), max(1, round(rect.height * scale))
+
+    def _fit_frame_to_cell(
+        self, *, frame: Image.Image, cell_px: tuple[int, int], fit: FitMode
+    ) -> Image.Image:
+        """Crop (for fill) and downsample a frame to the cell pixel box."""
+        if fit == FitMode.FILL:
+            cell_ratio = cell_px[0] / cell_px[1]
+            width, height = frame.size
+            if width / height > cell_ratio:
+                new_w = max(1, round(height * cell_ratio))
+                left = (width - new_w) // 2
+                frame = frame.crop((left, 0, left + new_w, height))
+            else:
+                new_h = max(1, round(width / cell_ratio))
+                top = (height - new_h) // 2
+                frame = frame.crop((0, top, width, top + new_h))
+
+        if frame.width > cell_px[0] or frame.height > cell_px[1]:
+            frame.thumbnail(cell_px, Image.Resampling.LANCZOS)
+        return frame
+
+    def _encode_cell_image(self, frame: Image.Image) -> bytes:
+        with io.BytesIO() as buffer:
+            if frame.mode in self.LOSSLESS_MODES:
+                frame.save(buffer, format="PNG")
+            else:
+                if frame.mode not in ("L", "RGB", "CMYK"):
+                    frame = frame.convert("RGB")
+                frame.save(buffer, format="JPEG", quality=self.LAYOUT_JPEG_QUALITY)
+            return buffer.getvalue()
+
+    def _can_embed_original(
+        self, *, img: Image.Image, cell_px: tuple[int, int], layout: ImageLayout
+    ) -> bool:
+        """A JPEG smaller than its cell can keep its original DCT stream."""
+        if img.format != "JPEG" or getattr(img, "n_frames", 1) > 1:
+            return False
+        if layout.fit != FitMode.FIT or img.mode not in ("L", "RGB", "CMYK"):
+            return False
+        if img.width > cell_px[0] or img.height > cell_px[1]:
+            return False
+        return img.getexif().get(ExifTags.Base.Orientation, 1) == 1
+
+    def _layout_image_to_pdf(self, *, path: Path, layout: ImageLayout) -> bytes | None:
+        """Render every frame of an image into layout cells of final-size pages."""
+        if not path.exists():
+            return None
+        pdf_data, failed = self._layout_images_to_pdf(paths=[path], layout=layout)
+        return None if failed else pdf_data
+
+    def _layout_images_to_pdf(
+        self, *, paths: list[Path], layout: ImageLayout
+    ) -> tuple[bytes | None, list[Path]]:
+        """
+        Render the frames of several images into consecutive layout cells.
+
+        Cells are filled across images, so an N-up layout puts N images on a
+        page rather than starting a page per image. Returns the PDF (None if
+        nothing was placed) and the paths that could not be read.
+        """
+        failed: list[Path] = []
+        with pymupdf.open() as doc:
+            cursor = _CellCursor(doc=doc, layout=layout, owner=self)
+            for path in paths:
+                self.check_stop()
+                try:
+                    with Image.open(path) as img:
+                        self._place_image(img=img, path=path, cursor=cursor)
+                except (OSError, ValueError, Image.DecompressionBombError) as e:
+                    logger.error(f"Cannot lay out {path.name}: {e}")
+                    failed.append(path)
+            if not len(doc):
+                return None, failed
+            return doc.tobytes(garbage=1, deflate=True), failed
+
+    def _place_image(
+        self, *, img: Image.Image, path: Path, cursor: "_CellCursor"
+    ) -> None:
+        layout = cursor.layout
+        n_frames = getattr(img, "n_frames", 1)
+        drafted = False
+        if img.format == "JPEG":
+            # Decode at a DCT scale that still covers the largest cell side.
+            # draft() returns a value even when it keeps the full size, so
+            # only a changed size means the decoder actually scaled down.
+            page_w, page_h = layout.page_format.size
+            longest_px = round(max(page_w, page_h) * layout.dpi / POINTS_PER_INCH)
+            full_size = img.size
+            img.draft(img.mode, (longest_px, longest_px))
+            drafted = img.size != full_size
+
+        for frame_idx in range(n_frames):
+            self.check_stop()
+            img.seek(frame_idx)
+            with ImageOps.exif_transpose(img) as frame:
+                page, rect = cursor.next_cell(image_size=frame.size)
+                cell_px = self._get_cell_pixels(rect=rect, dpi=layout.dpi)
+                if not drafted and self._can_embed_original(
+                    img=img, cell_px=cell_px, layout=layout
+                ):
+                    stream = path.read_bytes()
+                else:
+                    with self._fit_frame_to_cell(
+                        frame=frame, cell_px=cell_px, fit=layout.fit
+                    ) as cell_frame:
+                        stream = self._encode_cell_image(cell_frame)
+
+            page.insert_image(rect, stream=stream, keep_proportion=True)
+
+
+class _CellCursor:
+    """Hands out layout cells in order, adding a page when one is full."""
+
+    def __init__(
+        self, *, doc: pymupdf.Document, layout: ImageLayout, owner: ImageLayoutMixin
+    ):
+        self.doc = doc
+        self.layout = layout
+        self.owner = owner
+        self._page: pymupdf.Page | None = None
+        self._cells: list[pymupdf.Rect] = []
+        self._next = 0
+
+    def next_cell(
+        self, *, image_size: tuple[int, int]
+    ) -> tuple[pymupdf.Page, pymupdf.Rect]:
+        if self._page is None or self._next >= len(self._cells):
+            width, height = self.owner._get_layout_page_size(
+                layout=self.layout, image_size=image_size
+            )
+            self._page = self.doc.new_page(width=width, height=height)
+            self._cells = self.owner._get_cell_rects(
+                page_rect=self._page.rect, layout=self.layout
+            )
+            self._next = 0
+        rect = self._cells[self._next]
+        self._next += 1
+        return self._page, rect
@@ -0,0 +1,187 @@
+import hashlib
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from simple_to_pdf.converters.lib_mixin import ExcelMargins, LibreSetupMixin
+
+MODULE_NAME = "SimpleToPdf"
+LIST_FILE_NAME = "export.list"
+
+# Page sizes and margins in 1/100 mm, the unit of the UNO page style
+A4_WIDTH = 21000
+A4_HEIGHT = 29700
+MM100_PER_INCH = 2540
+
+# Exports every file of a list in one soffice run. Spreadsheets flagged "1"
+# get the xlsx page policy first: A4, fit to width, unlimited height,
+# landscape when the used range is wider than MAX_COL_WIDTH columns.
+EXPORT_MACRO = """
+Sub ExportList(listUrl As String)
+    Dim fileNo As Integer, entry As String
+    On Error Goto Done
+    fileNo = FreeFile
+    Open ConvertFromURL(listUrl) For Input As #fileNo
+    Do While Not EOF(fileNo)
+        Line Input #fileNo, entry
+        If Len(entry) > 0 Then ExportOne(Split(entry, Chr(9)))
+    Loop
+    Close #fileNo
+Done:
+    StarDesktop.terminate()
+End Sub
+
+Sub ExportOne(fields)
+    Dim doc As Object
+    Dim loadArgs(2) As New com.sun.star.beans.PropertyValue
+    Dim storeArgs(0) As New com.sun.star.beans.PropertyValue
+    On Error Goto Failed
+    loadArgs(0).Name = "Hidden"
+    loadArgs(0).Value = True
+    loadArgs(1).Name = "MacroExecutionMode"
+    loadArgs(1).Value = com.sun.star.document.MacroExecMode.NEVER_EXECUTE
+    loadArgs(2).Name = "UpdateDocMode"
+    loadArgs(2).Value = com.sun.star.document.UpdateDocMode.NO_UPDATE
+    doc = StarDesktop.loadComponentFromURL(fields(0), "_blank", 0, loadArgs())
+    If fields(2) = "1" Then FitSheets(doc)
+    storeArgs(0).Name = "FilterName"
+    storeArgs(0).Value = PdfFilter(doc)
+    doc.storeToURL(fields(1), storeArgs())
+Failed:
+    CloseQuietly(doc)
+End Sub
+
+Sub CloseQuietly(doc)
+    On Error Resume Next
+    If Not IsNull(doc) Then doc.close(True)
+End Sub
+
+Function PdfFilter(doc) As String
+    If doc.supportsService("com.sun.star.sheet.SpreadsheetDocument") Then
+        PdfFilter = "calc_pdf_Export"
+    ElseIf doc.supportsService("com.sun.star.presentation.PresentationDocument") Then
+        PdfFilter = "impress_pdf_Export"
+    ElseIf doc.supportsService("com.sun.star.drawing.DrawingDocument") Then
+        PdfFilter = "draw_pdf_Export"
+    Else
+        PdfFilter = "writer_pdf_Export"
+    End If
+End Function
+
+Sub FitSheets(doc)
+    Dim styles As Object, sheet As Object, source As Object, style As Object
+    Dim cursor As Object, i As Integer, landscape As Boolean, name As String
+    styles = doc.StyleFamilies.getByName("PageStyles")
+    For i = 0 To doc.Sheets.Count - 1
+        sheet = doc.Sheets.getByIndex(i)
+        cursor = sheet.createCursor()
+        cursor.gotoEndOfUsedArea(False)
+        landscape = cursor.RangeAddress.EndColumn + 1 > {max_col_width}
+        name = sheet.PageStyle & IIf(landscape, "_landscape", "_portrait")
+        If Not styles.hasByName(name) Then
+            source = styles.getByName(sheet.PageStyle)
+            style = doc.createInstance("com.sun.star.style.PageStyle")
+            styles.insertByName(name, style)
+            style.HeaderIsOn = source.HeaderIsOn
+            style.FooterIsOn = source.FooterIsOn
+            style.IsLandscape = landscape
+            style.Width = IIf(landscape, {a4_height}, {a4_width})
+            style.Height = IIf(landscape, {a4_width}, {a4_height})
+            style.LeftMargin = {side_margin}
+            style.RightMargin = {side_margin}
+            style.TopMargin = {vertical_margin}
+            style.BottomMargin = {vertical_margin}
+            style.ScaleToPagesX = 1
+            style.ScaleToPagesY = 0
+        End If
+        sheet.PageStyle = name
+    Next i
+End Sub
+""".format(
+    max_col_width=LibreSetupMixin.MAX_COL_WIDTH,
+    a4_width=A4_WIDTH,
+    a4_height=A4_HEIGHT,
+    side_margin=round(ExcelMargins.LEFT_RIGHT_MARGIN.value * MM100_PER_INCH),
+    vertical_margin=round(ExcelMargins.TOP_BOTTOM_MARGIN.value * MM100_PER_INCH),
+)
+
+MODULE_XBA = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN"'
+    ' "module.dtd">\n'
+    '<script:module xmlns:script="http://openoffice.org/2000/script"'
+    f' script:name="{MODULE_NAME}" script:language="StarBasic">'
+    f'{escape(EXPORT_MACRO, {chr(34): "&quot;"})}</script:module>\n'
+)
+
+LIBRARY_XLB = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<!DOCTYPE library:library PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN"'
+    ' "library.dtd">\n'
+    '<library:library xmlns:library="http://openoffice.org/2000/library"'
+    ' library:name="Standard" library:readonly="false"'
+    ' library:passwordprotected="false">\n'
+    "{elements}"
+    "</library:library>\n"
+)
+
+LIBRARIES_XLC = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<!DOCTYPE library:libraries PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN"'
+    ' "libraries.dtd">\n'
+    '<library:libraries xmlns:library="http://openoffice.org/2000/library"'
+    ' xmlns:xlink="http://www.w3.org/1999/xlink">\n'
+    ' <library:library library:name="Standard"'
+    ' xlink:href="$(USER)/basic/Standard/script.xlb/" xlink:type="simple"'
+    ' library:link="false"/>\n'
+    "</library:libraries>\n"
+)
+
+
+def macro_digest() -> str:
+    """Identify the macro source, so a changed macro rebuilds the template."""
+    return hashlib.sha1(EXPORT_MACRO.encode("utf-8")).hexdigest()
+
+
+def install_export_macro(profile_dir: Path) -> None:
+    """Add the export module to the Standard Basic library of a profile."""
+    basic_dir = profile_dir / "user" / "basic"
+    library_dir = basic_dir / "Standard"
+    library_dir.mkdir(parents=True, exist_ok=True)
+    (library_dir / f"{MODULE_NAME}.xba").write_text(MODULE_XBA, encoding="utf-8")
+
+    # Keep the modules soffice created, such as Module1
+    elements = "".join(
+        f' <library:element library:name="{escape(module.stem)}"/>\n'
+        for module in sorted(library_dir.glob("*.xba"))
+    )
+    (library_dir / "script.xlb").write_text(
+        LIBRARY_XLB.format(elements=elements), encoding="utf-8"
+    )
+    libraries_path = basic_dir / "script.xlc"
+    if not libraries_path.exists():
+        libraries_path.write_text(LIBRARIES_XLC, encoding="utf-8")
+
+
+def write_export_list(
+    *, input_paths: list[Path], out_dir: Path, fit_exts: set[str]
+) -> str:
+    """
+    Write the files to export for ExportList and return the macro URL.
+
+    File URLs are percent-encoded ASCII, so Basic reads the list the same
+    way in every locale.
+    """
+    list_path = out_dir / LIST_FILE_NAME
+    lines = [
+        "\t".join(
+            (
+                path.absolute().as_uri(),
+                (out_dir / f"{path.stem}.pdf").absolute().as_uri(),
+                "1" if path.suffix.lower() in fit_exts else "0",
+            )
+        )
+        for path in input_paths
+    ]
+    list_path.write_text("\n".join(lines) + "\n", encoding="ascii")
+    list_url = list_path.absolute().as_uri()
+    return f'macro:///Standard.{MODULE_NAME}.ExportList("{list_url}")'
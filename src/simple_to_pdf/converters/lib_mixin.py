@@ -1,7 +1,11 @@
-import openpyxl
 import logging
-from pathlib import Path
+import os
+import re
+import shutil
+import zipfile
 from enum import Enum, IntEnum
+from pathlib import Path
+from typing import IO
 
 logger = logging.getLogger(__name__)
 
@@ -16,41 +20,237 @@ class ExcelMargins(Enum):
     TOP_BOTTOM_MARGIN = 0.2
 
 
+# Default header/footer distance, required by the pageMargins schema
+HEADER_FOOTER_MARGIN = 0.3
+A4_PAPER_SIZE = 9
+
+WORKSHEET_PART_RE = re.compile(r"^xl/worksheets/[^/]+\.xml$")
+ROOT_TAG_RE = re.compile(rb"<(\w+:)?worksheet[\s>]")
+SHEET_DATA_START_RE = re.compile(rb"<(?:\w+:)?sheetData\b[^>]*?(/?)>")
+DIMENSION_RE = re.compile(
+    rb"<(?:\w+:)?dimension\s[^>]*?ref=[\"']([A-Z]+)?\d*(?::([A-Z]+)\d*)?[\"']"
+)
+
+# Elements that must follow <pageMargins> and <pageSetup> (CT_Worksheet order)
+AFTER_PAGE_SETUP = (
+    "headerFooter",
+    "rowBreaks",
+    "colBreaks",
+    "customProperties",
+    "cellWatches",
+    "ignoredErrors",
+    "smartTags",
+    "drawing",
+    "legacyDrawing",
+    "legacyDrawingHF",
+    "drawingHF",
+    "picture",
+    "oleObjects",
+    "controls",
+    "webPublishItems",
+    "tableParts",
+    "extLst",
+)
+AFTER_PAGE_MARGINS = ("pageSetup",) + AFTER_PAGE_SETUP
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _column_index(letters: bytes) -> int:
+    """Convert column letters (b'A', b'AB') to a 1-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + (char - ord("A") + 1)
+    return index
+
+
+def _set_xml_attrs(tag: bytes, attrs: dict[str, str]) -> bytes:
+    """Set attributes on a single start or empty-element tag."""
+    for name, value in attrs.items():
+        pattern = re.compile(rb"(\s" + name.encode() + rb")=([\"'])[^\"']*\2")
+        replacement = rb'\1="' + value.encode() + rb'"'
+        tag, count = pattern.subn(replacement, tag, count=1)
+        if not count:
+            end = len(tag) - (2 if tag.endswith(b"/>") else 1)
+            tag = tag[:end].rstrip() + f' {name}="{value}"'.encode() + tag[end:]
+    return tag
+
+
 class LibreSetupMixin:
+    MAX_COL_WIDTH = 13
+
     def _prepare_excel_scaling(self, *, file_path: Path):
         """
         Configures Excel print settings to prevent table 'breaking'.
+
+        Only the <sheetPr>, <pageSetup> and <pageMargins> elements of every
+        worksheet part are rewritten; cell data is streamed through untouched,
+        so the workbook is never loaded as a whole.
         """
-        wb = None
-        MAX_COL_WIDTH = 13
+        patched_path = file_path.with_name(f"{file_path.name}.patched")
         try:
-            wb = openpyxl.load_workbook(str(file_path))
+            with (
+                zipfile.ZipFile(file_path) as zin,
+                zipfile.ZipFile(patched_path, "w") as zout,
+            ):
+                for item in zin.infolist():
+                    out_info = zipfile.ZipInfo(item.filename, item.date_time)
+                    out_info.compress_type = item.compress_type
+                    out_info.external_attr = item.external_attr
+                    force_zip64 = item.file_size > zipfile.ZIP64_LIMIT // 2
 
-            for sheet in wb.worksheets:
-                max_col = sheet.max_column
-                if max_col > MAX_COL_WIDTH:
-                    sheet.page_setup.orientation = sheet.ORIENTATION_LANDSCAPE
-                else:
-                    sheet.page_setup.orientation = sheet.ORIENTATION_PORTRAIT
+                    with (
+                        zin.open(item) as src,
+                        zout.open(out_info, "w", force_zip64=force_zip64) as dst,
+                    ):
+                        if WORKSHEET_PART_RE.match(item.filename):
+                            self._patch_worksheet_xml(src=src, dst=dst)
+                        else:
+                            shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+            os.replace(patched_path, file_path)
+        except Exception as e:
+            logger.error(f"⚠️ Failed to scale table file {file_path.name}: {e}")
+        finally:
+            patched_path.unlink(missing_ok=True)
 
-                sheet.page_setup.fitToWidth = TableScaling.SINGLE_PAGE.value
-                sheet.page_setup.fitToHeight = TableScaling.UNLIMITED.value
+    def _patch_worksheet_xml(self, *, src: IO[bytes], dst: IO[bytes]) -> None:
+        """Stream one worksheet part, patching the parts around <sheetData>."""
+        buffer = b""
+        match = None
+        while match is None:
+            chunk = src.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            match = SHEET_DATA_START_RE.search(buffer)
 
-                assert sheet.sheet_properties.pageSetUpPr is not None
-                sheet.sheet_properties.pageSetUpPr.fitToPage = True
+        prefix = self._get_root_prefix(buffer)
+        if match is None:
+            # No <sheetData> at all: the part is small, patch it in one piece
+            orientation = self._get_orientation(buffer)
+            patched = self._patch_sheet_head(buffer, prefix=prefix)
+            dst.write(
+                self._patch_sheet_tail(patched, prefix=prefix, orientation=orientation)
+            )
+            return
 
-                sheet.page_setup.paperSize = sheet.PAPERSIZE_A4
+        head, rest = buffer[: match.start()], buffer[match.start() :]
+        orientation = self._get_orientation(head)
+        dst.write(self._patch_sheet_head(head, prefix=prefix))
 
-                sheet.page_margins.left = ExcelMargins.LEFT_RIGHT_MARGIN.value
-                sheet.page_margins.right = ExcelMargins.LEFT_RIGHT_MARGIN.value
-                sheet.page_margins.top = ExcelMargins.TOP_BOTTOM_MARGIN.value
-                sheet.page_margins.bottom = ExcelMargins.TOP_BOTTOM_MARGIN.value
-        except Exception as e:
-            logger.error(f"⚠️ Failed to scale table file {file_path.name}: {e}")
-        finally:
-            if wb is not None:
-                try:
-                    wb.save(str(file_path))
-                    wb.close()
-                except Exception as e:
-                    logger.error(f"⚠️ Failed to save table file {file_path.name}: {e}")
+        if not match.group(1):
+            # Pass <sheetData> through, keeping a marker-sized overlap between reads
+            end_marker = b"</" + prefix + b"sheetData>"
+            keep = len(end_marker) - 1
+            while (end := rest.find(end_marker)) == -1:
+                dst.write(rest[:-keep])
+                rest = rest[-keep:]
+                chunk = src.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    raise ValueError("Worksheet part ends inside <sheetData>")
+                rest += chunk
+            end += len(end_marker)
+            dst.write(rest[:end])
+            rest = rest[end:]
+
+        tail = rest + src.read()
+        dst.write(self._patch_sheet_tail(tail, prefix=prefix, orientation=orientation))
+
+    @staticmethod
+    def _get_root_prefix(head: bytes) -> bytes:
+        """Return the namespace prefix of the worksheet root (usually empty)."""
+        root = ROOT_TAG_RE.search(head)
+        return (root.group(1) or b"") if root else b""
+
+    def _get_orientation(self, head: bytes) -> str:
+        """Pick the orientation from the used range in <dimension ref=...>."""
+        dimension = DIMENSION_RE.search(head)
+        if not dimension:
+            return "portrait"
+        last_col = dimension.group(2) or dimension.group(1) or b"A"
+        if _column_index(last_col) > self.MAX_COL_WIDTH:
+            return "landscape"
+        return "portrait"
+
+    @staticmethod
+    def _patch_sheet_head(head: bytes, *, prefix: bytes) -> bytes:
+        """Set <sheetPr><pageSetUpPr fitToPage="1"/></sheetPr>."""
+        fit_to_page = b"<" + prefix + b'pageSetUpPr fitToPage="1"/>'
+
+        sheet_pr = re.search(rb"<(?:\w+:)?sheetPr\b[^>]*?(/?)>", head)
+        if sheet_pr is None:
+            root = ROOT_TAG_RE.search(head)
+            if root is None:
+                return head
+            root_end = head.index(b">", root.start()) + 1
+            element = b"<" + prefix + b"sheetPr>" + fit_to_page
+            element += b"</" + prefix + b"sheetPr>"
+            return head[:root_end] + element + head[root_end:]
+
+        if sheet_pr.group(1):
+            opening = sheet_pr.group(0)[:-2].rstrip() + b">"
+            element = opening + fit_to_page + b"</" + prefix + b"sheetPr>"
+            return head[: sheet_pr.start()] + element + head[sheet_pr.end() :]
+
+        setup_pr = re.search(rb"<(?:\w+:)?pageSetUpPr\b[^>]*>", head)
+        if setup_pr is not None:
+            tag = _set_xml_attrs(setup_pr.group(0), {"fitToPage": "1"})
+            return head[: setup_pr.start()] + tag + head[setup_pr.end() :]
+
+        # pageSetUpPr is the last child of sheetPr
+        close = head.index(b"</" + prefix + b"sheetPr>", sheet_pr.end())
+        return head[:close] + fit_to_page + head[close:]
+
+    @staticmethod
+    def _upsert_empty_element(
+        tail: bytes,
+        *,
+        prefix: bytes,
+        name: str,
+        attrs: dict[str, str],
+        followers: tuple[str, ...],
+    ) -> bytes:
+        """Update an empty element's attributes, or insert it in schema order."""
+        existing = re.search(rb"<(?:\w+:)?" + name.encode() + rb"\b[^>]*>", tail)
+        if existing is not None:
+            tag = _set_xml_attrs(existing.group(0), attrs)
+            return tail[: existing.start()] + tag + tail[existing.end() :]
+
+        tag = _set_xml_attrs(b"<" + prefix + name.encode() + b"/>", attrs)
+        followers_re = b"|".join(f.encode() for f in followers)
+        follower = re.search(rb"<(?:\w+:)?(?:" + followers_re + rb")\b", tail)
+        if follower is not None:
+            insert_at = follower.start()
+        else:
+            insert_at = tail.rindex(b"</" + prefix + b"worksheet>")
+        return tail[:insert_at] + tag + tail[insert_at:]
+
+    def _patch_sheet_tail(
+        self, tail: bytes, *, prefix: bytes, orientation: str
+    ) -> bytes:
+        """Set A4 paper, fit-to-width scaling and narrow margins."""
+        side = str(ExcelMargins.LEFT_RIGHT_MARGIN.value)
+        vertical = str(ExcelMargins.TOP_BOTTOM_MARGIN.value)
+        margins = {"left": side, "right": side, "top": vertical, "bottom": vertical}
+        if not re.search(rb"<(?:\w+:)?pageMargins\b", tail):
+            margins["header"] = margins["footer"] = str(HEADER_FOOTER_MARGIN)
+
+        tail = self._upsert_empty_element(
+            tail,
+            prefix=prefix,
+            name="pageMargins",
+            attrs=margins,
+            followers=AFTER_PAGE_MARGINS,
+        )
+        return self._upsert_empty_element(
+            tail,
+            prefix=prefix,
+            name="pageSetup",
+            attrs={
+                "paperSize": str(A4_PAPER_SIZE),
+                "orientation": orientation,
+                "fitToWidth": str(TableScaling.SINGLE_PAGE.value),
+                "fitToHeight": str(TableScaling.UNLIMITED.value),
+            },
+            followers=AFTER_PAGE_SETUP,
+        )
@@ -1,13 +1,26 @@
+import contextlib
 import logging
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import openpyxl
+from simple_to_pdf.converters.lib_macro import write_export_list
 from simple_to_pdf.converters.lib_mixin import LibreSetupMixin
+from simple_to_pdf.converters.lib_profile import LibreProfileManager
 from simple_to_pdf.converters.img_converter import ImageConverter
-from simple_to_pdf.converters.models import ConversionResult
+from simple_to_pdf.converters.models import (
+    ConversionCancelled,
+    ConversionResult,
+    ImageLayout,
+    StagedPdf,
+)
+from simple_to_pdf.converters.scheduler import ConversionScheduler
+from simple_to_pdf.utils.process_tools import run_managed
+from simple_to_pdf.utils.staging import StageMethod, stage_file
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +32,45 @@ class LibreOfficeConverter(ImageConverter, LibreSetupMixin):
         "presentation": {".ppt", ".pptx", ".odp"},
     }
 
-    def __init__(self, *, soffice_path: str, chunk_size: int = 30):
+    # Spreadsheets with no xlsx page setup to patch; the export macro of the
+    # profile applies the same page policy while exporting them
+    MACRO_FIT_EXTS = {".xls", ".xlsb", ".ods", ".csv"}
+    # Staged files rewritten in place before export; never linked to originals
+    MUTATED_EXTS = {".xlsx"}
+
+    def __init__(
+        self,
+        *,
+        soffice_path: str,
+        chunk_size: int = 30,
+        scheduler: ConversionScheduler | None = None,
+        profile_manager: LibreProfileManager | None = None,
+    ):
         # Call constructor of base class, so it can initialize its data
         super().__init__(chunk_size=chunk_size)
         self.soffice_path = soffice_path
+        self.scheduler = scheduler or ConversionScheduler(max_files=chunk_size)
+        self.profile_manager = profile_manager
+        # Per thread, so concurrent jobs each keep their own profile clone
+        self._job_local = threading.local()
         self.SUPPORTED_FORMATS = self.get_supported_formats()
 
-    def convert_to_pdf(self, *, files: list[tuple[int, Path]]) -> ConversionResult:
+    @property
+    def _profile_url(self) -> str | None:
+        """UserInstallation URL of the profile clone used by the running job."""
+        return getattr(self._job_local, "profile_url", None)
+
+    @_profile_url.setter
+    def _profile_url(self, value: str | None):
+        self._job_local.profile_url = value
+
+    def convert_to_pdf(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
         """Categorize files by type, convert them to PDF, and aggregate the results."""
         docs: list[tuple[int, Path]] = []
         imgs: list[tuple[int, Path]] = []
@@ -41,8 +86,8 @@ class LibreOfficeConverter(ImageConverter, LibreSetupMixin):
                 docs.append((idx, path))
             elif self.is_image_file(file_path=path):
                 imgs.append((idx, path))
-        docs_res = self._convert_docs_to_pdf(files=docs)
-        img_res = self._convert_images_to_pdf(files=imgs)
+        docs_res = self._convert_docs_to_pdf(files=docs, output_dir=output_dir)
+        img_res = self._convert_images_to_pdf(files=imgs, image_layout=image_layout)
 
         final_result.success.extend(docs_res.success)
         final_result.failed.extend(docs_res.failed)
@@ -51,143 +96,206 @@ class LibreOfficeConverter(ImageConverter, LibreSetupMixin):
         return final_result
 
     def _convert_docs_to_pdf(
-        self, *, files: list[tuple[int, Path]]
+        self, *, files: list[tuple[int, Path]], output_dir: Path | None = None
     ) -> ConversionResult:
         """Convert documents to PDF in chunks and aggregate conversion results."""
         all_results = ConversionResult()
-        for chunk in self.make_chunks(files, self.chunk_size):
-            self.check_stop()
-            chunk_res = self._convert_chunk(chunk=chunk)
-            all_results.success.extend(chunk_res.success)
-            all_results.failed.extend(chunk_res.failed)
+        if not files:
+            return all_results
+        try:
+            with contextlib.ExitStack() as stack:
+                self._profile_url = self._enter_job_profile(stack)
+                for chunk in self.scheduler.make_chunks(files):
+                    self.check_stop()
+                    chunk_res = self._convert_chunk(chunk=chunk, output_dir=output_dir)
+                    all_results.success.extend(chunk_res.success)
+                    all_results.failed.extend(chunk_res.failed)
+        except ConversionCancelled as e:
+            e.result.success[:0] = all_results.success
+            self._log_cancelled(files=files, result=e.result)
+            raise
+        finally:
+            self._profile_url = None
+            self.scheduler.save_history()
         return all_results
 
-    def _run_libreoffice_format_conversion(
-        self, *, input_paths: list[Path], out_dir: Path
-    ):
-        """All tables to xlsx conversion"""
-
-        command = [
-            self.soffice_path,
-            "--headless",
-            "--convert-to",
-            "xlsx",
-            "--outdir",
-            str(out_dir),
-        ] + [str(p) for p in input_paths]
-
-        num_files = len(input_paths)
-        timeout = 10 + num_files * 5
+    @staticmethod
+    def _log_cancelled(
+        *, files: list[tuple[int, Path]], result: ConversionResult
+    ) -> None:
+        done = {idx for idx, _ in result.success}
+        names = [path.name for idx, path in files if idx in done]
+        logger.info(
+            f"LibreOffice cancelled after converting {len(names)} of {len(files)} "
+            f"files: {', '.join(names) or 'none'}"
+        )
 
+    def _enter_job_profile(self, stack: contextlib.ExitStack) -> str | None:
+        """Clone the tuned profile for this job; None keeps soffice's default."""
+        if self.profile_manager is None:
+            return None
         try:
-            subprocess.run(command, check=True, capture_output=True, timeout=timeout)
-            # Deleting old xls
-            for p in input_paths:
-                if p.exists():
-                    p.unlink()
-        except subprocess.TimeoutExpired:
-            logger.error(
-                f"LibreOffice timed out after {timeout} seconds for {num_files} files: {[p.name for p in input_paths]}"
-            )
-        except subprocess.CalledProcessError as e:
-            logger.error(
-                f"LibreOffice conversion error for {[p.name for p in input_paths]}: {e.stderr.decode()}",
-                exc_info=True,
-            )
-        except Exception as e:
-            logger.error(
-                f" Unexpected error during table conversion: {e}", exc_info=True
-            )
+            return stack.enter_context(self.profile_manager.clone())
+        except OSError as e:
+            logger.warning(f"Using default LibreOffice profile: {e}")
+            return None
 
     def _prepare_temp_files(
         self, *, chunk: list[tuple[int, Path]], tmp_path: Path
     ) -> list[Path]:
-        """Copy files in temporary directory with index prefix."""
+        """Stage files in temporary directory with index prefix."""
 
         paths: list[Path] = []
+        methods: dict[StageMethod, int] = {}
         for idx, original_path in chunk:
             temp_name = f"{idx}_{original_path.name}"
             temp_file_path = tmp_path / temp_name
-            shutil.copy2(original_path, temp_file_path)
+            method = stage_file(
+                original_path,
+                temp_file_path,
+                writable=original_path.suffix.lower() in self.MUTATED_EXTS,
+            )
+            methods[method] = methods.get(method, 0) + 1
             paths.append(temp_file_path)
+        logger.debug(f"Staged {len(paths)} files: {methods}")
         return paths
 
-    def _convert_chunk(self, *, chunk: list[tuple[int, Path]]) -> ConversionResult:
+    def _convert_chunk(
+        self, *, chunk: list[tuple[int, Path]], output_dir: Path | None = None
+    ) -> ConversionResult:
         """Logic for processing one chunk of files."""
 
-        to_convert_exts: list[str] = [".xls", ".xlsb", ".ods", ".csv"]
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
 
             all_tmp_paths: list[Path] = self._prepare_temp_files(
                 chunk=chunk, tmp_path=tmp_path
             )
-            xls_to_convert: list[Path] = [
-                p for p in all_tmp_paths if p.suffix.lower() in to_convert_exts
-            ]
-            if xls_to_convert:
-                self._run_libreoffice_format_conversion(
-                    input_paths=xls_to_convert, out_dir=tmp_path
-                )
-                all_tmp_paths = self._update_paths(
-                    all_paths=all_tmp_paths, to_check_exts=to_convert_exts
-                )
             for path in all_tmp_paths:
-                if path.suffix.lower() == ".xlsx":
+                if path.suffix.lower() in self.MUTATED_EXTS:
                     self._prepare_excel_scaling(file_path=path)
-            input_paths = [str(p) for p in all_tmp_paths]
 
-            success = self._run_libreoffice_command(
-                input_paths=input_paths, out_dir=tmp_path
+            staged = dict(zip((idx for idx, _ in chunk), all_tmp_paths))
+            return self._convert_isolated(
+                chunk=chunk, staged=staged, tmp_path=tmp_path, output_dir=output_dir
             )
 
-            chunk_res: ConversionResult = ConversionResult()
-            if success:
-                chunk_res = self._collect_results(chunk=chunk, tmp_path=tmp_path)
+    def _run_export(self, *, input_paths: list[Path], out_dir: Path) -> bool:
+        """Export staged files to PDF; True only if the soffice run succeeded."""
+        needs_macro = any(p.suffix.lower() in self.MACRO_FIT_EXTS for p in input_paths)
+        macro_url = None
+        if needs_macro and self._profile_url:
+            macro_url = write_export_list(
+                input_paths=input_paths, out_dir=out_dir, fit_exts=self.MACRO_FIT_EXTS
+            )
+        elif needs_macro:
+            logger.warning(
+                "No export macro without the tuned profile, legacy spreadsheets "
+                "keep LibreOffice's page style"
+            )
+        return self._run_libreoffice_command(
+            input_paths=[str(p) for p in input_paths],
+            out_dir=out_dir,
+            macro_url=macro_url,
+        )
+
+    def _convert_isolated(
+        self,
+        *,
+        chunk: list[tuple[int, Path]],
+        staged: dict[int, Path],
+        tmp_path: Path,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
+        """
+        Convert staged files, isolating the ones that break soffice.
+
+        When a run fails (timeout, crash), the PDFs it already produced are
+        kept and the remaining files are retried in halves, until the file
+        that keeps failing is converted on its own and reported as failed.
+        """
+        self.check_stop()
+        try:
+            run_ok = self._run_export(
+                input_paths=[staged[idx] for idx, _ in chunk], out_dir=tmp_path
+            )
+        except InterruptedError:
+            # Keep the PDFs soffice finished before it was killed
+            done = self._collect_results(
+                chunk=chunk,
+                tmp_path=tmp_path,
+                verify=True,
+                output_dir=output_dir,
+                report_missing=False,
+            )
+            raise ConversionCancelled(ConversionResult(success=done.success))
+        chunk_res = self._collect_results(
+            chunk=chunk, tmp_path=tmp_path, verify=not run_ok, output_dir=output_dir
+        )
+        if run_ok or len(chunk) == 1 or not chunk_res.failed:
             return chunk_res
 
-    def _update_paths(
-        self, *, all_paths: list[Path], to_check_exts: list[str]
-    ) -> list[Path]:
-        """Validate file extensions and replace with existing .xlsx counterparts if applicable."""
-        updated = []
-        for p in all_paths:
-            if p.suffix.lower() in to_check_exts:
-                expected = p.with_suffix(".xlsx")
-                if expected.exists():
-                    updated.append(expected)
-                else:
-                    logger.warning(
-                        f"Failed to xlsx conversion {p.name}, keeping as {p.suffix}"
-                    )
-                    updated.append(p)
-            else:
-                updated.append(p)
-        return updated
+        failed_idx = {idx for idx, _ in chunk_res.failed}
+        remaining = [item for item in chunk if item[0] in failed_idx]
+        logger.warning(
+            f"LibreOffice run failed, harvested {len(chunk_res.success)} of "
+            f"{len(chunk)} files, retrying {len(remaining)} in smaller batches"
+        )
+
+        final_res = ConversionResult(success=chunk_res.success)
+        middle = (len(remaining) + 1) // 2
+        for part in (remaining[:middle], remaining[middle:]):
+            if not part:
+                continue
+            try:
+                part_res = self._convert_isolated(
+                    chunk=part, staged=staged, tmp_path=tmp_path, output_dir=output_dir
+                )
+            except ConversionCancelled as e:
+                e.result.success[:0] = final_res.success
+                raise
+            final_res.success.extend(part_res.success)
+            final_res.failed.extend(part_res.failed)
+        return final_res
 
     def _run_libreoffice_command(
-        self, *, input_paths: list[str], out_dir: Path
+        self, *, input_paths: list[str], out_dir: Path, macro_url: str | None = None
     ) -> bool:
-        """Run the LibreOffice conversion command."""
+        """Run the LibreOffice conversion, or the export macro when given."""
 
         command = [
             self.soffice_path,
             "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(out_dir),
-        ] + input_paths
+            "--norestore",
+        ]
+        if self._profile_url:
+            command.append(f"-env:UserInstallation={self._profile_url}")
+        if macro_url:
+            # The macro reads its file list from out_dir and quits soffice
+            command.append(macro_url)
+        else:
+            command += ["--convert-to", "pdf", "--outdir", str(out_dir)]
+            command += input_paths
         num_files = len(input_paths)
-        timeout = 10 + num_files * 5
+        paths = [Path(p) for p in input_paths]
+        timeout = self.scheduler.timeout_for(paths)
         try:
-            subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+            started = time.monotonic()
+            # Cancellation kills the whole soffice process tree within a poll
+            run_managed(command, timeout=timeout, check=True)
+            elapsed = time.monotonic() - started
+            logger.info(f"LibreOffice converted {num_files} files in {elapsed:.1f}s")
+            self.scheduler.record(paths, elapsed)
             return True
         except subprocess.TimeoutExpired:
             logger.error(
-                f"LibreOffice timed out after {timeout} seconds for {num_files} files"
+                f"LibreOffice timed out after {timeout:.0f} seconds for {num_files} files"
             )
+            self.scheduler.record(paths, timeout, timed_out=True)
             return False
+        except InterruptedError:
+            logger.info("LibreOffice run cancelled")
+            raise
         except subprocess.CalledProcessError as e:
             logger.error(f"LibreOffice error: {e}", exc_info=True)
             return False
@@ -197,17 +305,47 @@ class LibreOfficeConverter(ImageConverter, LibreSetupMixin):
             )
             return False
 
+    @staticmethod
+    def _is_complete_pdf(path: Path) -> bool:
+        """Check for the trailing %%EOF an interrupted export does not write."""
+        TAIL_SIZE = 1024
+        with path.open("rb") as f:
+            f.seek(max(0, path.stat().st_size - TAIL_SIZE))
+            return b"%%EOF" in f.read()
+
     def _collect_results(
-        self, *, chunk: list[tuple[int, Path]], tmp_path: Path
+        self,
+        *,
+        chunk: list[tuple[int, Path]],
+        tmp_path: Path,
+        verify: bool = False,
+        output_dir: Path | None = None,
+        report_missing: bool = True,
     ) -> ConversionResult:
-        """Reads created PDF files into memory."""
+        """
+        Reads created PDF files into memory, or moves them into output_dir.
+
+        With verify=True (after a failed run) outputs are checked for
+        completeness, and partial files are removed so a retry can recreate them.
+        """
         res = ConversionResult()
         for idx, original_path in chunk:
             expected_pdf = tmp_path / f"{idx}_{original_path.stem}.pdf"
-            if expected_pdf.exists():
+            if (
+                expected_pdf.exists()
+                and verify
+                and not self._is_complete_pdf(expected_pdf)
+            ):
+                logger.warning(f"Discarding incomplete pdf: {expected_pdf.name}")
+                expected_pdf.unlink()
+            if expected_pdf.exists() and output_dir is not None:
+                staged_pdf = Path(shutil.move(expected_pdf, output_dir))
+                res.success.append((idx, StagedPdf(path=staged_pdf)))
+            elif expected_pdf.exists():
                 res.success.append((idx, expected_pdf.read_bytes()))
             else:
-                logger.warning(f"Failed conversion to pdf: {expected_pdf.name}")
+                if report_missing:
+                    logger.warning(f"Failed conversion to pdf: {expected_pdf.name}")
                 res.failed.append((idx, original_path))
         return res
 
@@ -0,0 +1,241 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from simple_to_pdf.converters.lib_macro import install_export_macro, macro_digest
+from simple_to_pdf.utils.staging import stage_file
+
+logger = logging.getLogger(__name__)
+
+XCU_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<oor:items xmlns:oor="http://openoffice.org/2001/registry"'
+    ' xmlns:xs="http://www.w3.org/2001/XMLSchema"'
+    ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+)
+XCU_FOOTER = "</oor:items>\n"
+
+# (node path, property, xs type, value) written into registrymodifications.xcu
+HEADLESS_SETTINGS: tuple[tuple[str, str, str, str], ...] = (
+    # No document recovery or autosave bookkeeping during conversions
+    ("/org.openoffice.Office.Recovery/AutoSave", "Enabled", "boolean", "false"),
+    ("/org.openoffice.Office.Recovery/RecoveryInfo", "Enabled", "boolean", "false"),
+    ("/org.openoffice.Office.Common/Save/Document", "AutoSave", "boolean", "false"),
+    # Skip first-start dialogs and the start center bookkeeping
+    ("/org.openoffice.Office.Common/Misc", "FirstRun", "boolean", "false"),
+    ("/org.openoffice.Office.Common/Misc", "ShowTipOfTheDay", "boolean", "false"),
+    ("/org.openoffice.Setup/Office", "ooSetupInstCompleted", "boolean", "true"),
+    # Never start a JVM
+    ("/org.openoffice.Office.Java/VirtualMachine", "Enable", "boolean", "false"),
+    # Never run document macros; the export macro is ours, in the profile
+    ("/org.openoffice.Office.Common/Security/Scripting", "MacroSecurityLevel", "int", "3"),
+)  # fmt: skip
+
+# Keep the cached formula results of xlsx/ods files and never refresh links
+# (recalc modes: 0 always, 1 never, 2 prompt; link update: 1 never)
+NO_RECALC_SETTINGS: tuple[tuple[str, str, str, str], ...] = (
+    ("/org.openoffice.Office.Calc/Formula/Load", "OOXMLRecalcMode", "int", "1"),
+    ("/org.openoffice.Office.Calc/Formula/Load", "ODFRecalcMode", "int", "1"),
+    ("/org.openoffice.Office.Calc/Content/Update", "Link", "int", "1"),
+)
+
+
+def _xcu_item(path: str, name: str, xs_type: str, value: str) -> str:
+    return (
+        f'<item oor:path="{path}"><prop oor:name="{name}" oor:op="fuse"'
+        f' oor:type="xs:{xs_type}"><value>{value}</value></prop></item>\n'
+    )
+
+
+class LibreProfileManager:
+    """
+    Keeps a tuned LibreOffice user profile in the cache directory.
+
+    The template is initialized once per soffice installation; every
+    conversion job then runs on a private clone of it, so soffice neither
+    rebuilds a fresh profile nor locks the user's own one.
+
+    Each stamp gets its own directory, built aside and renamed into place,
+    so managers in other threads or processes never see a half-built
+    template and never replace one that is being cloned.
+    """
+
+    TEMPLATE_DIR_NAME = "lo_profile"
+    STAMP_FILE_NAME = "profile.json"
+    PROFILE_VERSION = 1
+    INIT_TIMEOUT = 120
+    # Shared by all managers, so one process builds a template only once;
+    # other processes are kept apart by the rename in _install
+    _build_lock = threading.Lock()
+
+    def __init__(
+        self, *, soffice_path: str, cache_dir: Path, recalculate: bool = False
+    ):
+        self.soffice_path = soffice_path
+        # Off by default: cached values are what the author last saw
+        self.recalculate = recalculate
+        self.templates_dir = cache_dir / self.TEMPLATE_DIR_NAME
+
+    @property
+    def settings(self) -> tuple[tuple[str, str, str, str], ...]:
+        if self.recalculate:
+            return HEADLESS_SETTINGS
+        return HEADLESS_SETTINGS + NO_RECALC_SETTINGS
+
+    def _get_stamp(self) -> dict:
+        """Identify the soffice build and settings the template was made for."""
+        try:
+            mtime = os.stat(self.soffice_path).st_mtime
+        except OSError:
+            mtime = None
+        return {
+            "version": self.PROFILE_VERSION,
+            "soffice": str(self.soffice_path),
+            "mtime": mtime,
+            "settings": [list(s) for s in self.settings],
+            "macro": macro_digest(),
+        }
+
+    @property
+    def template_path(self) -> Path:
+        stamp = json.dumps(self._get_stamp(), sort_keys=True).encode("utf-8")
+        return self.templates_dir / hashlib.sha1(stamp).hexdigest()[:16]
+
+    def _read_stamp(self, template: Path) -> dict | None:
+        try:
+            return json.loads(
+                (template / self.STAMP_FILE_NAME).read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return None
+
+    def _is_template_current(self, template: Path) -> bool:
+        return self._read_stamp(template) == self._get_stamp()
+
+    def _run_first_start(self, profile_dir: Path) -> bool:
+        """Let soffice create the profile once, then exit."""
+        command = [
+            self.soffice_path,
+            "--headless",
+            "--norestore",
+            "--terminate_after_init",
+            f"-env:UserInstallation={profile_dir.as_uri()}",
+        ]
+        started = time.monotonic()
+        try:
+            subprocess.run(
+                command, check=True, capture_output=True, timeout=self.INIT_TIMEOUT
+            )
+            logger.info(
+                f"LibreOffice profile initialized in {time.monotonic() - started:.1f}s"
+            )
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            # The settings are still applied; soffice completes the rest
+            logger.warning(f"LibreOffice profile initialization failed: {e}")
+            return False
+
+    def _write_settings(self, profile_dir: Path) -> None:
+        """Merge the headless settings into registrymodifications.xcu."""
+        xcu_path = profile_dir / "user" / "registrymodifications.xcu"
+        xcu_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            content = xcu_path.read_text(encoding="utf-8")
+        except OSError:
+            content = XCU_HEADER + XCU_FOOTER
+
+        for path, name, _, _ in self.settings:
+            # Drop earlier values of the same property so ours take effect
+            content = re.sub(
+                r'<item oor:path="'
+                + re.escape(path)
+                + r'"><prop oor:name="'
+                + re.escape(name)
+                + r'".*?</item>\n?',
+                "",
+                content,
+                flags=re.DOTALL,
+            )
+        items = "".join(_xcu_item(*setting) for setting in self.settings)
+        content = content.replace(XCU_FOOTER.strip(), items + XCU_FOOTER.strip(), 1)
+        xcu_path.write_text(content, encoding="utf-8")
+
+    def _install(self, build_dir: Path, template: Path) -> None:
+        """Rename a finished build into place; the first finished build wins."""
+        try:
+            os.rename(build_dir, template)
+            return
+        except OSError:
+            if self._is_template_current(template):
+                return  # Another manager installed the same template first
+        # Only a template left by a failed initialization is replaced
+        stale_dir = Path(tempfile.mkdtemp(prefix=".stale_", dir=self.templates_dir))
+        try:
+            os.rename(template, stale_dir / "profile")
+            os.rename(build_dir, template)
+        except OSError as e:
+            logger.debug(f"LibreOffice profile template not replaced: {e}")
+        finally:
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+    def _prune_templates(self, template: Path) -> None:
+        """Drop templates made for an earlier build of the same soffice."""
+        for entry in self.templates_dir.iterdir():
+            if entry == template or entry.name.startswith("."):
+                continue
+            stamp = self._read_stamp(entry)
+            if stamp and stamp.get("soffice") == str(self.soffice_path):
+                if stamp.get("settings") == [list(s) for s in self.settings]:
+                    shutil.rmtree(entry, ignore_errors=True)
+
+    def _build_template(self, template: Path) -> None:
+        self.templates_dir.mkdir(parents=True, exist_ok=True)
+        build_dir = Path(tempfile.mkdtemp(prefix=".build_", dir=self.templates_dir))
+        try:
+            initialized = self._run_first_start(build_dir)
+            self._write_settings(build_dir)
+            install_export_macro(build_dir)
+            if initialized:
+                # Without a stamp the template is used once and rebuilt next time
+                (build_dir / self.STAMP_FILE_NAME).write_text(
+                    json.dumps(self._get_stamp()), encoding="utf-8"
+                )
+            self._install(build_dir, template)
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+        if initialized:
+            self._prune_templates(template)
+
+    def ensure_template(self) -> Path:
+        """Return the template directory, building it when it is missing."""
+        template = self.template_path
+        with self._build_lock:
+            if not self._is_template_current(template):
+                logger.info("Building LibreOffice profile template")
+                self._build_template(template)
+        return template
+
+    @contextlib.contextmanager
+    def clone(self) -> Iterator[str]:
+        """Yield the UserInstallation URL of a private copy of the template."""
+        template = self.ensure_template()
+        with tempfile.TemporaryDirectory(prefix="lo_job_") as tmp_dir:
+            profile_dir = Path(tmp_dir) / "profile"
+            shutil.copytree(
+                template,
+                profile_dir,
+                copy_function=lambda src, dst: stage_file(
+                    Path(src), Path(dst), writable=True
+                ),
+            )
+            yield profile_dir.as_uri()
@@ -1,15 +1,89 @@
 from pathlib import Path
 from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    # Imported for annotations only: the pdf package imports converters
+    from simple_to_pdf.pdf.models import PageFormat
+
+
+@dataclass(frozen=True)
+class StagedPdf:
+    """A converted PDF kept on disk in a job staging directory."""
+
+    path: Path
+
+    def open(self) -> BinaryIO:
+        return self.path.open("rb")
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
 
 
 @dataclass
 class ConversionResult:
-    success: list[tuple[int, bytes]] = field(default_factory=list)
+    success: list[tuple[int, bytes | StagedPdf]] = field(default_factory=list)
     failed: list[tuple[int, Path]] = field(default_factory=list)
 
 
+class ConversionCancelled(InterruptedError):
+    """Conversion stopped by cancellation; result holds what finished before."""
+
+    def __init__(self, result: ConversionResult):
+        super().__init__(f"Conversion cancelled after {len(result.success)} files")
+        self.result = result
+
+
+@dataclass
+class BackendInfo:
+    """An office executable found during capability discovery."""
+
+    path: str
+    mtime: float | None = None
+    version: str | None = None
+
+
+@dataclass
+class ConverterCapabilities:
+    """What the converter backends can do on this machine."""
+
+    platform: str
+    search_path: str
+    soffice: BackendInfo | None = None
+    # COM ProgID -> local server executable
+    com_apps: dict[str, BackendInfo] = field(default_factory=dict)
+    # Backend name -> category -> extensions
+    formats: dict[str, dict[str, list[str]]] = field(default_factory=dict)
+    # Path -> mtime of the places a missing soffice would be installed to
+    watched_paths: dict[str, float | None] = field(default_factory=dict)
+
+
 @dataclass
 class ExtractionResult:
     successful: list[int] = field(default_factory=list)
     failed: list[int] = field(default_factory=list)
     filename: str = ""
+
+
+class FitMode(StrEnum):
+    FIT = "fit"  # Whole image visible, letterboxed inside its cell
+    FILL = "fill"  # Cell fully covered, image cropped to the cell aspect ratio
+
+
+@dataclass(frozen=True)
+class ImageLayout:
+    """Placement of images onto final-size pages (sizes and margins in points)."""
+
+    page_format: "PageFormat"
+    dpi: int = 300
+    margin: float = 0.0
+    spacing: float = 0.0
+    fit: FitMode = FitMode.FIT
+    columns: int = 1
+    rows: int = 1
+    auto_orient: bool = True
+
+    @property
+    def cells_per_page(self) -> int:
+        return self.columns * self.rows
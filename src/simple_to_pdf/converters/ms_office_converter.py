@@ -11,7 +11,7 @@ import win32com.client as win32  # pyright: ignore[reportMissingModuleSource]
 from win32com.client import gencache  # pyright: ignore[reportMissingModuleSource]
 
 from simple_to_pdf.converters.img_converter import ImageConverter
-from simple_to_pdf.converters.models import ConversionResult
+from simple_to_pdf.converters.models import ConversionResult, ImageLayout
 from simple_to_pdf.converters.ms_mixin import MSSetupMixin
 
 logger = logging.getLogger(__name__)
@@ -47,7 +47,13 @@ class MSOfficeConverter(ImageConverter, MSSetupMixin):
         super().__init__(chunk_size=chunk_size)
         self.SUPPORTED_FORMATS = self.get_supported_formats()
 
-    def convert_to_pdf(self, *, files: list[tuple[int, Path]]) -> ConversionResult:
+    def convert_to_pdf(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
         """Categorize files by type, route to specific conversion services, and aggregate the results."""
         tables: list[tuple[int, Path]] = []
         docs: list[tuple[int, Path]] = []
@@ -86,7 +92,9 @@ class MSOfficeConverter(ImageConverter, MSSetupMixin):
             final_results.success.extend(pres_res.success)
             final_results.failed.extend(pres_res.failed)
         if imgs:
-            imgs_res: ConversionResult = self._convert_images_to_pdf(files=imgs)
+            imgs_res: ConversionResult = self._convert_images_to_pdf(
+                files=imgs, image_layout=image_layout
+            )
             final_results.success.extend(imgs_res.success)
             final_results.failed.extend(imgs_res.failed)
 
@@ -0,0 +1,198 @@
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from simple_to_pdf.converters.base_converter import BaseConverter
+from simple_to_pdf.converters.models import (
+    ConversionCancelled,
+    ConversionResult,
+    ImageLayout,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingConverter(BaseConverter):
+    """
+    Holds every available backend and routes each file to one of them.
+
+    Backends are given in order of preference; a file goes to the first
+    backend that supports its format, except for images, which always go to
+    the Pillow-based image backend. Support comes from the discovered
+    formats when given, e.g. no .pptx for MS Office without PowerPoint. Files a backend fails on are retried
+    with the next backend that supports them. Backends run in parallel
+    threads and share one stop event.
+    """
+
+    IMAGE_BACKEND = "image"
+
+    def __init__(
+        self,
+        *,
+        backends: dict[str, BaseConverter],
+        chunk_size: int = 30,
+        spread_load: bool = False,
+        formats: dict[str, dict[str, list[str]]] | None = None,
+    ):
+        super().__init__(chunk_size=chunk_size)
+        if not backends:
+            raise ValueError("RoutingConverter needs at least one backend")
+        self.backends = backends
+        # Backend name -> category -> extensions, from capability discovery
+        self.formats = formats or {}
+        # Share office-format work between backends instead of always using the first
+        self.spread_load = spread_load
+        self.stop_event = self._stop_event
+        self.SUPPORTED_FORMATS = self.get_supported_formats()
+
+    @property
+    def stop_event(self) -> threading.Event:
+        return self._stop_event
+
+    @stop_event.setter
+    def stop_event(self, value: threading.Event):
+        self._stop_event = value
+        for backend in self.backends.values():
+            backend.stop_event = value
+
+    def _backend_formats(self, name: str) -> dict[str, set[str]]:
+        """Discovered formats of a backend, else the ones its class declares."""
+        if name in self.formats:
+            return {cat: set(exts) for cat, exts in self.formats[name].items()}
+        return self.backends[name].get_supported_formats()
+
+    def get_supported_formats(self) -> dict:
+        """Union of the formats of all backends, per category."""
+        combined: dict[str, set[str]] = {}
+        for name in self.backends:
+            for category, exts in self._backend_formats(name).items():
+                combined.setdefault(category, set()).update(exts)
+        return combined
+
+    def _supports(self, name: str, *, path: Path) -> bool:
+        ext = path.suffix.lower()
+        return any(
+            ext in exts
+            for category, exts in self._backend_formats(name).items()
+            if category != "pdf"
+        )
+
+    def _get_candidates(self, *, path: Path) -> list[str]:
+        """Names of the backends able to convert path, most preferred first."""
+        names = [name for name in self.backends if self._supports(name, path=path)]
+        if self.IMAGE_BACKEND in names and self.is_image_file(file_path=path):
+            # Office backends would run the same Pillow code for images
+            return [self.IMAGE_BACKEND]
+        return names
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _assign(
+        self, *, files: list[tuple[int, Path]], excluded: dict[int, set[str]]
+    ) -> tuple[dict[str, list[tuple[int, Path]]], list[tuple[int, Path]]]:
+        """Split files between backends; also return the ones nobody can take."""
+        plan: dict[str, list[tuple[int, Path]]] = {}
+        load: dict[str, int] = dict.fromkeys(self.backends, 0)
+        unroutable: list[tuple[int, Path]] = []
+
+        for idx, path in files:
+            candidates = [
+                name
+                for name in self._get_candidates(path=path)
+                if name not in excluded.get(idx, set())
+            ]
+            if not candidates:
+                unroutable.append((idx, path))
+                continue
+
+            target = candidates[0]
+            office_candidates = [c for c in candidates if c != self.IMAGE_BACKEND]
+            if self.spread_load and len(office_candidates) > 1:
+                # Least loaded by bytes; ties keep the preferred backend
+                target = min(office_candidates, key=lambda name: load[name])
+            plan.setdefault(target, []).append((idx, path))
+            load[target] += self._file_size(path)
+        return plan, unroutable
+
+    def _run_backend(
+        self,
+        *,
+        name: str,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None,
+        output_dir: Path | None,
+    ) -> ConversionResult:
+        logger.info(f"Routing {len(files)} files to {name}")
+        try:
+            return self.backends[name].convert_to_pdf(
+                files=files, image_layout=image_layout, output_dir=output_dir
+            )
+        except InterruptedError:
+            raise
+        except Exception as e:
+            logger.error(f"Backend {name} failed: {e}", exc_info=True)
+            return ConversionResult(failed=list(files))
+
+    def convert_to_pdf(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        output_dir: Path | None = None,
+    ) -> ConversionResult:
+        final_result = ConversionResult()
+        pending = [(idx, path) for idx, path in files if path.exists()]
+        # Backends that already failed on a file are not asked again
+        excluded: dict[int, set[str]] = {}
+
+        while pending:
+            self.check_stop()
+            plan, unroutable = self._assign(files=pending, excluded=excluded)
+            final_result.failed.extend(unroutable)
+            if not plan:
+                break
+
+            with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+                # Copied contexts keep the running job visible to check_stop
+                futures = {
+                    name: executor.submit(
+                        contextvars.copy_context().run,
+                        self._run_backend,
+                        name=name,
+                        files=group,
+                        image_layout=image_layout,
+                        output_dir=output_dir,
+                    )
+                    for name, group in plan.items()
+                }
+                results: dict[str, ConversionResult] = {}
+                cancelled = False
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except ConversionCancelled as e:
+                        results[name], cancelled = e.result, True
+                    except InterruptedError:
+                        cancelled = True
+
+            if cancelled:
+                for result in results.values():
+                    final_result.success.extend(result.success)
+                raise ConversionCancelled(final_result)
+
+            pending = []
+            for name, result in results.items():
+                final_result.success.extend(result.success)
+                for idx, path in result.failed:
+                    excluded.setdefault(idx, set()).add(name)
+                    pending.append((idx, path))
+            if pending:
+                logger.info(f"Retrying {len(pending)} failed files on other backends")
+        return final_result
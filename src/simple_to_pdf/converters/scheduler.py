@@ -0,0 +1,192 @@
+import io
+import json
+import logging
+import statistics
+import threading
+from collections import deque
+from pathlib import Path
+
+from simple_to_pdf.utils.staging import write_atomic
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class ConversionScheduler:
+    """
+    Plans office conversion chunks from the estimated cost of each file.
+
+    A file's cost is a fixed per-file part plus its size times a per-extension
+    rate (seconds per MB). A run costs the soffice launch plus its files.
+    Rates start from defaults and follow measured runs, each extension in
+    proportion to its share of the run; the launch cost is fitted from the
+    recorded runs. Timeouts are derived from the 95th percentile of
+    measured/estimated ratios, and timed-out runs count as lower bounds.
+    """
+
+    DEFAULT_SECONDS_PER_MB = {
+        ".xlsx": 4.0,
+        ".xlsm": 4.0,
+        ".xls": 4.0,
+        ".xlsb": 4.0,
+        ".ods": 4.0,
+        ".csv": 2.0,
+        ".ppt": 1.0,
+        ".pptx": 1.0,
+        ".odp": 1.0,
+    }
+    FALLBACK_SECONDS_PER_MB = 2.0
+    SECONDS_PER_FILE = 0.5
+    # Launch cost until enough runs are recorded to fit it
+    LAUNCH_SECONDS = 5.0
+    MIN_LAUNCH, MAX_LAUNCH = 0.5, 60.0
+    MIN_FIT_RUNS = 5
+    TARGET_CHUNK_SECONDS = 60.0
+    MIN_TIMEOUT = 30.0
+    TIMEOUT_SAFETY = 3.0
+    RATE_SMOOTHING = 0.3
+    MIN_RATE, MAX_RATE = 0.05, 120.0
+    HISTORY_SIZE = 200
+
+    def __init__(self, *, max_files: int = 30, history_path: Path | None = None):
+        self.max_files = max_files
+        self.history_path = history_path
+        self._lock = threading.Lock()
+        self._rates: dict[str, float] = dict(self.DEFAULT_SECONDS_PER_MB)
+        self._ratios: deque[float] = deque(maxlen=self.HISTORY_SIZE)
+        # (estimated work, elapsed) of completed runs, for the launch fit
+        self._runs: deque[tuple[float, float]] = deque(maxlen=self.HISTORY_SIZE)
+        self._launch = self.LAUNCH_SECONDS
+        self._load_history()
+
+    def _load_history(self) -> None:
+        if self.history_path is None or not self.history_path.exists():
+            return
+        try:
+            data = json.loads(self.history_path.read_text(encoding="utf-8"))
+            self._rates.update(
+                {ext: float(rate) for ext, rate in data.get("rates", {}).items()}
+            )
+            self._ratios.extend(float(r) for r in data.get("ratios", []))
+            self._runs.extend(
+                (float(work), float(elapsed)) for work, elapsed in data.get("runs", [])
+            )
+            self._launch = self._fit_launch()
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable conversion history: {e}")
+
+    def save_history(self) -> None:
+        if self.history_path is None:
+            return
+        with self._lock:
+            data = {
+                "rates": self._rates,
+                "ratios": list(self._ratios),
+                "runs": list(self._runs),
+            }
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(
+                io.BytesIO(json.dumps(data).encode("utf-8")), self.history_path
+            )
+        except OSError as e:
+            logger.warning(f"Could not save conversion history: {e}")
+
+    def estimate(self, path: Path) -> float:
+        """Estimated conversion time of one file in seconds."""
+        try:
+            size_mb = path.stat().st_size / BYTES_PER_MB
+        except OSError:
+            size_mb = 0.0
+        rate = self._rates.get(path.suffix.lower(), self.FALLBACK_SECONDS_PER_MB)
+        return self.SECONDS_PER_FILE + size_mb * rate
+
+    def make_chunks(
+        self, files: list[tuple[int, Path]]
+    ) -> list[list[tuple[int, Path]]]:
+        """Group files into chunks of roughly TARGET_CHUNK_SECONDS each."""
+        chunks: list[list[tuple[int, Path]]] = []
+        current: list[tuple[int, Path]] = []
+        current_cost = 0.0
+
+        for item in files:
+            cost = self.estimate(item[1])
+            over_budget = current_cost + cost > self.TARGET_CHUNK_SECONDS
+            if current and (over_budget or len(current) >= self.max_files):
+                chunks.append(current)
+                current, current_cost = [], 0.0
+            current.append(item)
+            current_cost += cost
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _ratio_percentile(self) -> float:
+        with self._lock:
+            ratios = list(self._ratios)
+        if len(ratios) < 2:
+            return 1.0
+        return max(1.0, statistics.quantiles(ratios, n=20)[-1])
+
+    def timeout_for(self, paths: list[Path]) -> float:
+        """Timeout for one soffice run over the given files."""
+        estimated = sum(self.estimate(p) for p in paths)
+        timeout = self._launch + estimated * self._ratio_percentile()
+        return max(self.MIN_TIMEOUT, timeout * self.TIMEOUT_SAFETY)
+
+    def _fit_launch(self) -> float:
+        """Intercept of elapsed over estimated work across completed runs."""
+        runs = list(self._runs)
+        if len(runs) < self.MIN_FIT_RUNS:
+            return self.LAUNCH_SECONDS
+        works = [work for work, _ in runs]
+        if len(set(works)) < 2:
+            return self.LAUNCH_SECONDS
+        fit = statistics.linear_regression(works, [elapsed for _, elapsed in runs])
+        return min(self.MAX_LAUNCH, max(self.MIN_LAUNCH, fit.intercept))
+
+    def record(
+        self, paths: list[Path], elapsed: float, *, timed_out: bool = False
+    ) -> None:
+        """
+        Feed the duration of a run back into the cost model.
+
+        A timed-out run only shows the files take at least elapsed, so it
+        can raise the rates but never lower them.
+        """
+        estimates = [(p.suffix.lower(), self.estimate(p)) for p in paths]
+        estimated = sum(cost for _, cost in estimates)
+        if estimated <= 0:
+            return
+
+        with self._lock:
+            if not timed_out:
+                self._runs.append((estimated, elapsed))
+                self._launch = self._fit_launch()
+            # Runs shorter than the launch cost say nothing about the rates
+            work = elapsed - self._launch
+            if work <= 0:
+                return
+            ratio = work / estimated
+            if timed_out:
+                # The rates carry the lower bound; a ratio would count it twice
+                ratio = max(1.0, ratio)
+            else:
+                self._ratios.append(ratio)
+
+            shares: dict[str, float] = {}
+            for ext, cost in estimates:
+                shares[ext] = shares.get(ext, 0.0) + cost / estimated
+            for ext, share in shares.items():
+                rate = self._rates.get(ext, self.FALLBACK_SECONDS_PER_MB)
+                corrected = min(self.MAX_RATE, max(self.MIN_RATE, rate * ratio))
+                if timed_out:
+                    corrected = max(rate, corrected)
+                weight = self.RATE_SMOOTHING * share
+                self._rates[ext] = (1 - weight) * rate + weight * corrected
+        logger.debug(
+            f"Recorded {len(paths)} files{' (timed out)' if timed_out else ''}: "
+            f"{elapsed:.1f}s, estimated {estimated:.1f}s, launch {self._launch:.1f}s"
+        )
@@ -22,7 +22,39 @@ SETTINGS_PATH = ROOT_PATH / "settings.json"
 
 # ---DEFAULT SETTINGS ---
 
-DEFAULT_SETTINGS = {"language": "English", "compress": "False", "format": "Original"}
+DEFAULT_SETTINGS = {
+    "language": "English",
+    "compress": "False",
+    "format": "Original",
+    "reuse": "False",
+}
+
+# --- PROCESSING ---
+
+# Merge/extraction jobs that may run at the same time
+MAX_PARALLEL_JOBS = 2
+# Most pages a page selection (extraction ranges) may name
+PAGE_SELECTION_LIMIT = 10000
+# Disk space for reused conversions when "reuse unchanged files" is on
+SEGMENT_CACHE_MAX_MB = 2048
+
+# --- SERVER (serve mode) ---
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_WORKERS = 2
+# Waiting jobs beyond this are refused with 503
+SERVER_MAX_QUEUE = 32
+SERVER_MAX_UPLOAD_MB = 512
+SERVER_REQUEST_TIMEOUT = 30 * 60
+
+# --- WATCH MODE ---
+
+# A file counts as fully written after this long without changes
+WATCH_SETTLE_SECONDS = 3.0
+WATCH_BATCH_SIZE = 50
+# Used when inotify is not available
+WATCH_POLL_INTERVAL = 2.0
 
 # --- GITHUB CONFIGURATION ---
 
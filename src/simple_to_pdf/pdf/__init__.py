@@ -2,5 +2,12 @@ from .pdf_merger import PdfMerger
 from .page_extractor import PageExtractor
 from .pdf_compressor import PDFCompressor
 from .conversion_service import ConversionService
+from .async_service import AsyncPdfService
 
-__all__ = ["PdfMerger", "PageExtractor", "PDFCompressor", "ConversionService"]
+__all__ = [
+    "PdfMerger",
+    "PageExtractor",
+    "PDFCompressor",
+    "ConversionService",
+    "AsyncPdfService",
+]
@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Generic, TypeVar
+
+from simple_to_pdf.base_services.cancellation import CancellationToken
+from simple_to_pdf.converters.models import ImageLayout
+from simple_to_pdf.pdf.conversion_service import ConversionService
+from simple_to_pdf.pdf.models import PageFormat, ProcessingReport, ProgressEvent
+from simple_to_pdf.pdf.page_extractor import PageExtractor
+from simple_to_pdf.pdf.pdf_compressor import PDFCompressor
+from simple_to_pdf.pdf.pdf_merger import PdfMerger
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Receives the callback events of the operation running in this context
+_progress_sink: contextvars.ContextVar[Callable[[ProgressEvent], None] | None] = (
+    contextvars.ContextVar("progress_sink", default=None)
+)
+
+
+def _emit(kind: str, **data) -> None:
+    sink = _progress_sink.get()
+    if sink is not None:
+        sink(ProgressEvent(kind=kind, data=data))
+
+
+class AsyncOperation(Generic[T]):
+    """
+    A service call running in an executor.
+
+    Await it for the result, or iterate it for progress events; iteration
+    ends when the call finishes. Cancelling the awaiting task (or calling
+    cancel) cancels the call's token, which stops the service and kills a
+    running soffice.
+    """
+
+    def __init__(self, *, task: asyncio.Task, events: asyncio.Queue):
+        self._task = task
+        self._events = events
+
+    def __await__(self):
+        return self._task.__await__()
+
+    async def __aiter__(self) -> AsyncIterator[ProgressEvent]:
+        while (event := await self._events.get()) is not None:
+            yield event
+
+    def cancel(self) -> bool:
+        return self._task.cancel()
+
+    def done(self) -> bool:
+        return self._task.done()
+
+
+class AsyncPdfService:
+    """
+    Asyncio facade over the conversion, merge, compression and extraction
+    services.
+
+    Blocking work runs in the given executor (the loop's default one when
+    None), and soffice runs in the managed subprocess of the worker thread.
+    The service instances are shared, so their callbacks are routed to the
+    operation that raised them through a context variable. Methods must be
+    called from a running event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Executor | None = None,
+        conversion_service: ConversionService | None = None,
+        merger: PdfMerger | None = None,
+        compressor: PDFCompressor | None = None,
+        page_extractor: PageExtractor | None = None,
+    ):
+        self.executor = executor
+        self.conversion_service = conversion_service or ConversionService()
+        self.merger = merger or PdfMerger()
+        self.compressor = compressor or PDFCompressor()
+        self.page_extractor = page_extractor or PageExtractor()
+        for service in (
+            self.conversion_service,
+            self.merger,
+            self.compressor,
+            self.page_extractor,
+        ):
+            service.callback = _emit
+
+    def convert(
+        self, *, files: list[tuple[int, Path]], image_layout: ImageLayout | None = None
+    ) -> AsyncOperation[ProcessingReport]:
+        """Convert files; the caller owns the returned report and its cleanup."""
+        return self._start(
+            self.conversion_service.get_pdfs_data, files, image_layout=image_layout
+        )
+
+    def merge(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        target_page_format: PageFormat | None = None,
+        image_layout: ImageLayout | None = None,
+    ) -> AsyncOperation[bytes]:
+        """Convert files as needed and merge them into one PDF."""
+        return self._start(
+            self._convert_and_merge,
+            files=files,
+            target_page_format=target_page_format,
+            image_layout=image_layout,
+        )
+
+    def compress(self, *, pdf_bytes: bytes, quality: int = 20) -> AsyncOperation[bytes]:
+        return self._start(
+            self.compressor.compress, pdf_bytes=pdf_bytes, quality=quality
+        )
+
+    def extract(
+        self,
+        *,
+        input_path: str | Path,
+        pages_to_extract: list[int],
+        output_path: str | Path,
+    ) -> AsyncOperation[bytes]:
+        return self._start(
+            self.page_extractor.extract_pages,
+            input_path=str(input_path),
+            pages_to_extract=pages_to_extract,
+            output_path=output_path,
+        )
+
+    def _convert_and_merge(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        target_page_format: PageFormat | None,
+        image_layout: ImageLayout | None,
+        token: CancellationToken,
+    ) -> bytes:
+        with self.conversion_service.get_pdfs_data(
+            files, image_layout=image_layout, token=token
+        ) as report:
+            return self.merger.merge_to_pdf(
+                conversion_rep=report,
+                target_page_format=target_page_format,
+                token=token,
+            )
+
+    def _start(self, func: Callable[..., T], *args, **kwargs) -> AsyncOperation[T]:
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[ProgressEvent | None] = asyncio.Queue()
+        task = loop.create_task(self._run(func, *args, events=events, **kwargs))
+        return AsyncOperation(task=task, events=events)
+
+    async def _run(
+        self,
+        func: Callable[..., T],
+        *args,
+        events: asyncio.Queue,
+        **kwargs: Any,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        token = CancellationToken()
+        context = contextvars.copy_context()
+        context.run(
+            _progress_sink.set,
+            lambda event: loop.call_soon_threadsafe(events.put_nowait, event),
+        )
+        future = loop.run_in_executor(
+            self.executor,
+            functools.partial(context.run, func, *args, token=token, **kwargs),
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            token.cancel(reason="task cancelled")
+            # Let the worker unwind so soffice and staging files are cleaned up
+            await asyncio.gather(future, return_exceptions=True)
+            logger.info(f"{getattr(func, '__name__', 'operation')} cancelled")
+            raise
+        finally:
+            events.put_nowait(None)
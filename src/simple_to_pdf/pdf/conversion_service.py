@@ -1,17 +1,57 @@
 import logging
+import shutil
+import tempfile
+import threading
 from pathlib import Path
 
+from simple_to_pdf.base_services.cancellation import CancellationToken, cancellable
 from simple_to_pdf.converters import ConverterFactory
-from simple_to_pdf.converters.models import ConversionResult
-from simple_to_pdf.pdf.models import BytePdfDocument, ProcessingReport
+from simple_to_pdf.core import config
+from simple_to_pdf.converters.models import (
+    ConversionCancelled,
+    ConversionResult,
+    ImageLayout,
+    StagedPdf,
+)
+from simple_to_pdf.pdf.job_journal import JobJournal
+from simple_to_pdf.pdf.models import (
+    BytePdfDocument,
+    MappedPdf,
+    PageFormat,
+    ProcessingReport,
+)
+from simple_to_pdf.pdf.segment_cache import SegmentCache
+from simple_to_pdf.utils.app_dirs import get_cache_dir
 
 logger = logging.getLogger(__name__)
 
 
 class ConversionService:
-    def __init__(self):
+    SEGMENTS_DIR_NAME = "segments"
+
+    def __init__(
+        self,
+        *,
+        resumable: bool = True,
+        incremental: bool = False,
+        segment_cache_max_mb: int | None = None,
+    ):
         factory = ConverterFactory()
         self.converter = factory.get_converter()
+        # Journal converted files so an interrupted job can resume
+        self.resumable = resumable
+        # Opt-in: reuse the converted PDF of every input that did not change
+        # since an earlier run, so re-merging after one edit converts one file.
+        # Inputs are hashed and their segments kept in the user cache.
+        self.incremental = incremental
+        # config imports this package, so its default is read at runtime
+        self.segment_cache_max_mb = (
+            segment_cache_max_mb
+            if segment_cache_max_mb is not None
+            else config.SEGMENT_CACHE_MAX_MB
+        )
+        self._segment_cache: SegmentCache | None = None
+        self._segment_cache_lock = threading.Lock()
         self._callback = lambda *args, **kwargs: None
 
     @property
@@ -22,8 +62,178 @@ class ConversionService:
     def callback(self, value):
         self._callback = value if value is not None else lambda *args, **kwargs: None
 
-    def get_pdfs_data(self, files: list[tuple[int, Path]]) -> ProcessingReport:
+    @property
+    def segment_cache(self) -> SegmentCache:
+        """The segment cache, opened on first use."""
+        with self._segment_cache_lock:
+            if self._segment_cache is None:
+                cache_dir = get_cache_dir() / self.SEGMENTS_DIR_NAME
+                self._segment_cache = SegmentCache(
+                    cache_dir=cache_dir,
+                    max_bytes=self.segment_cache_max_mb * 1024 * 1024,
+                )
+                logger.info(
+                    f"Reusing unchanged conversions from {cache_dir} "
+                    f"(up to {self.segment_cache_max_mb} MB)"
+                )
+            return self._segment_cache
+
+    def _get_laid_out_format(
+        self, *, path: Path, image_layout: ImageLayout | None
+    ) -> PageFormat | None:
+        """Images converted with a layout already have final-size pages."""
+        if image_layout is None or not self.converter.is_image_file(file_path=path):
+            return None
+        return image_layout.page_format
+
+    @staticmethod
+    def _release_staging(*, staging_dir: Path, journal: JobJournal | None) -> None:
+        """Drop the staging dir of a failed job, keeping a journal for resume."""
+        if journal is not None:
+            journal.close()
+        else:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _convert_with_checkpoints(
+        self,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None,
+        staging_dir: Path,
+        journal: JobJournal | None,
+        stage_name: str,
+        incremental: bool,
+    ) -> ConversionResult:
+        """
+        Convert files in batches, journaling each batch as soon as it is done.
+
+        Files the journal or the segment cache already hold are not
+        converted again.
+        """
+        paths_by_idx = dict(files)
+        result = ConversionResult()
+        segment_cache = self.segment_cache if incremental else None
+        if image_layout is not None and image_layout.cells_per_page > 1:
+            # N-up pages hold images of neighbouring inputs, not one input
+            segment_cache = None
+        if journal is not None:
+            done = journal.load()
+            result.success.extend((idx, done[idx]) for idx, _ in files if idx in done)
+            if result.success:
+                logger.info(
+                    f"Resuming job: {len(result.success)} of {len(files)} "
+                    f"files already converted"
+                )
+
+        def checkpoint(converted: list[tuple[int, bytes | StagedPdf]]) -> None:
+            for idx, pdf_data in converted:
+                if journal is not None:
+                    pdf_data = journal.record(
+                        index=idx, source=paths_by_idx[idx], pdf=pdf_data
+                    )
+                if segment_cache is not None:
+                    segment_cache.store(
+                        path=paths_by_idx[idx],
+                        variant=self._segment_variant(
+                            path=paths_by_idx[idx], image_layout=image_layout
+                        ),
+                        pdf=pdf_data,
+                    )
+                result.success.append((idx, pdf_data))
+
+        finished = {idx for idx, _ in result.success}
+        remaining = [(idx, path) for idx, path in files if idx not in finished]
+        if segment_cache is not None:
+            remaining = self._take_cached_segments(
+                segment_cache=segment_cache,
+                files=remaining,
+                image_layout=image_layout,
+                staging_dir=staging_dir,
+                result=result,
+            )
+        batch_size = max(1, self.converter.chunk_size)
+        for start in range(0, len(remaining), batch_size):
+            try:
+                batch_res = self.converter.convert_to_pdf(
+                    files=remaining[start : start + batch_size],
+                    image_layout=image_layout,
+                    output_dir=staging_dir,
+                )
+            except ConversionCancelled as e:
+                checkpoint(e.result.success)
+                raise ConversionCancelled(
+                    ConversionResult(success=result.success)
+                ) from e
+            checkpoint(batch_res.success)
+            result.failed.extend(batch_res.failed)
+            self.callback(
+                "progress",
+                **{
+                    "stage": stage_name,
+                    "mode": "determinate",
+                    "current": len(result.success) + len(result.failed),
+                    "total": len(files),
+                },
+            )
+        if segment_cache is not None and remaining:
+            segment_cache.prune()
+        return result
+
+    def _segment_variant(self, *, path: Path, image_layout: ImageLayout | None) -> str:
+        """Only images depend on the layout; other inputs convert the same way."""
+        if image_layout is not None and self.converter.is_image_file(file_path=path):
+            return repr(image_layout)
+        return ""
+
+    def _take_cached_segments(
+        self,
+        *,
+        segment_cache: SegmentCache,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None,
+        staging_dir: Path,
+        result: ConversionResult,
+    ) -> list[tuple[int, Path]]:
+        """Add cached segments of unchanged inputs to result; return the rest."""
+        remaining = []
+        for idx, path in files:
+            segment = segment_cache.lookup(
+                path=path,
+                variant=self._segment_variant(path=path, image_layout=image_layout),
+                target=staging_dir / f"{idx}_{path.stem}.cached.pdf",
+            )
+            if segment is None:
+                remaining.append((idx, path))
+            else:
+                result.success.append((idx, segment))
+        segment_cache.save_index()
+        if len(remaining) < len(files):
+            logger.info(
+                f"Reusing {len(files) - len(remaining)} unchanged files, "
+                f"converting {len(remaining)}"
+            )
+        return remaining
+
+    @cancellable
+    def get_pdfs_data(
+        self,
+        files: list[tuple[int, Path]],
+        *,
+        image_layout: ImageLayout | None = None,
+        incremental: bool | None = None,
+        token: CancellationToken | None = None,
+    ) -> ProcessingReport:
+        """
+        Collect PDF data for all files, converting the ones that need it.
+
+        Converted PDFs may stay on disk in a job staging directory owned by the
+        returned report; use the report as a context manager to remove it.
+        A cancelled token stops the conversion, including running soffice.
+        incremental overrides the service's setting for this call.
+        """
         pdf_data_list: list[BytePdfDocument] = []
+        staging_dir: Path | None = None
+        journal: JobJournal | None = None
         to_conversion = []
 
         success = 0
@@ -33,7 +243,7 @@ class ConversionService:
             if self.converter.is_pdf_file(file_path=path):
                 pdf_data_list.append(
                     BytePdfDocument(
-                        index=idx, data=path.read_bytes(), original_path=path
+                        index=idx, data=MappedPdf(path=path), original_path=path
                     )
                 )
             elif self.converter.needs_conversion(file_path=path):
@@ -49,12 +259,38 @@ class ConversionService:
                 },
             )
             paths_by_idx = {file_idx: path for file_idx, path in files}
+            journal = (
+                JobJournal.open(files=to_conversion, image_layout=image_layout)
+                if self.resumable
+                else None
+            )
+            if journal is not None:
+                staging_dir = journal.job_dir
+            else:
+                staging_dir = Path(tempfile.mkdtemp(prefix="simple_to_pdf_job_"))
             try:
-                conversion_res: ConversionResult = self.converter.convert_to_pdf(
+                conversion_res = self._convert_with_checkpoints(
                     files=to_conversion,
+                    image_layout=image_layout,
+                    staging_dir=staging_dir,
+                    journal=journal,
+                    stage_name=stage_name,
+                    incremental=(
+                        self.incremental if incremental is None else incremental
+                    ),
                 )
-            except InterruptedError:
-                logger.info(f"{stage_name} process was interrupted by user.")
+            except InterruptedError as e:
+                self._release_staging(staging_dir=staging_dir, journal=journal)
+                if isinstance(e, ConversionCancelled):
+                    logger.info(
+                        f"{stage_name} was interrupted after "
+                        f"{len(e.result.success)} of {len(to_conversion)} files."
+                    )
+                else:
+                    logger.info(f"{stage_name} process was interrupted by user.")
+                raise
+            except Exception:
+                self._release_staging(staging_dir=staging_dir, journal=journal)
                 raise
 
             success = len(conversion_res.success)
@@ -62,7 +298,12 @@ class ConversionService:
 
             converted_docs = [
                 BytePdfDocument(
-                    index=idx, data=pdf_data, original_path=paths_by_idx[idx]
+                    index=idx,
+                    data=pdf_data,
+                    original_path=paths_by_idx[idx],
+                    page_format=self._get_laid_out_format(
+                        path=paths_by_idx[idx], image_layout=image_layout
+                    ),
                 )
                 for idx, pdf_data in conversion_res.success
             ]
@@ -95,4 +336,10 @@ class ConversionService:
                         "error": "Office application failed to process this document",
                     },
                 )
-        return ProcessingReport(documents=pdf_data_list, success=success, failed=failed)
+        return ProcessingReport(
+            documents=pdf_data_list,
+            success=success,
+            failed=failed,
+            staging_dir=staging_dir,
+            journal=journal,
+        )
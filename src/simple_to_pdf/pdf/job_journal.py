@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from simple_to_pdf.converters.models import ImageLayout, StagedPdf
+from simple_to_pdf.utils.app_dirs import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+def _file_sha256(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class JobJournal:
+    """
+    On-disk checkpoint of one conversion job.
+
+    Converted PDFs are kept in the job directory under the cache dir, and each
+    finished file is appended to the journal with its output name and SHA-256.
+    A job started again with the same inputs gets the same directory and
+    skips every file whose recorded output is still intact.
+    """
+
+    JOBS_DIR_NAME = "jobs"
+    JOURNAL_FILE_NAME = "journal.jsonl"
+    # Jobs left unfinished for longer than this are removed
+    MAX_AGE_DAYS = 7
+
+    # Job keys open in this process; a second identical job runs unjournaled
+    _active: set[str] = set()
+    _active_lock = threading.Lock()
+
+    def __init__(self, *, job_dir: Path):
+        self.job_dir = job_dir
+        self.journal_path = job_dir / self.JOURNAL_FILE_NAME
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_key(
+        *, files: list[tuple[int, Path]], image_layout: ImageLayout | None
+    ) -> str:
+        """Identify a job by its inputs, their size and mtime, and the layout."""
+        inputs = []
+        for idx, path in files:
+            try:
+                stat = path.stat()
+                inputs.append(
+                    [idx, str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+                )
+            except OSError:
+                inputs.append([idx, str(path), None, None])
+        payload = json.dumps([inputs, repr(image_layout)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    @classmethod
+    def open(
+        cls,
+        *,
+        files: list[tuple[int, Path]],
+        image_layout: ImageLayout | None = None,
+        jobs_dir: Path | None = None,
+    ) -> "JobJournal | None":
+        """Open (or create) the journal for these inputs; None if unavailable."""
+        jobs_dir = jobs_dir or get_cache_dir() / cls.JOBS_DIR_NAME
+        key = cls.job_key(files=files, image_layout=image_layout)
+        with cls._active_lock:
+            if key in cls._active:
+                logger.info("Identical job already running, journal disabled")
+                return None
+            cls._active.add(key)
+
+        cls._prune(jobs_dir=jobs_dir)
+        job_dir = jobs_dir / key
+        try:
+            job_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create job journal at {job_dir}: {e}")
+            cls._release(key)
+            return None
+        return cls(job_dir=job_dir)
+
+    @classmethod
+    def _release(cls, key: str) -> None:
+        with cls._active_lock:
+            cls._active.discard(key)
+
+    @classmethod
+    def _prune(cls, *, jobs_dir: Path) -> None:
+        cutoff = time.time() - cls.MAX_AGE_DAYS * 86400
+        try:
+            job_dirs = list(jobs_dir.iterdir())
+        except OSError:
+            return
+        for job_dir in job_dirs:
+            if job_dir.name in cls._active:
+                continue
+            try:
+                if job_dir.stat().st_mtime < cutoff:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+                    logger.debug(f"Removed stale job {job_dir.name}")
+            except OSError:
+                continue
+
+    def load(self) -> dict[int, StagedPdf]:
+        """Outputs of the files finished earlier, checked against their hashes."""
+        done: dict[int, StagedPdf] = {}
+        try:
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return done
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                output = self.job_dir / entry["output"]
+                if output.stat().st_size != entry["size"]:
+                    continue
+                if _file_sha256(output) != entry["sha256"]:
+                    continue
+            except (OSError, ValueError, KeyError, TypeError):
+                # A crash can leave the last line cut off
+                continue
+            done[entry["index"]] = StagedPdf(path=output)
+        if done:
+            logger.info(f"Journal {self.job_dir.name}: {len(done)} files already done")
+        return done
+
+    def record(self, *, index: int, source: Path, pdf: bytes | StagedPdf) -> StagedPdf:
+        """Keep a converted PDF in the job directory and journal it."""
+        if isinstance(pdf, StagedPdf) and pdf.path.parent == self.job_dir:
+            output = pdf.path
+        else:
+            output = self.job_dir / f"{index}_{source.stem}.pdf"
+            tmp = output.with_suffix(".part")
+            if isinstance(pdf, StagedPdf):
+                shutil.move(pdf.path, tmp)
+            else:
+                tmp.write_bytes(pdf)
+            os.replace(tmp, output)
+
+        entry = {
+            "index": index,
+            "source": str(source),
+            "output": output.name,
+            "size": output.stat().st_size,
+            "sha256": _file_sha256(output),
+        }
+        with self._lock, self.journal_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return StagedPdf(path=output)
+
+    def close(self, *, discard: bool = False) -> None:
+        """Release the journal, removing it with its outputs when discard is set."""
+        if discard:
+            shutil.rmtree(self.job_dir, ignore_errors=True)
+            logger.debug(f"Removed job journal {self.job_dir.name}")
+        else:
+            logger.info(f"Job journal kept for resume: {self.job_dir}")
+        self._release(self.job_dir.name)
@@ -1,7 +1,18 @@
+import io
+import logging
+import shutil
 from dataclasses import dataclass, field
-from typing import NamedTuple
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple
 from pathlib import Path
 
+from simple_to_pdf.converters.models import StagedPdf
+from simple_to_pdf.utils.mapped_file import open_mapped
+
+if TYPE_CHECKING:
+    from simple_to_pdf.pdf.job_journal import JobJournal
+
+logger = logging.getLogger(__name__)
+
 
 class PageFormat(NamedTuple):
     width: float
@@ -19,11 +30,54 @@ class PixInfo:
     samples: bytes
 
 
+@dataclass
+class ImageStreamInfo:
+    xref: int
+    filter: str
+    width: int
+    height: int
+    raw_size: int
+    jpeg_quality: int | None = None
+
+    @property
+    def is_jpeg(self) -> bool:
+        return self.filter == "DCTDecode"
+
+
+@dataclass(frozen=True)
+class MappedPdf:
+    """A native PDF input read in place through a memory map."""
+
+    path: Path
+
+    def open(self) -> BinaryIO:
+        return open_mapped(self.path)
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
 @dataclass
 class BytePdfDocument:
     index: int
-    data: bytes
+    data: bytes | StagedPdf | MappedPdf
     original_path: Path
+    # Set when the pages were already laid out onto this format during conversion
+    page_format: PageFormat | None = None
+
+    def open(self) -> BinaryIO:
+        """Open the PDF as a binary stream, reading files on disk in place."""
+        if isinstance(self.data, (StagedPdf, MappedPdf)):
+            return self.data.open()
+        return io.BytesIO(self.data)
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """A service callback call: kind is "progress" or "status"."""
+
+    kind: str
+    data: dict
 
 
 @dataclass
@@ -31,3 +85,23 @@ class ProcessingReport:
     documents: list[BytePdfDocument] = field(default_factory=list)
     success: int = 0
     failed: int = 0
+    # Job directory holding the StagedPdf files; removed by cleanup()
+    staging_dir: Path | None = None
+    # Set when staging_dir is a resumable job journal
+    journal: "JobJournal | None" = None
+
+    def cleanup(self, *, keep_journal: bool = False) -> None:
+        if self.journal is not None:
+            self.journal.close(discard=not keep_journal)
+            self.journal = None
+        elif self.staging_dir is not None:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            logger.debug(f"Removed staging directory {self.staging_dir}")
+        self.staging_dir = None
+
+    def __enter__(self) -> "ProcessingReport":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        # A failed or cancelled job keeps its journal so a rerun can resume
+        self.cleanup(keep_journal=exc_type is not None)
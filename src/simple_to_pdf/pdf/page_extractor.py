@@ -6,6 +6,8 @@ from typing import Callable
 from pypdf import PdfReader, PdfWriter
 
 from simple_to_pdf.base_services.base import BaseService
+from simple_to_pdf.base_services.cancellation import CancellationToken, cancellable
+from simple_to_pdf.utils.mapped_file import open_mapped
 
 logger = logging.getLogger(__name__)
 
@@ -23,12 +25,14 @@ class PageExtractor(BaseService):
     def callback(self, value):
         self._callback = value if value is not None else lambda *args, **kwargs: None
 
+    @cancellable
     def extract_pages(
         self,
         *,
         input_path: str,
         pages_to_extract: list[int],
         output_path: str | Path,
+        token: CancellationToken | None = None,
     ) -> bytes:
         input_file = Path(input_path)
         output_file = Path(output_path).resolve()
@@ -37,7 +41,7 @@ class PageExtractor(BaseService):
         writer = PdfWriter()
 
         try:
-            with input_file.open("rb") as f:
+            with open_mapped(input_file) as f:
                 reader = PdfReader(f)
                 total = len(pages_to_extract)
 
@@ -104,7 +108,7 @@ class PageExtractor(BaseService):
         if not input_path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
-        with open(input_path, "rb") as f:
+        with open_mapped(input_path) as f:
             reader = PdfReader(f)
             actual_total = len(reader.pages)
 
@@ -1,12 +1,15 @@
 import io
 import logging
+import zlib
 
 import pymupdf
-from PIL import Image
+from PIL import Image, ImageChops
 
 from simple_to_pdf.base_services.base import BaseService
+from simple_to_pdf.base_services.cancellation import CancellationToken, cancellable
+from simple_to_pdf.utils.image_tools import estimate_jpeg_quality
 
-from .models import PixInfo
+from .models import ImageStreamInfo, PixInfo
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,9 @@ class PDFCompressor(BaseService):
     reducing the final file size.
     """
 
+    # Images below this pixel count are too small for re-encoding to pay off.
+    MIN_IMAGE_PIXELS = 64 * 64
+
     def __init__(
         self, *, garbage_level: int = 4, deflate: bool = True, clean: bool = True
     ):
@@ -56,6 +62,114 @@ class PDFCompressor(BaseService):
 
         return PixInfo(samples=samples, width=width, height=height)
 
+    def _pix_to_pil(self, pix: pymupdf.Pixmap) -> Image.Image:
+        """Builds a Pillow image, keeping CMYK pixmaps in the CMYK colour model."""
+        if pix.colorspace and pix.colorspace.n == 4 and not pix.alpha:
+            return Image.frombytes("CMYK", (pix.width, pix.height), pix.samples)
+
+        pix_info = self._get_pix_info(pix)
+        return Image.frombytes(
+            "RGB", (pix_info.width, pix_info.height), pix_info.samples
+        )
+
+    def _get_colorspace_definition(self, *, doc: pymupdf.Document, xref: int) -> str:
+        """Returns the /ColorSpace entry of an image, resolving an indirect reference."""
+        key_type, value = doc.xref_get_key(xref, "ColorSpace")
+        if key_type == "xref":
+            return doc.xref_object(int(value.split()[0]), compressed=True)
+        return value
+
+    def _is_indexed_image(self, *, doc: pymupdf.Document, xref: int) -> bool:
+        try:
+            colorspace = self._get_colorspace_definition(doc=doc, xref=xref)
+        except Exception as e:
+            logger.debug(f"Cannot read colorspace of image {xref}: {e}")
+            return False
+        return colorspace.lstrip("[ ").startswith("/Indexed")
+
+    @staticmethod
+    def _apply_png_up_predictor(data: bytes, *, row_size: int) -> bytes:
+        """Prefixes each row with PNG filter type 2 (Up) and stores row deltas."""
+        rows = len(data) // row_size
+        current = Image.frombytes("L", (row_size, rows), data)
+        above = Image.new("L", (row_size, rows), 0)
+        above.paste(current.crop((0, 0, row_size, rows - 1)), (0, 1))
+
+        predicted = Image.new("L", (row_size + 1, rows), 2)
+        predicted.paste(ImageChops.subtract_modulo(current, above), (1, 0))
+        return predicted.tobytes()
+
+    def _recompress_indexed_image(self, *, doc: pymupdf.Document, xref: int) -> None:
+        """
+        Re-encodes palette indices with Flate at maximum level.
+
+        The palette and the index values stay untouched, so the image is
+        lossless. A PNG 'Up' predictor variant is tried as well and the smaller
+        stream wins; nothing is written unless it beats the original stream.
+        """
+        raw_size = len(doc.xref_stream_raw(xref))
+        indices = doc.xref_stream(xref)
+        width = int(doc.xref_get_key(xref, "Width")[1])
+        bpc = int(doc.xref_get_key(xref, "BitsPerComponent")[1])
+        row_size = (width * bpc + 7) // 8
+
+        candidates = {"null": zlib.compress(indices, 9)}
+        if row_size and len(indices) >= 2 * row_size and len(indices) % row_size == 0:
+            predicted = self._apply_png_up_predictor(indices, row_size=row_size)
+            params = (
+                f"<</Predictor 12/Colors 1/BitsPerComponent {bpc}/Columns {width}>>"
+            )
+            candidates[params] = zlib.compress(predicted, 9)
+
+        decode_parms, stream = min(candidates.items(), key=lambda item: len(item[1]))
+        if len(stream) >= raw_size:
+            logger.debug(f"Skipped indexed image {xref}: Flate stream is not smaller")
+            return
+
+        doc.update_stream(xref, stream, compress=False)
+        doc.xref_set_key(xref, "Filter", "/FlateDecode")
+        doc.xref_set_key(xref, "DecodeParms", decode_parms)
+        logger.debug(
+            f"Indexed image {xref} recompressed: {raw_size} -> {len(stream)} bytes"
+        )
+
+    def _get_image_stream_info(
+        self, *, doc: pymupdf.Document, xref: int, img_info: dict
+    ) -> ImageStreamInfo:
+        """Collects stream metadata of an image without decoding its pixels."""
+        filter_name = ""
+        try:
+            key_type, value = doc.xref_get_key(xref, "Filter")
+            if key_type == "name":
+                filter_name = value.lstrip("/")
+        except Exception as e:
+            logger.debug(f"Cannot read filter of image {xref}: {e}")
+
+        orig_bytes = img_info["image"]
+        is_jpeg = filter_name == "DCTDecode" or img_info.get("ext") == "jpeg"
+        return ImageStreamInfo(
+            xref=xref,
+            filter="DCTDecode" if is_jpeg else filter_name,
+            width=img_info.get("width", 0),
+            height=img_info.get("height", 0),
+            raw_size=len(orig_bytes),
+            jpeg_quality=estimate_jpeg_quality(orig_bytes) if is_jpeg else None,
+        )
+
+    def _can_skip_image(self, *, info: ImageStreamInfo, quality: int) -> bool:
+        """Decides from stream metadata whether re-encoding cannot win."""
+        if info.width * info.height < self.MIN_IMAGE_PIXELS:
+            logger.debug(f"Skipped image {info.xref}: too small to recompress")
+            return True
+        if info.is_jpeg and info.jpeg_quality is not None:
+            if info.jpeg_quality <= quality:
+                logger.debug(
+                    f"Skipped image {info.xref}: JPEG quality {info.jpeg_quality} "
+                    f"is already at or below {quality}"
+                )
+                return True
+        return False
+
     def _compress_single_image(
         self, *, page: pymupdf.Page, doc: pymupdf.Document, xref: int, quality: int
     ) -> None:
@@ -65,16 +179,18 @@ class PDFCompressor(BaseService):
             if not img_info:
                 return
             orig_bytes = img_info["image"]
-            pix = pymupdf.Pixmap(doc, xref)
-
-            if pix.colorspace and pix.colorspace.name in ("DeviceCMYK", "Indexed"):
+            stream_info = self._get_image_stream_info(
+                doc=doc, xref=xref, img_info=img_info
+            )
+            if self._can_skip_image(info=stream_info, quality=quality):
+                return
+            if self._is_indexed_image(doc=doc, xref=xref):
+                self._recompress_indexed_image(doc=doc, xref=xref)
                 return
 
-            pix_info = self._get_pix_info(pix)
+            pix = pymupdf.Pixmap(doc, xref)
 
-            with Image.frombytes(
-                "RGB", (pix_info.width, pix_info.height), pix_info.samples
-            ) as pil_img:
+            with self._pix_to_pil(pix) as pil_img:
                 with io.BytesIO() as buffer:
                     pil_img.save(
                         buffer,
@@ -134,19 +250,22 @@ class PDFCompressor(BaseService):
                 )
                 processed_xrefs.add(xref)
 
+    @cancellable
     def compress(
         self,
         *,
-        pdf_bytes: bytes,
+        pdf_bytes: bytes | memoryview,
         quality: int = 20,
+        token: CancellationToken | None = None,
     ) -> bytes:
         """Main method that accepts PDF bytes, compresses the PDF, and returns new bytes.
 
         Args:
-            pdf_bytes (bytes): Bytes of the original PDF file.
+            pdf_bytes (bytes | memoryview): The original PDF, e.g. a view of a mapped file.
             callback (Callable, optional): Callback function to update progress in the
                 CustomTkinter GUI. Accepts message type and keyword arguments.
             quality (int): Desired image quality after compression (1 to 100). Default: 75.
+            token (CancellationToken, optional): Cancels the compression when set.
 
         Returns:
             bytes: Bytes of the compressed PDF (or original bytes if failed).
@@ -157,7 +276,7 @@ class PDFCompressor(BaseService):
 
         if not pdf_bytes:
             logger.warning("Received empty bytes for compression")
-            return pdf_bytes
+            return bytes(pdf_bytes)
 
         self.callback(
             "progress",
@@ -171,7 +290,7 @@ class PDFCompressor(BaseService):
                 total_pages = len(doc)
 
                 if total_pages == 0:
-                    return pdf_bytes
+                    return bytes(pdf_bytes)
 
                 processed_xrefs = set()
 
@@ -230,7 +349,7 @@ class PDFCompressor(BaseService):
                     "status": "error",
                 },
             )
-            return pdf_bytes
+            return bytes(pdf_bytes)
 
     def is_hard_page(self, *, page) -> bool:
         try:
@@ -1,10 +1,12 @@
 import io
 import logging
-from typing import List
+import threading
+from typing import BinaryIO, List
 
 from pypdf import PageObject, PdfReader, PdfWriter, Transformation
 
 from simple_to_pdf.base_services.base import BaseService
+from simple_to_pdf.base_services.cancellation import CancellationToken, cancellable
 
 from .models import BytePdfDocument, PageFormat, ProcessingReport
 
@@ -15,6 +17,16 @@ class PdfMerger(BaseService):
     def __init__(self):
         super().__init__()
         self._callback = lambda *args, **kwargs: None
+        # Per thread, so concurrent merges report progress independently
+        self._local = threading.local()
+
+    @property
+    def _files_count(self) -> int:
+        return getattr(self._local, "files_count", 0)
+
+    @_files_count.setter
+    def _files_count(self, value: int):
+        self._local.files_count = value
 
     @property
     def callback(self):
@@ -72,11 +84,13 @@ class PdfMerger(BaseService):
             canvas.merge_transformed_page(source_page, transformation)
             writer.add_page(canvas)
 
+    @cancellable
     def merge_to_pdf(
         self,
         *,
         conversion_rep: ProcessingReport,
         target_page_format: PageFormat | None = None,
+        token: CancellationToken | None = None,
     ) -> bytes:
         """Merges multiple files into a single PDF and returns original bytes if it is single PDF."""
 
@@ -99,7 +113,7 @@ class PdfMerger(BaseService):
         pdf_data_list.sort(key=lambda doc: doc.index)
 
         writer = PdfWriter()
-        active_streams: list[io.BytesIO] = []
+        active_streams: list[BinaryIO] = []
         success = 0
         failed = conversion_rep.failed
         total_to_merge = len(pdf_data_list)
@@ -110,10 +124,13 @@ class PdfMerger(BaseService):
                 filename = file_path.name
 
                 try:
-                    pdf_stream = io.BytesIO(pdf_data.data)
+                    pdf_stream = pdf_data.open()
                     active_streams.append(pdf_stream)
                     reader = PdfReader(pdf_stream)
-                    if target_page_format is None:
+                    if (
+                        target_page_format is None
+                        or pdf_data.page_format == target_page_format
+                    ):
                         writer.append(reader)
                     else:
                         self._scale_and_append(
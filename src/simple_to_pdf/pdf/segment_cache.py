@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from simple_to_pdf.converters.models import StagedPdf
+from simple_to_pdf.utils.staging import stage_file
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentCache:
+    """
+    Converted PDF segments of input files from earlier runs.
+
+    A segment is keyed by the SHA-256 of the input's content plus a variant
+    (the image layout for images), so an input converts again only when it
+    changed. Content digests are remembered per path, size and mtime, so
+    unchanged files are not re-read. The least recently used segments are
+    removed once the cache grows past max_bytes.
+    """
+
+    INDEX_FILE_NAME = "fingerprints.json"
+    # Paths remembered in the digest index
+    INDEX_MAX_ENTRIES = 10000
+
+    def __init__(self, *, cache_dir: Path, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = cache_dir / self.INDEX_FILE_NAME
+        self._lock = threading.Lock()
+        self._digests: dict[str, list] = self._load_index()
+
+    def _load_index(self) -> dict[str, list]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self) -> None:
+        with self._lock:
+            overflow = len(self._digests) - self.INDEX_MAX_ENTRIES
+            for key in list(self._digests)[: max(0, overflow)]:
+                del self._digests[key]
+            payload = json.dumps(self._digests)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not save segment index: {e}")
+
+    def _content_digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.resolve())
+        with self._lock:
+            known = self._digests.get(key)
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+
+        with path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        with self._lock:
+            # Re-inserted so the index drops the least recently seen paths first
+            self._digests.pop(key, None)
+            self._digests[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def _segment_path(self, *, path: Path, variant: str) -> Path:
+        digest = self._content_digest(path)
+        key = hashlib.sha256(f"{digest}\0{variant}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key[:32]}.pdf"
+
+    def lookup(self, *, path: Path, variant: str, target: Path) -> StagedPdf | None:
+        """Stage the cached segment of path at target, or return None on a miss."""
+        try:
+            segment = self._segment_path(path=path, variant=variant)
+            stage_file(segment, target)
+            os.utime(segment)
+        except OSError:
+            return None
+        return StagedPdf(path=target)
+
+    def store(self, *, path: Path, variant: str, pdf: bytes | StagedPdf) -> None:
+        try:
+            segment = self._segment_path(path=path, variant=variant)
+            if segment.exists():
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = segment.with_name(f".{segment.name}.{threading.get_ident()}")
+            if isinstance(pdf, StagedPdf):
+                stage_file(pdf.path, tmp)
+            else:
+                tmp.write_bytes(pdf)
+            os.replace(tmp, segment)
+        except OSError as e:
+            logger.warning(f"Could not cache segment of {path.name}: {e}")
+
+    def prune(self) -> None:
+        """Remove least recently used segments until the cache fits max_bytes."""
+        segments = []
+        for segment in self.cache_dir.glob("*.pdf"):
+            try:
+                stat = segment.stat()
+            except OSError:
+                continue
+            segments.append((stat.st_mtime, stat.st_size, segment))
+
+        total = sum(size for _, size, _ in segments)
+        for _, size, segment in sorted(segments):
+            if total <= self.max_bytes:
+                break
+            segment.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """
+    Determines the cache directory, prioritizing Home over App directory.
+    """
+    cache_dir = Path.home() / "simple_to_pdf" / "cache"
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+    except Exception:
+        # Imported here: config pulls in the pdf package, which needs converters
+        from simple_to_pdf.core.config import ROOT_PATH
+
+        cache_dir = ROOT_PATH / "cache"
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            # Last resort: callers treat a missing directory as "no cache"
+            pass
+
+    return cache_dir
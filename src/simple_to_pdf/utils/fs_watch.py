@@ -0,0 +1,186 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _list_files(directories: list[Path]) -> set[Path]:
+    files = set()
+    for directory in directories:
+        try:
+            files.update(p for p in directory.iterdir() if p.is_file())
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+    return files
+
+
+class _PollingSource:
+    """Reports files whose size or mtime changed since the previous scan."""
+
+    def __init__(self, *, directories: list[Path], interval: float):
+        self.directories = directories
+        self.interval = interval
+        self._seen: dict[Path, tuple[int, int]] = {}
+
+    def changed(self, timeout: float) -> set[Path]:
+        time.sleep(min(timeout, self.interval))
+        current = {}
+        for path in _list_files(self.directories):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            current[path] = (stat.st_size, stat.st_mtime_ns)
+        changed = {p for p, sig in current.items() if self._seen.get(p) != sig}
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifySource:
+    """Reports files written or moved into the directories, via inotify."""
+
+    def __init__(self, *, directories: list[Path]):
+        self.directories = directories
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        try:
+            for directory in directories:
+                wd = self._libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), WATCH_MASK
+                )
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+                self._watches[wd] = directory
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def changed(self, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so look at everything again
+                return _list_files(self.directories)
+            if wd in self._watches and name:
+                changed.add(self._watches[wd] / os.fsdecode(name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class DirectoryMonitor:
+    """
+    Watches directories (not recursively) and reports files once they have
+    settled, i.e. not changed for settle_seconds, so partially written files
+    are never picked up.
+
+    Uses inotify on Linux and falls back to polling elsewhere or when
+    inotify is unavailable. Files already present at start count as new.
+    """
+
+    def __init__(
+        self,
+        *,
+        directories: list[Path],
+        settle_seconds: float = 3.0,
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+        accept: Callable[[Path], bool] = lambda path: True,
+    ):
+        self.directories = directories
+        self.settle_seconds = settle_seconds
+        self.accept = accept
+        self._source = self._make_source(
+            use_inotify=use_inotify, poll_interval=poll_interval
+        )
+        # path -> (size, mtime_ns) and the time it was last seen changing
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+        self._touch(_list_files(directories))
+
+    def _make_source(self, *, use_inotify: bool, poll_interval: float):
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                source = _InotifySource(directories=self.directories)
+                logger.info("Watching with inotify")
+                return source
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, polling instead: {e}")
+        return _PollingSource(directories=self.directories, interval=poll_interval)
+
+    def _touch(self, paths: set[Path]) -> None:
+        now = time.monotonic()
+        for path in paths:
+            if not self.accept(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                self._pending.pop(path, None)
+                continue
+            self._pending[path] = ((stat.st_size, stat.st_mtime_ns), now)
+
+    def wait_for_settled(self, timeout: float) -> list[Path]:
+        """Wait up to timeout for changes; return the files that have settled."""
+        self._touch(self._source.changed(timeout))
+        now = time.monotonic()
+        settled = []
+        for path, (signature, since) in list(self._pending.items()):
+            if now - since < self.settle_seconds:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != signature:
+                # Still being written without events (e.g. network shares)
+                self._pending[path] = ((stat.st_size, stat.st_mtime_ns), now)
+                continue
+            del self._pending[path]
+            settled.append(path)
+        return sorted(settled)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def close(self) -> None:
+        self._source.close()
@@ -0,0 +1,90 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Standard luminance quantization table from Annex K of the JPEG specification.
+# Values are summed, so the zigzag order of the stored table does not matter.
+STD_LUMINANCE_QUANT_SUM = sum(
+    [
+        16, 11, 10, 16, 24, 40, 51, 61,
+        12, 12, 14, 19, 26, 58, 60, 55,
+        14, 13, 16, 24, 40, 57, 69, 56,
+        14, 17, 22, 29, 51, 87, 80, 62,
+        18, 22, 37, 56, 68, 109, 103, 77,
+        24, 35, 55, 64, 81, 104, 113, 92,
+        49, 64, 78, 87, 103, 121, 120, 101,
+        72, 92, 95, 98, 112, 100, 103, 99,
+    ]
+)  # fmt: skip
+
+SOI_MARKER = 0xD8
+SOS_MARKER = 0xDA
+DQT_MARKER = 0xDB
+EOI_MARKER = 0xD9
+
+
+def _read_luminance_table(data: bytes) -> list[int] | None:
+    """Return the first (luminance) quantization table of a JPEG stream."""
+    if len(data) < 4 or data[0] != 0xFF or data[1] != SOI_MARKER:
+        return None
+
+    pos = 2
+    size = len(data)
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before the real marker
+            pos += 1
+            continue
+        if marker in (SOS_MARKER, EOI_MARKER):
+            return None
+
+        seg_len = int.from_bytes(data[pos + 2 : pos + 4], "big")
+        seg_end = pos + 2 + seg_len
+        if seg_len < 2 or seg_end > size:
+            return None
+
+        if marker == DQT_MARKER:
+            offset = pos + 4
+            while offset < seg_end:
+                precision, table_id = data[offset] >> 4, data[offset] & 0x0F
+                entry_size = 2 if precision else 1
+                start = offset + 1
+                end = start + 64 * entry_size
+                if end > seg_end:
+                    return None
+                if table_id == 0:
+                    raw = data[start:end]
+                    return [
+                        int.from_bytes(raw[i : i + entry_size], "big")
+                        for i in range(0, len(raw), entry_size)
+                    ]
+                offset = end
+        pos = seg_end
+    return None
+
+
+def estimate_jpeg_quality(data: bytes) -> int | None:
+    """
+    Estimates the IJG quality (1 to 100) a JPEG stream was encoded with.
+
+    Reads only the marker segments in front of the scan data and compares the
+    luminance quantization table with the scaled standard table, so no pixels
+    are decoded. Returns None when the stream has no readable table.
+    """
+    try:
+        table = _read_luminance_table(data)
+    except (IndexError, ValueError) as e:
+        logger.debug(f"Cannot read JPEG quantization table: {e}")
+        return None
+    if not table:
+        return None
+
+    scale = sum(table) * 100 / STD_LUMINANCE_QUANT_SUM
+    if scale <= 100:
+        quality = (200 - scale) / 2
+    else:
+        quality = 5000 / scale
+    return max(1, min(100, round(quality)))
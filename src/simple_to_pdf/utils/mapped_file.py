@@ -0,0 +1,21 @@
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+
+def open_mapped(path: Path) -> BinaryIO:
+    """
+    Open a file as a read-only memory map.
+
+    The OS pages the file in on demand and shares the pages between all
+    mappings of it, so large inputs are never copied into the Python heap.
+    The map works as a binary stream (read, seek, tell) and supports the
+    buffer protocol; empty files, which cannot be mapped, open as BytesIO.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return io.BytesIO()
+        # The map stays valid after the file descriptor is closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,112 @@
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from simple_to_pdf.base_services.cancellation import is_cancelled, on_cancel
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+
+def kill_process_tree(process: subprocess.Popen) -> None:
+    """
+    Kill a process started by run_managed together with its children.
+
+    soffice is a launcher (oosplash) that starts soffice.bin, so killing the
+    launcher alone would leave the office process running.
+    """
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                timeout=10,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Process tree kill failed, killing {process.pid} only: {e}")
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def _kill_in_background(process: subprocess.Popen) -> None:
+    """
+    Kill the tree from a helper thread.
+
+    Cancel callbacks run on the cancelling thread, e.g. the GUI thread for
+    the Stop button, which must not wait for taskkill.
+    """
+    threading.Thread(
+        target=kill_process_tree,
+        args=(process,),
+        name=f"KillTree-{process.pid}",
+        daemon=True,
+    ).start()
+
+
+def _start_options() -> dict:
+    """Start the process as the leader of its own group so the tree can be killed."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def run_managed(
+    command: list[str],
+    *,
+    timeout: float | None = None,
+    check: bool = False,
+    poll_interval: float = POLL_INTERVAL,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, but stop its whole process tree on
+    cancellation or timeout.
+
+    The active cancellation tokens are polled every poll_interval and also
+    kill the tree, on a helper thread, from their cancel callback. Raises InterruptedError when
+    cancelled and subprocess.TimeoutExpired on timeout.
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **_start_options()
+    )
+    remove_callback = on_cancel(lambda: _kill_in_background(process))
+    stdout, stderr = b"", b""
+    try:
+        while True:
+            if is_cancelled():
+                kill_process_tree(process)
+                process.communicate()
+                raise InterruptedError("Process cancelled")
+
+            wait = poll_interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                # Retrying communicate after a timeout keeps the collected output
+                stdout, stderr = process.communicate(timeout=wait)
+                break
+            except subprocess.TimeoutExpired:
+                if deadline is not None and time.monotonic() >= deadline:
+                    kill_process_tree(process)
+                    process.communicate()
+                    raise subprocess.TimeoutExpired(command, timeout or 0)
+    finally:
+        remove_callback()
+        if process.poll() is None:
+            kill_process_tree(process)
+            process.wait()
+
+    if is_cancelled():
+        raise InterruptedError("Process cancelled")
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
@@ -0,0 +1,109 @@
+import logging
+import os
+import shutil
+import sys
+from collections.abc import Callable
+from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+
+class StageMethod(StrEnum):
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
+    SYMLINK = "symlink"
+    COPY = "copy"
+
+
+def _reflink(source: Path, target: Path) -> None:
+    """Create a copy-on-write clone of source, raising OSError if unsupported."""
+    if not sys.platform.startswith("linux"):
+        raise OSError("Reflinks are only attempted on Linux")
+
+    import fcntl
+
+    with source.open("rb") as src, target.open("xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            target.unlink(missing_ok=True)
+            raise
+    shutil.copystat(source, target)
+
+
+def stage_file(
+    source: Path, target: Path, *, writable: bool = False, allow_symlink: bool = False
+) -> StageMethod:
+    """
+    Make source available at target without copying its data when possible.
+
+    Hard links are tried first, then reflinks, then (if allowed) symlinks,
+    and the file is copied only when none of them work. A writable staged
+    file must never share data with the original, so it is only reflinked
+    or copied.
+    """
+    attempts: list[tuple[StageMethod, Callable[[Path, Path], None]]] = []
+    if not writable:
+        attempts.append((StageMethod.HARDLINK, os.link))
+    attempts.append((StageMethod.REFLINK, _reflink))
+    if allow_symlink and not writable:
+        attempts.append(
+            (StageMethod.SYMLINK, lambda src, dst: dst.symlink_to(src.resolve()))
+        )
+
+    for method, link in attempts:
+        try:
+            link(source, target)
+            return method
+        except OSError as e:
+            logger.debug(f"Cannot {method} {source.name}: {e}")
+
+    shutil.copy2(source, target)
+    return StageMethod.COPY
+
+
+def unique_path(directory: Path, name: str) -> Path:
+    """directory/name, with a counter added to the stem if it is taken."""
+    target = directory / name
+    counter = 1
+    while target.exists():
+        target = directory / f"{Path(name).stem}_{counter}{Path(name).suffix}"
+        counter += 1
+    return target
+
+
+def write_atomic(stream: BinaryIO, target: Path) -> Path:
+    """Write stream to target through a hidden temp file, so it appears complete."""
+    tmp = target.with_name(f".{target.name}.part")
+    try:
+        with tmp.open("wb") as f:
+            shutil.copyfileobj(stream, f)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+
+def move_atomic(source: Path, directory: Path) -> Path:
+    """
+    Move source into directory under a free name and return the new path.
+
+    Within one filesystem this is a rename; across filesystems the data is
+    copied next to the target first, so the target never appears partially.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    target = unique_path(directory, source.name)
+    try:
+        os.rename(source, target)
+    except OSError:
+        with source.open("rb") as src:
+            write_atomic(src, target)
+        shutil.copystat(source, target)
+        source.unlink()
+    return target
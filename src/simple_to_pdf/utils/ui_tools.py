@@ -1,6 +1,5 @@
 import functools
 import logging
-import threading
 import tkinter as tk
 from typing import Literal
 
@@ -36,34 +35,30 @@ def change_state(
 
 def threaded_task(func):
     """
-    Decorator to execute a decorated method in a separate background thread
-    to keep the GUI responsive.
+    Decorator to execute a decorated method as a job on a background worker
+    to keep the GUI responsive. Several tasks may run side by side; pass
+    job_title= to name the job in the UI.
 
     IMPORTANT: The class using this decorator MUST implement:
-    1. `toggle_ui(active: bool)`: Method to enable/disable UI widgets (buttons, etc.).
-    2. `self.thread_running`: Boolean flag to track the background thread status.
+    1. `self.job_queue`: JobQueue the tasks are submitted to.
+    2. `on_job_started(job, title)`: Called in the main thread after submit,
+       e.g. to show the job's progress row and switch UI widgets.
     """
 
     @functools.wraps(func)
-    def wrapper(self, *args, **kwargs):
-        if getattr(self, "thread_running", False):
-            return
-        if hasattr(self, "_manage_services"):
-            self._manage_services(action="reset")
-        if hasattr(self, "clear_console"):
+    def wrapper(self, *args, job_title: str = "", **kwargs):
+        # The console is shared, so only a task starting alone clears it
+        if hasattr(self, "clear_console") and not self.job_queue.has_active_jobs():
             self.clear_console()
-        self.toggle_ui(active=False)  # lock in main thread
 
         def run():
             try:
-                self.thread_running = True
-                func(self, *args, **kwargs)  # run in background thread
+                func(self, *args, **kwargs)  # run in background worker
             finally:
-                # unlock in main thread
-                self.after(0, lambda: self.toggle_ui(active=True))
-                self.thread_running = False
-                logger.info(f"Thread {func.__name__} ended work")
+                logger.info(f"Task {func.__name__} ended work")
 
-        threading.Thread(target=run, daemon=False).start()
+        job = self.job_queue.submit(run, name=func.__name__)
+        self.on_job_started(job, title=job_title or func.__name__)
+        return job
 
     return wrapper